@@ -1,33 +1,88 @@
+import sys
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox
 from controller import SystemMonitorController
+from virtual_list import ListaVirtual
+from charts import GraficoSerie
+from metric_history import RingBuffer
 #Utilizando a biblioteca tkinter para interface
 #Utilizando Monitor de Sistema (SystemMonitor) o qual le e processa informacoes
 
 class InterfaceDashboard:
-    def __init__(self, Dashboard):
+    def __init__(self, Dashboard, tamanho_historico=100, captura=None, velocidade=1.0):
         self.Dashboard = Dashboard
+        #quantidade de amostras guardadas em cada grafico/estatistica
+        self.tamanho_historico = tamanho_historico
         #Aqui abre janela
         self.Dashboard.title("Dashboard/Gerenciador de Tarefas")
         self.Dashboard.geometry("1100x650")
         #Controller com intervalo de 5 segundos
-        self.controller = SystemMonitorController(update_interval_sec=5)
+        #com uma captura, o dashboard reproduz o /proc gravado em vez de ler o da maquina
+        #a varredura le so as colunas da lista (perfil "table"), a janela de detalhes le o resto
+        self.controller = SystemMonitorController(
+            update_interval_sec=5, replay_path=captura, replay_speed=velocidade,
+            collection_profile="table"
+        )
         self.controller.start()
 
         #Aqui ele cria aba, uma para geral e outra para lista de processos
         self.abas = ttk.Notebook(self.Dashboard)
         self.aba_geral = ttk.Frame(self.abas)
         self.aba_processos = ttk.Frame(self.abas)
+        self.aba_custo = ttk.Frame(self.abas)
         self.abas.add(self.aba_geral, text="Visao Geral")
         self.abas.add(self.aba_processos, text="Processos")
+        self.abas.add(self.aba_custo, text="Custo da Coleta")
         self.abas.pack(expand=1, fill="both")
 
         #Aqui ele cria os elementos graficos para cada aba
         self.interface_aba_geral()  
         self.interface_processos_aba()
+        self.interface_custo_aba()
 
         #Aqui e a atualizacao dos elementos graficos
+        #a interface nao usa timer: o controller avisa cada snapshot novo e o Tk redesenha uma vez por geracao
+        self.geracao_exibida = 0
+        self.atualizadores_detalhes = []  #funcoes de atualizacao das janelas de detalhes abertas
+        self.aviso_pendente = threading.Event()  #junta varios avisos em um unico evento do Tk
+        self.Dashboard.bind("<<NovoSnapshot>>", self.ao_novo_snapshot)
+        self.Dashboard.protocol("WM_DELETE_WINDOW", self.fechar)
+        #o aviso usa event_generate, que so funciona com o mainloop rodando: registra depois que ele comeca
+        self.Dashboard.after_idle(self.registrar_aviso)
+
+    def registrar_aviso(self):
+        self.controller.add_snapshot_listener(self.avisar_novo_snapshot)
+        #se alguma coleta terminou antes do registro, ela e exibida agora
+        self.ao_novo_snapshot()
+
+    def avisar_novo_snapshot(self, snapshot):
+        #chamado na thread do controller: so agenda o evento, o desenho acontece na thread do Tk
+        if self.aviso_pendente.is_set():
+            return
+        self.aviso_pendente.set()
+        try:
+            self.Dashboard.event_generate("<<NovoSnapshot>>", when="tail")
+        except (tk.TclError, RuntimeError):
+            #janela ja fechada ou mainloop parado: libera o proximo aviso
+            self.aviso_pendente.clear()
+
+    def ao_novo_snapshot(self, event=None):
+        #redesenha uma unica vez por geracao nova; avisos repetidos ou sem mudanca sao ignorados
+        self.aviso_pendente.clear()
+        snapshot = self.controller.get_snapshot(newer_than=self.geracao_exibida)
+        if snapshot is None:
+            return
+        self.geracao_exibida = snapshot.generation
         self.atualizacao_interface()
+        self.atualizacao_custo()
+        for atualizar in list(self.atualizadores_detalhes):
+            atualizar()
+
+    def fechar(self):
+        self.controller.remove_snapshot_listener(self.avisar_novo_snapshot)
+        self.controller.stop()
+        self.Dashboard.destroy()
     def interface_aba_geral(self):
         #funcao para criar elementos graficos da aba geral por meio da biblioteca Tkinter
         #frame principal da aba geral
@@ -43,21 +98,24 @@ class InterfaceDashboard:
         self.label_titulo_cpu.grid(row=0, column=0)
         self.GraficoCPU = tk.Canvas(frame_grafico, width=400, height=250, bg="dark gray")
         self.GraficoCPU.grid(row=1, column=0, padx=5, pady=5)
-        self.CPUuso_lista = [0] * 100
+        self.CPUuso_lista = RingBuffer(self.tamanho_historico)
+        self.serie_cpu = GraficoSerie(self.GraficoCPU, cor="light blue", maximo_fixo=100, sufixo="%", pontos=self.tamanho_historico)
 
         #criando o titulo e o gráfico de processos
         self.label_titulo_processos = tk.Label(frame_grafico, text="Total de Processos: --", font=("Arial", 12, "bold"), bg="gray15", fg="white")
         self.label_titulo_processos.grid(row=0, column=1)
         self.GraficoProcessos = tk.Canvas(frame_grafico, width=400, height=250, bg="dark gray")
         self.GraficoProcessos.grid(row=1, column=1, padx=5, pady=5)
-        self.processos_lista = [0] * 100
+        self.processos_lista = RingBuffer(self.tamanho_historico)
+        self.serie_processos = GraficoSerie(self.GraficoProcessos, cor="cyan", pontos=self.tamanho_historico)
 
         #criando o titulo e o gráfico de memoria
         self.label_titulo_memoria = tk.Label(frame_grafico, text="Uso da Memória: --%", font=("Arial", 12, "bold"), bg="gray15", fg="white")
         self.label_titulo_memoria.grid(row=2, column=0)
         self.GraficoMemoria = tk.Canvas(frame_grafico, width=400, height=250, bg="dark gray")
         self.GraficoMemoria.grid(row=3, column=0, padx=5, pady=5)
-        self.MEMuso_lista = [0] * 100
+        self.MEMuso_lista = RingBuffer(self.tamanho_historico)
+        self.serie_memoria = GraficoSerie(self.GraficoMemoria, cor="light green", maximo_fixo=100, sufixo="%", pontos=self.tamanho_historico)
         self.label_swap_info = tk.Label(frame_grafico,text="Swap Usado: -- MB",font=("Arial", 10),bg="gray15",fg="white")
         self.label_swap_info.grid(row=4, column=0)
 
@@ -66,7 +124,8 @@ class InterfaceDashboard:
         self.label_titulo_threads.grid(row=2, column=1)
         self.GraficoThreads = tk.Canvas(frame_grafico, width=400, height=250, bg="dark gray")
         self.GraficoThreads.grid(row=3, column=1, padx=5, pady=5)
-        self.threads_lista = [0] * 100
+        self.threads_lista = RingBuffer(self.tamanho_historico)
+        self.serie_threads = GraficoSerie(self.GraficoThreads, cor="magenta", pontos=self.tamanho_historico)
         
         #criando o frame para a tabela de estatisticas
         frame_estat = tk.Frame(frame_grafico, bg="gray15")
@@ -90,20 +149,105 @@ class InterfaceDashboard:
         #funcao para criar elementos da aba de processos
         
         #Aqui criamos a tabela de processos, contendo informacoes como Id do processo, usuario, cpu usado, memoria e cmd que criou o processo
-        self.listaprocessos = ttk.Treeview(self.aba_processos, columns=("PID", "User", "CPU", "Mem", "Cmd"), show='headings')
-        for col in self.listaprocessos["columns"]:
-            self.listaprocessos.heading(col, text=col)
-            self.listaprocessos.column(col, width=150 if col != "Cmd" else 300, anchor='center')
+        #a lista e virtualizada: so as linhas visiveis viram itens do Tk, independente do numero de processos
+        self.listaprocessos = ListaVirtual(
+            self.aba_processos, ("PID", "User", "CPU", "Mem", "Cmd"),
+            {"PID": 150, "User": 150, "CPU": 150, "Mem": 150, "Cmd": 300})
         self.listaprocessos.pack(expand=True, fill="both")
 
         #botao para ver detalhe
         self.btn_detalhes = tk.Button(self.aba_processos, text="Ver Detalhes do Processo", command=self.ver_detalhes)
         self.btn_detalhes.pack(pady=10)
 
+        #geracao do snapshot ja aplicada na tabela (0 = tabela vazia)
+        self.geracao_processos = 0
+        #linhas de cada processo fora do Tk: {pid: (cpu_percent, valores exibidos)}
+        self.dados_processos = {}
+
+    def interface_custo_aba(self):
+        #aba com o custo do proprio monitor: duracao de cada etapa da coleta e leituras do /proc por ciclo
+        frame_custo = tk.Frame(self.aba_custo, bg="gray15")
+        frame_custo.pack(fill="both", expand=True, padx=10, pady=10)
+
+        #grafico com a duracao total de cada ciclo (historico mantido pelo controller)
+        self.label_titulo_custo = tk.Label(frame_custo, text="Duração do Ciclo: -- ms", font=("Arial", 12, "bold"), bg="gray15", fg="white")
+        self.label_titulo_custo.grid(row=0, column=0)
+        self.GraficoCusto = tk.Canvas(frame_custo, width=400, height=250, bg="dark gray")
+        self.GraficoCusto.grid(row=1, column=0, rowspan=3, padx=5, pady=5, sticky="n")
+        self.serie_custo = GraficoSerie(self.GraficoCusto, cor="orange", sufixo="ms", pontos=self.tamanho_historico)
+
+        #tabelas de etapas (ms) e de contadores (por ciclo), com ultimo/min/max/media do historico
+        colunas = ("Nome", "Ultimo", "Min", "Max", "Media")
+        tk.Label(frame_custo, text="Etapas (ms)", font=("Arial", 12, "bold"), bg="gray15", fg="white").grid(row=0, column=1)
+        self.custo_etapas = ttk.Treeview(frame_custo, columns=colunas, show="headings", height=6)
+        tk.Label(frame_custo, text="Leituras do /proc por ciclo", font=("Arial", 12, "bold"), bg="gray15", fg="white").grid(row=2, column=1)
+        self.custo_contadores = ttk.Treeview(frame_custo, columns=colunas, show="headings", height=6)
+        for linha, tabela in ((1, self.custo_etapas), (3, self.custo_contadores)):
+            for col in colunas:
+                tabela.heading(col, text=col)
+                tabela.column(col, anchor="center", width=120 if col == "Nome" else 80)
+            tabela.grid(row=linha, column=1, padx=10, pady=5, sticky="n")
+
+        #intervalo em uso por cada coletor (alongado pelo agendador se houver orcamento de CPU)
+        self.label_coletores = tk.Label(frame_custo, text="", font=("Arial", 10), bg="gray15", fg="white", justify="left")
+        self.label_coletores.grid(row=4, column=0, columnspan=2, sticky="w", pady=(10, 0))
+
+    def atualizacao_custo(self):
+        #atualiza a aba de custo com o historico do controller (as linhas sao criadas uma vez, iid = nome)
+        custo = self.controller.get_collection_overhead()
+        ciclo = custo["cycle_ms"]
+        if ciclo["last"] is not None:
+            self.label_titulo_custo.config(text=f"Duração do Ciclo: {ciclo['last']:.1f} ms | Média: {ciclo['mean']:.1f} ms")
+            self.serie_custo.atualizar(ciclo["history"][-self.tamanho_historico:])
+
+        def linha_resumo(nome, resumo, formato):
+            if resumo["last"] is None:
+                return (nome, "-", "-", "-", "-")
+            return (nome,) + tuple(formato.format(resumo[chave]) for chave in ("last", "min", "max", "mean"))
+
+        for tabela, resumos, formato in (
+            (self.custo_etapas, custo["stages_ms"], "{:.2f}"),
+            (self.custo_contadores, custo["counters"], "{:.0f}"),
+        ):
+            for nome, resumo in resumos.items():
+                valores = linha_resumo(nome, resumo, formato)
+                if tabela.exists(nome):
+                    tabela.item(nome, values=valores)
+                else:
+                    tabela.insert("", "end", iid=nome, values=valores)
+
+        self.label_coletores.config(text="   ".join(
+            f"{nome}: a cada {c['effective_interval_sec']:.1f}s ({c['overhead_percent']:.2f}% de um núcleo)"
+            for nome, c in custo["collectors"].items()))
+
+    def linha_processo(self, proc):
+        #valores exibidos na tabela de processos para um ProcessInfo
+        return (proc.pid, proc.user, f"{proc.cpu_percent:.2f}%", f"{proc.mem_percent:.2f}%", proc.cmdline[:80])
+
+    def aplicar_delta_processos(self, delta):
+        #aplica as diferencas do delta no dataset da lista (fora do Tk), formatando so as linhas que mudaram
+        dados = self.dados_processos
+        if delta.full_resync:
+            dados.clear()
+
+        for pid in delta.removed:
+            dados.pop(pid, None)
+        for proc in delta.added:
+            dados[proc.pid] = (proc.cpu_percent, self.linha_processo(proc))
+        for pid in delta.changed:
+            proc = delta.snapshot.get_process(pid)
+            if proc is not None:
+                dados[pid] = (proc.cpu_percent, self.linha_processo(proc))
+
+        #ordena por uso de CPU; a lista virtual redesenha apenas a area visivel
+        ordenados = sorted(dados.values(), key=lambda d: d[0], reverse=True)
+        self.listaprocessos.definir_linhas([linha for _, linha in ordenados])
+
+        self.geracao_processos = delta.generation
+
     def atualizacao_interface(self):
         #Pega informacoes geral do processador e dos processos pelo controller
         info = self.controller.get_system_global_info()
-        processos = self.controller.get_all_processes()
 
         #Demonstra informacoes em texto para usuario
         self.label_titulo_cpu.config(
@@ -112,112 +256,22 @@ class InterfaceDashboard:
 
         #aqui estamos atualizando a lista de cada grafico
         #e estamos atualizando o titulo dos graficos que mostram a porcentagem
+        #(buffers circulares: a amostra mais antiga e descartada automaticamente)
         self.CPUuso_lista.append(info.cpu_usage_percent)
-        self.CPUuso_lista.pop(0)
         self.MEMuso_lista.append(info.mem_used_percent)
         self.label_titulo_memoria.config(text=f"Uso da Memória: {info.mem_used_percent:.2f}% | Livre: {100 - info.mem_used_percent:.2f}%")
-        self.MEMuso_lista.pop(0)
         self.label_swap_info.config(text=f"Swap Usado: {info.swap_used_kb / 1024:.2f} MB")
         self.processos_lista.append(info.total_processes)
-        self.processos_lista.pop(0)
         self.threads_lista.append(info.total_threads)
-        self.threads_lista.pop(0)
         self.label_titulo_processos.config(text=f"Total de Processos: {info.total_processes}")
         self.label_titulo_threads.config(text=f"Total de Threads: {info.total_threads}")
 
 
-        altura = 230
-        largura = 400
-        intervalo_atualizacao = 5
-
-        margem_x = 35
-        margem_y = 8
-
-        #Atualiza o grafico da cpu
-        self.GraficoCPU.delete("all")
-        for i in range(0, 101, 20):  #aqui esta configurando o Eixo Y, atualizando os valores dele
-            y = altura - (i / 100 * altura) + margem_y
-            self.GraficoCPU.create_line(margem_x, y, largura, y, fill="lightgray", dash=(2, 2))
-            self.GraficoCPU.create_text(margem_x - 5, y, text=f"{i}%", anchor="e", fill="white", font=("Arial", 8))
-        for i in range(0, len(self.CPUuso_lista), 10): #aqui esta configurando o Eixo X, atualizando os valores dele
-            x = margem_x + i * ((largura - margem_x) / len(self.CPUuso_lista))
-            tempo_seg = (len(self.CPUuso_lista) - i) * intervalo_atualizacao
-            self.GraficoCPU.create_line(x, margem_y, x, altura + margem_y, fill="lightgray", dash=(2, 2))
-            self.GraficoCPU.create_text(x, altura + margem_y + 2, text=f"-{tempo_seg}s", anchor="n", fill="white", font=("Arial", 8))
-
-        for i in range(1, len(self.CPUuso_lista)): #Cria as linhas do grafico
-            x1 = margem_x + (i - 1) * ((largura - margem_x) / len(self.CPUuso_lista))
-            y1 = altura - (self.CPUuso_lista[i - 1] / 100 * altura) + margem_y
-            x2 = margem_x + i * ((largura - margem_x) / len(self.CPUuso_lista))
-            y2 = altura - (self.CPUuso_lista[i] / 100 * altura) + margem_y
-            self.GraficoCPU.create_line(x1, y1, x2, y2, fill="light blue", width=2)
-
-        #atualiza o grafico da memoria total
-        self.GraficoMemoria.delete("all")
-        for i in range(0, 101, 20):  #aqui esta configurando o Eixo Y, atualizando os valores dele
-            y = altura - (i / 100 * altura) + margem_y
-            self.GraficoMemoria.create_line(margem_x, y, largura, y, fill="lightgray", dash=(2, 2))
-            self.GraficoMemoria.create_text(margem_x - 5, y, text=f"{i}%", anchor="e", fill="white", font=("Arial", 8))
-        for i in range(0, len(self.MEMuso_lista), 10): #aqui esta configurando o Eixo X, atualizando os valores dele
-            x = margem_x + i * ((largura - margem_x) / len(self.MEMuso_lista))
-            tempo_seg = (len(self.MEMuso_lista) - i) * intervalo_atualizacao
-            self.GraficoMemoria.create_line(x, margem_y, x, altura + margem_y, fill="lightgray", dash=(2, 2))
-            self.GraficoMemoria.create_text(x, altura + margem_y + 2, text=f"-{tempo_seg}s", anchor="n", fill="white", font=("Arial", 8))
-
-
-        for i in range(1, len(self.MEMuso_lista)): #Cria as linhas do grafico
-            x1 = margem_x + (i - 1) * ((largura - margem_x) / len(self.MEMuso_lista))
-            y1 = altura - (self.MEMuso_lista[i - 1] / 100 * altura) + margem_y
-            x2 = margem_x + i * ((largura - margem_x) / len(self.MEMuso_lista))
-            y2 = altura - (self.MEMuso_lista[i] / 100 * altura) + margem_y
-            self.GraficoMemoria.create_line(x1, y1, x2, y2, fill="light green", width=2)
-        
-        #atualiza o grafico de quantidade de processos
-        self.GraficoProcessos.delete("all")
-        max_proc = max(self.processos_lista) or 1
-
-        for i in range(0, max_proc + 1, max(1, max_proc // 10)): #aqui esta configurando o Eixo Y, atualizando os valores dele
-            y = altura - (i / max_proc * altura) + margem_y
-            self.GraficoProcessos.create_line(margem_x, y, largura, y, fill="lightgray", dash=(2, 2))
-            self.GraficoProcessos.create_text(margem_x - 5, y, text=str(i), anchor="e", fill="white", font=("Arial", 8))
-        # Eixo X do gráfico de processos
-        for i in range(0, len(self.processos_lista), 10): #aqui esta configurando o Eixo X, atualizando os valores dele
-            x = margem_x + i * ((largura - margem_x) / len(self.processos_lista))
-            tempo_seg = (len(self.processos_lista) - i) * intervalo_atualizacao
-            self.GraficoProcessos.create_line(x, margem_y, x, altura + margem_y, fill="lightgray", dash=(2, 2))
-            self.GraficoProcessos.create_text(x, altura + margem_y + 2, text=f"-{tempo_seg}s", anchor="n", fill="white", font=("Arial", 8))
-
-
-        for i in range(1, len(self.processos_lista)): #Cria as linhas do grafico
-            x1 = margem_x + (i - 1) * ((largura - margem_x) / len(self.processos_lista))
-            y1 = altura - (self.processos_lista[i - 1] / max_proc * altura) + margem_y
-            x2 = margem_x + i * ((largura - margem_x) / len(self.processos_lista))
-            y2 = altura - (self.processos_lista[i] / max_proc * altura) + margem_y
-            self.GraficoProcessos.create_line(x1, y1, x2, y2, fill="cyan", width=2)
-
-
-        #atualiza o grafico de quantidade de threads
-        self.GraficoThreads.delete("all")
-        max_thr = max(self.threads_lista) or 1
-
-        for i in range(0, max_thr + 1, max(1, max_thr // 10)):#aqui esta configurando o Eixo Y, atualizando os valores dele
-            y = altura - (i / max_thr * altura) + margem_y
-            self.GraficoThreads.create_line(margem_x, y, largura, y, fill="lightgray", dash=(2, 2))
-            self.GraficoThreads.create_text(margem_x - 5, y, text=str(i), anchor="e", fill="white", font=("Arial", 8))
-        # Eixo X do gráfico de threads
-        for i in range(0, len(self.threads_lista), 10):#aqui esta configurando o Eixo X, atualizando os valores dele
-            x = margem_x + i * ((largura - margem_x) / len(self.threads_lista))
-            tempo_seg = (len(self.threads_lista) - i) * intervalo_atualizacao
-            self.GraficoThreads.create_line(x, margem_y, x, altura + margem_y, fill="lightgray", dash=(2, 2))
-            self.GraficoThreads.create_text(x, altura + margem_y + 2, text=f"-{tempo_seg}s", anchor="n", fill="white", font=("Arial", 8))
-
-
-        for i in range(1, len(self.threads_lista)):#Cria as linhas do grafico
-            x1 = margem_x + (i - 1) * ((largura - margem_x) / len(self.threads_lista))
-            y1 = altura - (self.threads_lista[i - 1] / max_thr * altura) + margem_y
-            x2 = margem_x + i * ((largura - margem_x) / len(self.threads_lista))
-            y2 = altura - (self.threads_lista[i] / max_thr * altura) + margem_y
-            self.GraficoThreads.create_line(x1, y1, x2, y2, fill="magenta", width=2)
+        #atualiza os graficos (os itens do Canvas sao reaproveitados, so as coordenadas mudam)
+        self.serie_cpu.atualizar(self.CPUuso_lista)
+        self.serie_memoria.atualizar(self.MEMuso_lista)
+        self.serie_processos.atualizar(self.processos_lista)
+        self.serie_threads.atualizar(self.threads_lista)
 
 
         # grafico memoria usada
@@ -268,49 +322,39 @@ class InterfaceDashboard:
 
 
         
-        #atualiza a listadeprocessos
-        for i in self.listaprocessos.get_children():
-            self.listaprocessos.delete(i)
-        for proc in sorted(processos, key=lambda p: p.cpu_percent, reverse=True):
-            self.listaprocessos.insert("", "end", values=(
-                proc.pid, proc.user, f"{proc.cpu_percent:.2f}%", f"{proc.mem_percent:.2f}%", proc.cmdline[:80]
-            ))
-            
-        #atualiza a tabela de estatisticas
-        self.estat_tabela.delete(*self.estat_tabela.get_children())
+        #atualiza a listadeprocessos aplicando apenas o que mudou desde a ultima geracao
+        delta = self.controller.get_changes_since(self.geracao_processos)
+        if delta is not None:
+            self.aplicar_delta_processos(delta)
 
+        #atualiza a tabela de estatisticas
+        #min/max/media ja sao mantidos pelos buffers a cada amostra, sem percorrer o historico
         def calc_estat(nome, lista):
-            i = 0
-            while i < len(lista) and lista[i] == 0:
-                i += 1
-            valores_validos = lista[i:]
-            if not valores_validos:
+            if not len(lista):
                 return (nome, "-", "-", "-", "-")
-            return(nome,f"{min(valores_validos):.2f}",f"{max(valores_validos):.2f}",f"{sum(valores_validos)/len(valores_validos):.2f}",f"{lista[-1]:.2f}")
+            return(nome,f"{lista.min():.2f}",f"{lista.max():.2f}",f"{lista.mean():.2f}",f"{lista.latest():.2f}")
 
-    
         for nome, lista in [
             ("CPU (%)", self.CPUuso_lista),
             ("Mem (%)", self.MEMuso_lista),
             ("Procs", self.processos_lista),
             ("Threads", self.threads_lista),
         ]:
-            self.estat_tabela.insert("", "end", values=calc_estat(nome, lista))
-
-        #atualiza a cada 5s a interface
-        self.Dashboard.after(5000, self.atualizacao_interface)
-
-        def ver_detalhes(self):
-        selected = self.listaprocessos.selection()
-        if not selected:
+            #cada linha e criada uma vez (iid = nome) e depois so tem os valores trocados
+            if self.estat_tabela.exists(nome):
+                self.estat_tabela.item(nome, values=calc_estat(nome, lista))
+            else:
+                self.estat_tabela.insert("", "end", iid=nome, values=calc_estat(nome, lista))
+
+    def ver_detalhes(self):
+        pid = self.listaprocessos.get_selected_pid()
+        if pid is None:
             messagebox.showwarning("Seleção", "Selecione um processo na lista.")
             return
 
-        pid = int(self.listaprocessos.item(selected[0], "values")[0])
-
         janela_detalhes = tk.Toplevel(self.Dashboard)
         janela_detalhes.title(f"Detalhes do Processo PID {pid}")
-        janela_detalhes.geometry("750x600")
+        janela_detalhes.geometry("750x720")
         janela_detalhes.configure(bg="gray15")
 
         frame_info = tk.Frame(janela_detalhes, bg="gray15")
@@ -320,6 +364,21 @@ class InterfaceDashboard:
                                       bg="gray15", fg="white", font=("Arial", 10, "bold"))
         frame_memoria.pack(fill="x", padx=10, pady=10)
 
+        #mini-graficos com o historico de CPU e RSS (so existem para os processos mais pesados)
+        frame_historico = tk.LabelFrame(janela_detalhes, text="Histórico (CPU % | RSS em MB)",
+                                        bg="gray15", fg="white", font=("Arial", 10, "bold"))
+        frame_historico.pack(fill="x", padx=10, pady=(0, 10))
+        mini_cpu = tk.Canvas(frame_historico, width=350, height=100, bg="dark gray")
+        mini_cpu.grid(row=0, column=0, padx=5, pady=5)
+        mini_rss = tk.Canvas(frame_historico, width=350, height=100, bg="dark gray")
+        mini_rss.grid(row=0, column=1, padx=5, pady=5)
+        label_sem_historico = tk.Label(frame_historico, text="", bg="gray15", fg="white")
+        label_sem_historico.grid(row=1, column=0, columnspan=2)
+        serie_cpu = GraficoSerie(mini_cpu, cor="light blue", largura=340, altura=75,
+                                 intervalo_atualizacao=self.controller.update_interval_sec, passo_eixo_x=30)
+        serie_rss = GraficoSerie(mini_rss, cor="light green", largura=340, altura=75,
+                                 intervalo_atualizacao=self.controller.update_interval_sec, passo_eixo_x=30)
+
         tk.Label(janela_detalhes, text="Threads:", bg="gray15", fg="white",
                  font=("Arial", 10, "bold")).pack(pady=(10, 0), anchor="w", padx=10)
 
@@ -350,16 +409,18 @@ class InterfaceDashboard:
                 if isinstance(widget, tk.Label):
                     widget.destroy()
 
+            #a memoria detalhada nao vem na varredura, le o perfil "full" so deste pid
+            mem = self.controller.load_full_process_details(pid, proc.starttime_jiffies) or proc
             campos_mem = [
-                ("Memória Virtual Total (VmSize)", proc.vm_size_kb),
-                ("Memória Física (VmRSS)", proc.vm_rss_kb),
-                ("Pico de Memória Virtual (VmPeak)", proc.vm_peak_kb),
-                ("Memória do Código (VmExe)", proc.vm_exe_kb),
-                ("Heap / Dados (VmData)", proc.vm_data_kb),
-                ("Pilha (VmStk)", proc.vm_stk_kb),
-                ("Bibliotecas Compartilhadas (VmLib)", proc.vm_lib_kb),
-                ("Memória em Swap (VmSwap)", proc.vm_swap_kb),
-                ("Tamanho Tabelas de Página (VmPTE)", proc.vm_pte_kb),
+                ("Memória Virtual Total (VmSize)", mem.vm_size_kb),
+                ("Memória Física (VmRSS)", mem.vm_rss_kb),
+                ("Pico de Memória Virtual (VmPeak)", mem.vm_peak_kb),
+                ("Memória do Código (VmExe)", mem.vm_exe_kb),
+                ("Heap / Dados (VmData)", mem.vm_data_kb),
+                ("Pilha (VmStk)", mem.vm_stk_kb),
+                ("Bibliotecas Compartilhadas (VmLib)", mem.vm_lib_kb),
+                ("Memória em Swap (VmSwap)", mem.vm_swap_kb),
+                ("Tamanho Tabelas de Página (VmPTE)", mem.vm_pte_kb),
             ]
 
             for nome, valor in campos_mem:
@@ -370,8 +431,22 @@ class InterfaceDashboard:
             for thr in threads:
                 listathreads.insert("", "end", values=(thr.tid, thr.name, thr.state))
 
-            janela_detalhes.after(3000, atualizar_detalhes)
-
+            historico = self.controller.get_process_history(pid)
+            if historico is None:
+                label_sem_historico.config(text="Sem histórico: o processo não está entre os que mais consomem CPU/memória.")
+            else:
+                cpu_hist, rss_hist = historico
+                label_sem_historico.config(text="")
+                serie_cpu.atualizar(cpu_hist)
+                serie_rss.atualizar([rss / 1024 for rss in rss_hist])
+
+        #a janela e atualizada junto com a interface principal, a cada snapshot novo
+        def ao_fechar_detalhes(event):
+            if event.widget is janela_detalhes and atualizar_detalhes in self.atualizadores_detalhes:
+                self.atualizadores_detalhes.remove(atualizar_detalhes)
+
+        janela_detalhes.bind("<Destroy>", ao_fechar_detalhes)
+        self.atualizadores_detalhes.append(atualizar_detalhes)
         atualizar_detalhes()
 
 
@@ -381,6 +456,9 @@ class InterfaceDashboard:
 if __name__ == "__main__":
     root = tk.Tk()
     root.configure(bg="gray15")
-    app = InterfaceDashboard(root)
+    #uso: python3 -m View [captura [velocidade]]
+    captura = sys.argv[1] if len(sys.argv) > 1 else None
+    velocidade = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+    app = InterfaceDashboard(root, captura=captura, velocidade=velocidade)
     root.mainloop()
 
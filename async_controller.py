@@ -0,0 +1,273 @@
+# scr/async_controller.py
+"""
+Interface asyncio para o controlador de monitoramento.
+
+O AsyncSystemMonitorController executa os mesmos coletores do
+SystemMonitorController, mas agendados por uma task asyncio: a leitura do /proc
+roda em um executor de uma única thread (o event loop nunca bloqueia durante a
+varredura) e cada snapshot publicado é entregue aos assinantes no próprio loop.
+
+Cada assinante tem uma fila limitada; se ele atrasar, os snapshots mais antigos
+são descartados e o consumidor recebe sempre os mais recentes.
+"""
+
+import asyncio
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional
+
+from controller import SystemMonitorController
+from data_model import SystemSnapshot, ThreadInfo
+
+
+class SnapshotSubscription:
+    """Classe que representa a assinatura de um consumidor (iterador assíncrono de snapshots)."""
+
+    def __init__(self, owner: "AsyncSystemMonitorController", maxsize: int = 1) -> None:
+        """Cria a fila do assinante.
+
+        Args:
+            owner (AsyncSystemMonitorController): Controller que publica os snapshots.
+            maxsize (int, optional): Snapshots guardados enquanto o consumidor não os lê.
+        """
+        self._owner = owner
+        # O limite é aplicado em _offer: a fila em si não tem limite, para que o sinal de
+        # encerramento sempre caiba sem descartar o último snapshot
+        self._maxsize: int = max(1, maxsize)
+        self._queue: "asyncio.Queue[Optional[SystemSnapshot]]" = asyncio.Queue()
+        self.dropped: int = 0  # Snapshots descartados porque o consumidor estava atrasado
+        self.closed: bool = False
+
+    def _offer(self, snapshot: Optional[SystemSnapshot]) -> None:
+        """Coloca um snapshot na fila, descartando o mais antigo se ela estiver cheia."""
+        if self._queue.qsize() >= self._maxsize:
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(snapshot)
+
+    async def get(self) -> SystemSnapshot:
+        """Aguarda o próximo snapshot da fila.
+
+        Raises:
+            StopAsyncIteration: Se a assinatura ou o controller tiverem sido encerrados.
+        """
+        if self.closed and self._queue.empty():
+            raise StopAsyncIteration
+        snapshot = await self._queue.get()
+        if snapshot is None:  # Sinal de encerramento
+            self.closed = True
+            raise StopAsyncIteration
+        return snapshot
+
+    def close(self) -> None:
+        """Cancela a assinatura; iterações pendentes terminam."""
+        if not self.closed:
+            self._owner._unsubscribe(self)
+            self._queue.put_nowait(None)  # Sinal de encerramento, depois dos snapshots pendentes
+
+    def __aiter__(self) -> "SnapshotSubscription":
+        return self
+
+    async def __anext__(self) -> SystemSnapshot:
+        return await self.get()
+
+    async def __aenter__(self) -> "SnapshotSubscription":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        self.close()
+
+
+class AsyncSystemMonitorController:
+    """Classe que agenda a coleta em uma task asyncio e distribui os snapshots aos assinantes."""
+
+    def __init__(self, update_interval_sec: float = 2.0, **controller_kwargs: Any) -> None:
+        """Cria o controller síncrono usado para a coleta (sem iniciar a thread dele).
+
+        Args:
+            update_interval_sec (float, optional): Intervalo em segundos entre coletas.
+            **controller_kwargs: Demais opções repassadas ao SystemMonitorController
+                (scan_workers, columnar, history_path, process_interval_sec, ...).
+        """
+        self.update_interval_sec: float = update_interval_sec
+        self.controller: SystemMonitorController = SystemMonitorController(
+            update_interval_sec=update_interval_sec, **controller_kwargs
+        )
+        # Uma única thread: os ciclos de coleta nunca se sobrepõem
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="async-collector"
+        )
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._subscribers: List[SnapshotSubscription] = []
+        self._published: Optional[asyncio.Event] = None  # Trocado a cada geração
+
+    # --- Ciclo de coleta ---
+
+    def _distribute(self) -> SystemSnapshot:
+        """Entrega o snapshot publicado aos assinantes e acorda quem espera em next_snapshot."""
+        snapshot = self.controller.get_snapshot()
+        for subscription in list(self._subscribers):
+            subscription._offer(snapshot)
+        if self._published is not None:
+            self._published.set()
+        self._published = asyncio.Event()
+        return snapshot
+
+    async def _collect_once(self) -> SystemSnapshot:
+        """Executa um ciclo completo de coleta no executor e distribui o snapshot publicado."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self.controller._update_data)
+        return self._distribute()
+
+    async def _run(self) -> None:
+        """Executa o loop de coleta; se a task morrer, acorda os consumidores que esperam."""
+        try:
+            await self._run_ticks()
+        except asyncio.CancelledError:
+            raise
+        except BaseException as e:
+            print(f"Erro fatal no loop de atualização do controller assíncrono: {e}")
+            traceback.print_exc()
+            # Sem novos snapshots: quem espera em next_snapshot recebe RuntimeError
+            # e as assinaturas terminam
+            if self._published is not None:
+                self._published.set()
+            for subscription in list(self._subscribers):
+                subscription.close()
+            raise
+
+    async def _run_ticks(self) -> None:
+        """Loop de coleta com os mesmos coletores e ticks de taxa fixa do controller síncrono."""
+        loop = asyncio.get_running_loop()
+        scheduler = self.controller._scheduler
+        try:
+            await self._collect_once()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Erro no loop de atualização do controller assíncrono: {e}")
+            traceback.print_exc()
+        scheduler.reset()
+        while True:
+            wait_time = scheduler.next_wakeup() - time.monotonic()
+            if wait_time > 0:
+                await asyncio.sleep(wait_time)
+            try:
+                # Os coletores vencidos rodam no executor; cada tick publica no máximo um snapshot
+                collected = await loop.run_in_executor(self._executor, scheduler.run_pending)
+                if collected:
+                    self._distribute()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Como no controller síncrono, um tick com erro não encerra a coleta
+                print(f"Erro no loop de atualização do controller assíncrono: {e}")
+                traceback.print_exc()
+
+    async def start(self) -> None:
+        """Inicia a task de coleta no event loop atual."""
+        if self._task is not None and not self._task.done():
+            return
+        self._published = asyncio.Event()
+        # Gravação/reprodução e arquivos globais desfeitos por um stop() anterior
+        self.controller._install_proc_hooks()
+        self.controller._open_history()
+        # O exportador de métricas (se configurado) é iniciado aqui, já que a thread
+        # do controller síncrono não é usada
+        exporter = self.controller._metrics_exporter
+        if exporter is not None:
+            try:
+                exporter.start()
+            except OSError as e:
+                print(f"Aviso: Não foi possível iniciar o exportador de métricas: {e}")
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Para a coleta, encerra as assinaturas e libera o executor."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            except Exception:
+                pass  # A task já terminou com erro, registrado em _run
+            self._task = None
+        # Acorda quem espera em next_snapshot (que então vê a task encerrada)
+        if self._published is not None:
+            self._published.set()
+        for subscription in list(self._subscribers):
+            subscription.close()
+        # Espera o ciclo em andamento (se houver) sem bloquear o loop
+        await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+        await asyncio.get_running_loop().run_in_executor(None, self.controller.stop)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="async-collector")
+
+    async def __aenter__(self) -> "AsyncSystemMonitorController":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.stop()
+
+    # --- API para consumidores ---
+
+    def get_snapshot(self) -> SystemSnapshot:
+        """Retorna o snapshot mais recente (O(1), sem bloquear)."""
+        return self.controller.get_snapshot()
+
+    async def next_snapshot(self, newer_than: Optional[int] = None) -> SystemSnapshot:
+        """Aguarda um snapshot mais novo.
+
+        Args:
+            newer_than (Optional[int], optional): Geração já conhecida pelo consumidor. Se o
+                snapshot atual já for mais novo, ele é retornado imediatamente. Se omitido,
+                espera a próxima publicação.
+
+        Returns:
+            SystemSnapshot: Snapshot publicado.
+
+        Raises:
+            RuntimeError: Se o controller não tiver sido iniciado ou for parado durante a espera.
+        """
+        if newer_than is None:
+            newer_than = self.controller.get_snapshot().generation
+        while True:
+            snapshot = self.controller.get_snapshot()
+            if snapshot.generation > newer_than:
+                return snapshot
+            if self._published is None or self._task is None:
+                raise RuntimeError("O controller assíncrono não foi iniciado (use start()).")
+            if self._task.done():
+                raise RuntimeError("O loop de coleta do controller assíncrono terminou.")
+            await self._published.wait()
+            if self._task is None:
+                raise RuntimeError("O controller assíncrono foi parado.")
+            if self._task.done():
+                raise RuntimeError("O loop de coleta do controller assíncrono terminou.")
+
+    def subscribe(self, maxsize: int = 1) -> SnapshotSubscription:
+        """Cria uma assinatura que recebe cada snapshot publicado a partir de agora.
+
+        Args:
+            maxsize (int, optional): Tamanho da fila do assinante. Com 1 (padrão), um
+                consumidor atrasado recebe só o snapshot mais recente.
+
+        Returns:
+            SnapshotSubscription: Iterador assíncrono (use com "async for").
+        """
+        subscription = SnapshotSubscription(self, maxsize)
+        self._subscribers.append(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription: SnapshotSubscription) -> None:
+        if subscription in self._subscribers:
+            self._subscribers.remove(subscription)
+
+    async def load_threads_for_process(self, pid: int) -> List[ThreadInfo]:
+        """Lê as threads de um processo fora do event loop (ver load_and_get_threads_for_process)."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, self.controller.load_and_get_threads_for_process, pid
+        )
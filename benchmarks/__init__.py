@@ -0,0 +1,2 @@
+# benchmarks/__init__.py
+"""Benchmarks do monitor de sistema (executar com `python3 -m benchmarks.<nome>`)."""
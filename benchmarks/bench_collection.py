@@ -0,0 +1,185 @@
+# benchmarks/bench_collection.py
+"""
+Benchmark da coleta completa contra uma árvore /proc sintética.
+
+Gera (ou reaproveita) uma árvore do procfs_fixture para cada quantidade de PIDs
+e mede, com a raiz do procfs apontada para ela:
+- get_all_processes_info_list: vazão da varredura (PIDs/s) e custo por PID;
+- get_process_details: custo por PID na leitura completa e com starttime conhecido;
+- perfis de coleta (minimal, table, full): custo por PID de um processo conhecido;
+- populate_system_global_data: custo de uma coleta global, reabrindo os arquivos
+  e com os descritores persistentes (procfs.PersistentFiles);
+- SystemMonitorController._update_data: primeiro ciclo (frio) e ciclos seguintes;
+- pico de memória (tracemalloc) da varredura e de um ciclo do controller.
+
+Como a árvore é determinística, os números podem ser comparados entre versões
+do código e entre máquinas. Árvores com 100k PIDs ocupam alguns GB em disco;
+use --fixture-dir para gerá-las uma única vez.
+
+Uso:
+    python3 -m benchmarks.bench_collection [--pids 1000 10000 100000] [--fixture-dir DIR]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+import procfs
+import procfs_fixture
+import system_monitor
+from controller import SystemMonitorController
+from data_model import SystemGlobalInfo
+from system_constants import SystemConstants
+
+# Arquivo gravado ao final da geração; árvores sem ele são geradas de novo
+_MARKER: str = ".fixture-completa"
+
+
+def _fixture(base_dir: str, num_pids: int, cores: int, seed: int) -> str:
+    """Retorna o diretório da árvore com num_pids PIDs, gerando-a se necessário."""
+    root = os.path.join(base_dir, f"proc-{num_pids}-{cores}-{seed}")
+    if not os.path.exists(os.path.join(root, _MARKER)):
+        shutil.rmtree(root, ignore_errors=True)
+        start = time.perf_counter()
+        procfs_fixture.generate(root, num_pids, cores, seed)
+        open(os.path.join(root, _MARKER), "w").close()
+        print(f"Árvore gerada em {time.perf_counter() - start:.1f} s: {root}")
+    return root
+
+
+def _best(func: Callable[[], object], repeticoes: int) -> float:
+    """Retorna o menor tempo (s) de `repeticoes` execuções de func."""
+    tempos = []
+    for _ in range(repeticoes):
+        start = time.perf_counter()
+        func()
+        tempos.append(time.perf_counter() - start)
+    return min(tempos)
+
+
+def _peak_memory(func: Callable[[], object]) -> float:
+    """Retorna o pico de memória alocada (MB) durante func."""
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def _bench_tree(root: str, num_pids: int, cores: int, repeticoes: int, ciclos: int) -> None:
+    procfs.set_proc_root(root)
+    constants = SystemConstants(100, cores, cores, 4096)
+
+    # Varredura completa
+    processes = system_monitor.get_all_processes_info_list()
+    scan = _best(system_monitor.get_all_processes_info_list, repeticoes)
+    print(
+        f"{'varredura':>22} | {scan * 1000:9.2f} ms | {len(processes) / scan:9.0f} PIDs/s | "
+        f"{scan / len(processes) * 1e6:7.2f} us/PID"
+    )
+
+    # Leitura de um PID, completa e com starttime conhecido (caminho dos ciclos seguintes)
+    known: List[Tuple[int, int]] = [(p.pid, p.starttime_jiffies) for p in processes]
+
+    def details_cold() -> None:
+        for pid, _ in known:
+            system_monitor.get_process_details(pid)
+
+    def details_known() -> None:
+        for pid, starttime in known:
+            system_monitor.get_process_details(pid, known_starttime=starttime)
+
+    for nome, func in (("detalhes (completo)", details_cold), ("detalhes (conhecido)", details_known)):
+        tempo = _best(func, repeticoes)
+        print(f"{nome:>22} | {tempo * 1000:9.2f} ms | {tempo / len(known) * 1e6:7.2f} us/PID")
+
+    # Perfis de coleta nos ciclos seguintes (processos conhecidos): arquivos lidos por PID
+    for profile in system_monitor.COLLECTION_PROFILES:
+
+        def details_profile() -> None:
+            for pid, starttime in known:
+                system_monitor.get_process_details(pid, starttime, profile)
+
+        tempo = _best(details_profile, repeticoes)
+        print(
+            f"{'perfil ' + profile:>22} | {tempo * 1000:9.2f} ms | "
+            f"{tempo / len(known) * 1e6:7.2f} us/PID"
+        )
+
+    # Coleta global, reabrindo os arquivos e com descritores persistentes (pread)
+    global_info = SystemGlobalInfo()
+    chamadas = 200
+
+    def global_cycles() -> None:
+        for _ in range(chamadas):
+            system_monitor.populate_system_global_data(global_info)
+
+    tempos = []
+    for files in (None, procfs.PersistentFiles()):
+        procfs.set_persistent_files(files)
+        tempos.append(_best(global_cycles, repeticoes))
+        if files is not None:
+            procfs.set_persistent_files(None)
+            files.close()
+    print(
+        f"{'coleta global':>22} | open: {tempos[0] / chamadas * 1e6:7.1f} us/chamada | "
+        f"pread: {tempos[1] / chamadas * 1e6:7.1f} us/chamada"
+    )
+
+    # Ciclos do controller (sem iniciar a thread de atualização)
+    controller = SystemMonitorController(system_constants=constants)
+    # Sem start(): instala os arquivos globais persistentes como a thread de atualização faria
+    controller._install_proc_hooks()
+    try:
+        start = time.perf_counter()
+        controller._update_data()
+        frio = time.perf_counter() - start
+        quente = _best(controller._update_data, ciclos)
+        print(
+            f"{'controller':>22} | frio: {frio * 1000:9.2f} ms | "
+            f"seguintes: {quente * 1000:9.2f} ms | {quente / num_pids * 1e6:7.2f} us/PID"
+        )
+        pico_ciclo = _peak_memory(controller._update_data)
+    finally:
+        controller.stop()
+
+    pico_varredura = _peak_memory(system_monitor.get_all_processes_info_list)
+    print(
+        f"{'pico de memória':>22} | varredura: {pico_varredura:8.1f} MB | "
+        f"ciclo do controller: {pico_ciclo:8.1f} MB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pids", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--cores", type=int, default=8)
+    parser.add_argument("--semente", type=int, default=1)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--ciclos", type=int, default=5)
+    parser.add_argument(
+        "--fixture-dir",
+        help="Diretório onde as árvores são guardadas e reaproveitadas (padrão: temporário)",
+    )
+    args = parser.parse_args()
+
+    base_dir = args.fixture_dir or tempfile.mkdtemp(prefix="bench-procfs-")
+    try:
+        for num_pids in args.pids:
+            print(f"\n--- {num_pids} PIDs ---")
+            root = _fixture(base_dir, num_pids, args.cores, args.semente)
+            _bench_tree(root, num_pids, args.cores, args.repeticoes, args.ciclos)
+    finally:
+        procfs.set_proc_root(procfs.DEFAULT_PROC_ROOT)
+        if args.fixture_dir is None:
+            shutil.rmtree(base_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# benchmarks/bench_history_store.py
+"""
+Benchmark do histórico persistente (HistoryStore).
+
+Mede o custo por amostra gravada (incluindo a atualização das camadas de 1 minuto
+e 1 hora) e o tempo de consultas de uma hora, um dia e uma semana em um arquivo
+com vários dias de amostras simuladas.
+
+Uso:
+    python3 -m benchmarks.bench_history_store [--dias N] [--intervalo S]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from history_store import HISTORY_FIELDS, HistoryStore
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dias", type=float, default=7.0, help="Dias de amostras simuladas")
+    parser.add_argument("--intervalo", type=float, default=2.0, help="Segundos entre amostras")
+    parser.add_argument("--pontos", type=int, default=600, help="max_points das consultas")
+    args = parser.parse_args()
+
+    n = int(args.dias * 86400 / args.intervalo)
+    values = [float(i) for i in range(len(HISTORY_FIELDS))]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "historico.bin")
+        store = HistoryStore(path)
+        inicio = time.time() - n * args.intervalo
+
+        t0 = time.perf_counter()
+        for i in range(n):
+            store.append(inicio + i * args.intervalo, values)
+        gravacao = time.perf_counter() - t0
+        fim = inicio + n * args.intervalo
+
+        print(f"Arquivo: {store.size_bytes / 2**20:.1f} MiB | {n} amostras")
+        print(f"Gravação: {1e6 * gravacao / n:.1f} us/amostra")
+
+        for nome, janela in (("1 hora", 3600), ("1 dia", 86400), ("1 semana", 7 * 86400)):
+            t0 = time.perf_counter()
+            resultado = store.query(fim - janela, fim, max_points=args.pontos)
+            consulta = time.perf_counter() - t0
+            print(
+                f"Consulta {nome:>8}: {1e3 * consulta:7.2f} ms | camada {resultado.tier:>4} | "
+                f"{len(resultado.points)} pontos"
+            )
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
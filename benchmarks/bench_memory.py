@@ -0,0 +1,69 @@
+# benchmarks/bench_memory.py
+"""
+Benchmark de memória (tracemalloc) das classes do modelo de dados.
+
+Compara bytes por instância de ProcessInfo, ThreadInfo e SystemGlobalInfo com
+__slots__ (atual) e com __dict__ por instância (como antes), usando classes
+equivalentes criadas a partir dos mesmos métodos __init__.
+
+Uso:
+    python3 -m benchmarks.bench_memory [--processos N]
+"""
+
+import argparse
+import tracemalloc
+from typing import Callable
+
+from data_model import ProcessInfo, SystemGlobalInfo, ThreadInfo
+
+
+def _legacy_class(cls: type) -> type:
+    """Cria uma classe com __dict__ por instância e o mesmo __init__ da classe original."""
+    return type(f"Legacy{cls.__name__}", (), {"__init__": cls.__init__})
+
+
+def _measure(factory: Callable[[int], object], n: int) -> float:
+    """Retorna os bytes alocados por instância ao criar n objetos com factory."""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    objects = [factory(i) for i in range(n)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return (after - before) / n
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--processos", type=int, default=40000)
+    args = parser.parse_args()
+    n = args.processos
+
+    legacy_process = _legacy_class(ProcessInfo)
+    legacy_thread = _legacy_class(ThreadInfo)
+    legacy_global = _legacy_class(SystemGlobalInfo)
+
+    casos = [
+        ("ProcessInfo", lambda i: legacy_process(i + 1), lambda i: ProcessInfo(i + 1)),
+        ("ThreadInfo", lambda i: legacy_thread(i + 1, 1), lambda i: ThreadInfo(i + 1, 1)),
+        ("SystemGlobalInfo", lambda i: legacy_global(), lambda i: SystemGlobalInfo()),
+    ]
+
+    print(f"{n} instâncias por classe")
+    for nome, antes, depois in casos:
+        bytes_antes = _measure(antes, n)
+        bytes_depois = _measure(depois, n)
+        print(
+            f"{nome:>16} | antes: {bytes_antes:8.1f} B | depois: {bytes_depois:8.1f} B | "
+            f"economia: {100 * (1 - bytes_depois / bytes_antes):5.1f}%"
+        )
+
+    total_antes = _measure(lambda i: legacy_process(i + 1), n) * n
+    total_depois = _measure(lambda i: ProcessInfo(i + 1), n) * n
+    print(
+        f"\nTabela com {n} processos: {total_antes / 2**20:.1f} MiB -> {total_depois / 2**20:.1f} MiB"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# benchmarks/bench_parallel_scan.py
+"""
+Benchmark da varredura de /proc/[pid] com os backends serial, thread e process.
+
+Os PIDs reais da máquina são repetidos até atingir cada quantidade pedida, para
+simular hosts com muitos processos. Cada configuração é medida como uma coleta
+completa (sem starttime conhecido), igual ao primeiro ciclo do controller.
+
+Uso:
+    python3 -m benchmarks.bench_parallel_scan [--pids 1000 5000] [--workers 2 4]
+"""
+
+import argparse
+import itertools
+import time
+
+import system_monitor
+from process_scanner import ProcessScanner
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pids", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4])
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    live_pids = system_monitor.list_pids()
+    print(f"PIDs reais disponíveis: {len(live_pids)}")
+
+    configs = [("serial", 1)] + [
+        (backend, workers) for backend in ("thread", "process") for workers in args.workers
+    ]
+
+    for num_pids in args.pids:
+        pids = list(itertools.islice(itertools.cycle(live_pids), num_pids))
+        print(f"\n--- {num_pids} PIDs ---")
+        baseline = None
+        for backend, workers in configs:
+            scanner = ProcessScanner(workers=workers, backend=backend)
+            try:
+                scanner.scan(pids[:10])  # Aquece o pool (criação dos workers fora da medição)
+                tempos = []
+                for _ in range(args.repeticoes):
+                    start = time.perf_counter()
+                    scanner.scan(pids)
+                    tempos.append(time.perf_counter() - start)
+            finally:
+                scanner.close()
+            melhor = min(tempos)
+            baseline = baseline or melhor
+            print(
+                f"{backend:>8} x{workers:<2} | {melhor * 1000:9.2f} ms | "
+                f"{melhor / num_pids * 1e6:7.2f} us/PID | {baseline / melhor:5.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
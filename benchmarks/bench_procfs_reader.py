@@ -0,0 +1,172 @@
+# benchmarks/bench_procfs_reader.py
+"""
+Benchmark da leitura de /proc/[pid] com dir_fd e bytes contra a leitura por caminho em texto.
+
+A implementação anterior de get_process_details (open() de cada caminho em modo
+texto, parsing em str) é reproduzida aqui como referência, com os mesmos campos.
+As duas leem a mesma árvore: o /proc da máquina, repetido até a quantidade
+pedida, ou uma árvore sintética do procfs_fixture (--fixture). Antes de medir,
+o benchmark confere que as duas produzem os mesmos valores.
+
+Uso:
+    python3 -m benchmarks.bench_procfs_reader [--pids 1000 10000] [--fixture N]
+"""
+
+import argparse
+import itertools
+import os
+import shutil
+import tempfile
+import time
+from typing import Callable, List, Optional, Sequence
+
+import procfs
+import procfs_fixture
+import system_monitor
+from data_model import ProcessInfo, ThreadInfo
+
+# Campos que não mudam enquanto o processo existe (comparáveis no /proc da máquina)
+_STABLE_FIELDS = ("comm", "cmdline", "user", "uid", "ppid", "starttime_jiffies")
+
+_MEMORY_KEYS = {
+    "VmPeak": "vm_peak_kb", "VmSize": "vm_size_kb", "VmLck": "vm_lck_kb",
+    "VmPin": "vm_pin_kb", "VmHWM": "vm_hwm_kb", "VmRSS": "vm_rss_kb",
+    "RssAnon": "rss_anon_kb", "RssFile": "rss_file_kb", "RssShmem": "rss_shmem_kb",
+    "VmData": "vm_data_kb", "VmStk": "vm_stk_kb", "VmExe": "vm_exe_kb",
+    "VmLib": "vm_lib_kb", "VmPTE": "vm_pte_kb", "VmSwap": "vm_swap_kb",
+}
+
+
+def _legacy_process_details(pid: int) -> Optional[ProcessInfo]:
+    """get_process_details anterior: um open() por caminho, modo texto e parsing em str."""
+    base = f"{procfs.get_proc_root()}/{pid}"
+    try:
+        info = ProcessInfo(pid)
+        with open(f"{base}/stat", "r") as f:
+            line = f.read()
+        first_paren = line.index("(")
+        last_paren = line.rindex(")")
+        info.comm = line[first_paren + 1 : last_paren]
+        fields = line[last_paren + 1 :].strip().split()
+        info.state = fields[0]
+        info.ppid = int(fields[1])
+        info.utime = int(fields[11])
+        info.stime = int(fields[12])
+        info.priority = int(fields[15])
+        info.nice = int(fields[16])
+        info.num_threads = int(fields[17])
+        info.starttime_jiffies = int(fields[19])
+        uid = -1
+        with open(f"{base}/status", "r") as f:
+            for status_line in f.read().splitlines():
+                parts = status_line.strip().split(":", 1)
+                if len(parts) != 2:
+                    continue
+                key = parts[0].strip()
+                values = parts[1].strip().split()
+                if key == "Uid" and values and values[0].isdigit():
+                    uid = info.uid = int(values[0])
+                elif key in _MEMORY_KEYS and values and values[0].isdigit():
+                    setattr(info, _MEMORY_KEYS[key], int(values[0]))
+        info.user = system_monitor.get_username_from_uid(uid)
+        with open(f"{base}/cmdline", "rb") as f:
+            info.cmdline = f.read().replace(b"\x00", b" ").decode("utf-8", "replace").strip()
+        if not info.cmdline:
+            info.cmdline = f"[{info.comm}]"
+        return info
+    except (FileNotFoundError, ProcessLookupError):
+        return None
+
+
+def _legacy_thread_details(pid: int) -> List[ThreadInfo]:
+    """get_thread_details_for_process anterior: caminho completo para cada arquivo."""
+    task_path = f"{procfs.get_proc_root()}/{pid}/task/"
+    threads = []
+    try:
+        tids = [t for t in os.listdir(task_path) if t.isdigit()]
+    except FileNotFoundError:
+        return []
+    for tid_str in tids:
+        thread = ThreadInfo(tid=int(tid_str), process_pid=pid)
+        try:
+            with open(f"{task_path}{tid_str}/stat", "r") as f:
+                line = f.read()
+            thread.state = line[line.rindex(")") + 1 :].split()[0]
+            with open(f"{task_path}{tid_str}/comm", "r") as f:
+                thread.name = f.read().strip()
+        except FileNotFoundError:
+            continue
+        threads.append(thread)
+    return threads
+
+
+def _check_equal(pids: List[int], fields: Sequence[str]) -> int:
+    """Confere que as duas implementações leem os mesmos valores; retorna as divergências."""
+    divergencias = 0
+    for pid in pids[:500]:
+        antes = _legacy_process_details(pid)
+        depois = system_monitor.get_process_details(pid)
+        if antes is None or depois is None:
+            continue  # Processo terminou entre as leituras
+        for field in fields:
+            if getattr(antes, field) != getattr(depois, field):
+                divergencias += 1
+                print(
+                    f"Divergência no PID {pid}, campo {field}: "
+                    f"{getattr(antes, field)!r} != {getattr(depois, field)!r}"
+                )
+    return divergencias
+
+
+def _best(func: Callable[[], object], repeticoes: int) -> float:
+    tempos = []
+    for _ in range(repeticoes):
+        start = time.perf_counter()
+        func()
+        tempos.append(time.perf_counter() - start)
+    return min(tempos)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pids", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--fixture", type=int, help="Usa uma árvore sintética com N PIDs")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    fixture_dir = None
+    if args.fixture:
+        fixture_dir = tempfile.mkdtemp(prefix="bench-procfs-")
+        procfs_fixture.generate(fixture_dir, args.fixture)
+        procfs.set_proc_root(fixture_dir)
+    try:
+        live_pids = system_monitor.list_pids()
+        print(f"PIDs disponíveis em {procfs.get_proc_root()}: {len(live_pids)}")
+        # Na árvore sintética nada muda entre as leituras, então todos os campos são comparados
+        fields = ProcessInfo.__slots__ if fixture_dir is not None else _STABLE_FIELDS
+        divergencias = _check_equal(live_pids, fields)
+        print(f"Conferência dos valores: {divergencias} divergência(s)")
+
+        for num_pids in args.pids:
+            pids = list(itertools.islice(itertools.cycle(live_pids), num_pids))
+            print(f"\n--- {num_pids} PIDs ---")
+            casos = [
+                ("processo", _legacy_process_details, system_monitor.get_process_details),
+                ("threads", _legacy_thread_details, system_monitor.get_thread_details_for_process),
+            ]
+            for nome, antes, depois in casos:
+                tempo_antes = _best(lambda: [antes(p) for p in pids], args.repeticoes)
+                tempo_depois = _best(lambda: [depois(p) for p in pids], args.repeticoes)
+                print(
+                    f"{nome:>9} | caminho/str: {tempo_antes / num_pids * 1e6:7.2f} us/PID | "
+                    f"dir_fd/bytes: {tempo_depois / num_pids * 1e6:7.2f} us/PID | "
+                    f"{tempo_antes / tempo_depois:5.2f}x"
+                )
+    finally:
+        procfs.set_proc_root(procfs.DEFAULT_PROC_ROOT)
+        if fixture_dir is not None:
+            shutil.rmtree(fixture_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# benchmarks/bench_system_constants.py
+"""
+Benchmark do custo de criação de SystemGlobalInfo e do ciclo de atualização do controller.
+
+Compara a sondagem antiga (leitura de /proc/self/stat, time.sleep(1) e varredura de
+/proc/cpuinfo a cada instância) com o provedor de constantes resolvido uma única vez.
+
+Uso:
+    python3 -m benchmarks.bench_system_constants [--ciclos N]
+"""
+
+import argparse
+import time
+
+from controller import SystemMonitorController
+from data_model import SystemGlobalInfo
+from system_constants import get_system_constants
+
+
+def _legacy_probe() -> None:
+    """Reproduz a sondagem feita antigamente em cada SystemGlobalInfo()."""
+    with open("/proc/self/stat", "r") as f:
+        campos = f.read().split()
+        t1 = int(campos[13]) + int(campos[14])
+    time.sleep(1)
+    with open("/proc/self/stat", "r") as f:
+        campos = f.read().split()
+        t2 = int(campos[13]) + int(campos[14])
+    _ = round(t2 - t1)
+    with open("/proc/cpuinfo") as f:
+        _ = sum(1 for line in f if line.startswith("processor"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ciclos", type=int, default=5, help="Ciclos de _update_data medidos")
+    args = parser.parse_args()
+
+    # 1. Custo de criação de um snapshot
+    start = time.perf_counter()
+    _legacy_probe()
+    legacy_init = time.perf_counter() - start
+
+    get_system_constants()  # Aquece o provedor global
+    n = 10000
+    start = time.perf_counter()
+    for _ in range(n):
+        SystemGlobalInfo()
+    new_init = (time.perf_counter() - start) / n
+
+    print("--- SystemGlobalInfo() ---")
+    print(f"Antes (sondagem com sleep): {legacy_init * 1000:10.3f} ms por instância")
+    print(f"Depois (constantes em cache): {new_init * 1e6:8.3f} us por instância")
+
+    # 2. Tempo de um ciclo completo do controller (sem a thread de atualização)
+    controller = SystemMonitorController()
+    controller._update_data()  # Primeira coleta popula os dados anteriores
+    tempos = []
+    for _ in range(args.ciclos):
+        start = time.perf_counter()
+        controller._update_data()
+        tempos.append(time.perf_counter() - start)
+    ciclo = sum(tempos) / len(tempos)
+
+    print("--- SystemMonitorController._update_data() ---")
+    print(f"Antes (estimado, ciclo + sondagem): {(ciclo + legacy_init) * 1000:10.3f} ms")
+    print(f"Depois: {ciclo * 1000:10.3f} ms (média de {args.ciclos} ciclos)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/bench_username_resolver.py
+"""
+Micro-benchmark da resolução UID -> nome de usuário para 1k e 10k PIDs.
+
+Compara a varredura completa do arquivo passwd a cada consulta (método antigo de
+get_username_from_uid) com o UsernameResolver em cache, usando um arquivo passwd
+sintético com muitas linhas (simulando hosts com passwd sincronizado via LDAP).
+
+Uso:
+    python3 -m benchmarks.bench_username_resolver [--linhas-passwd N]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from user_resolver import UsernameResolver
+
+
+def _legacy_lookup(passwd_path: str, uid: int) -> str:
+    """Reproduz a busca antiga: abre e percorre o passwd inteiro a cada chamada."""
+    try:
+        with open(passwd_path, "r") as f:
+            for line in f:
+                parts = line.split(":")
+                if len(parts) >= 3 and parts[2].isdigit() and int(parts[2]) == uid:
+                    return parts[0]
+    except Exception:
+        pass
+    return str(uid)
+
+
+def _write_passwd(path: str, num_lines: int) -> None:
+    """Gera um arquivo passwd sintético com num_lines usuários."""
+    with open(path, "w") as f:
+        f.write("root:x:0:0:root:/root:/bin/bash\n")
+        for i in range(1, num_lines):
+            uid = 1000 + i
+            f.write(f"user{uid}:x:{uid}:{uid}:User {uid}:/home/user{uid}:/bin/bash\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--linhas-passwd", type=int, default=5000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        passwd_path = os.path.join(tmp, "passwd")
+        _write_passwd(passwd_path, args.linhas_passwd)
+        uids = [0] + [1000 + i for i in range(1, args.linhas_passwd)]
+
+        print(f"Arquivo passwd sintético: {args.linhas_passwd} linhas")
+        for num_pids in (1000, 10000):
+            # Cada PID pertence a um usuário aleatório (com repetição, como num host real)
+            pid_uids = [rng.choice(uids) for _ in range(num_pids)]
+
+            start = time.perf_counter()
+            for uid in pid_uids:
+                _legacy_lookup(passwd_path, uid)
+            legacy = time.perf_counter() - start
+
+            resolver = UsernameResolver(passwd_path)
+            start = time.perf_counter()
+            for uid in pid_uids:
+                resolver.get_username(uid)
+            cached = time.perf_counter() - start
+
+            print(
+                f"{num_pids:>6} PIDs | antes: {legacy * 1000:10.2f} ms | "
+                f"depois: {cached * 1000:8.2f} ms | ganho: {legacy / cached:8.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#Grafico de serie temporal reutilizavel para os Canvas da aba geral
+#Os itens do Canvas (grade, rotulos e a linha da serie) sao criados uma unica vez;
+#cada atualizacao apenas move os itens com coords() e troca textos com itemconfig()
+
+
+class GraficoSerie:
+    """Grafico de linha de uma serie temporal desenhado em um tk.Canvas ja existente."""
+
+    def __init__(self, canvas, cor, maximo_fixo=None, sufixo="", largura=400, altura=230,
+                 margem_x=35, margem_y=8, intervalo_atualizacao=5, passo_eixo_x=10, pontos=None):
+        """Guarda a geometria do grafico; os itens sao criados na primeira atualizacao.
+
+        Args:
+            canvas (tk.Canvas): Canvas onde o grafico e desenhado.
+            cor (str): Cor da linha da serie.
+            maximo_fixo (float, optional): Topo fixo do eixo Y (ex.: 100 para porcentagens).
+                Se omitido, o topo acompanha o maior valor da serie.
+            sufixo (str, optional): Texto adicionado aos rotulos do eixo Y (ex.: "%").
+            largura (int, optional): Coordenada X final da area do grafico.
+            altura (int, optional): Altura da area do grafico.
+            margem_x (int, optional): Espaco a esquerda reservado aos rotulos do eixo Y.
+            margem_y (int, optional): Espaco acima da area do grafico.
+            intervalo_atualizacao (float, optional): Segundos entre amostras (rotulos do eixo X).
+            passo_eixo_x (int, optional): Amostras entre as marcacoes do eixo X.
+            pontos (int, optional): Amostras que cabem no eixo X (tamanho do historico).
+                Series mais curtas ficam alinhadas a direita; se omitido, usa o tamanho da serie.
+        """
+        self.canvas = canvas
+        self.cor = cor
+        self.maximo_fixo = maximo_fixo
+        self.sufixo = sufixo
+        self.largura = largura
+        self.altura = altura
+        self.margem_x = margem_x
+        self.margem_y = margem_y
+        self.intervalo_atualizacao = intervalo_atualizacao
+        self.passo_eixo_x = passo_eixo_x
+        self.pontos = pontos
+
+        self.marcas_y = []  #pares (linha, texto) reaproveitados do eixo Y
+        self.marcas_x = []  #pares (linha, texto) do eixo X
+        self.rotulos_y = None  #(maximo, ticks) exibidos atualmente no eixo Y
+        self.pontos_eixo_x = None  #numero de amostras usado para montar o eixo X
+        self.linha_serie = None
+
+    def y_do_valor(self, valor, maximo):
+        return self.altura - (valor / maximo * self.altura) + self.margem_y
+
+    def x_da_amostra(self, i, total):
+        return self.margem_x + i * ((self.largura - self.margem_x) / total)
+
+    def atualizar_eixo_y(self, maximo):
+        #ticks do eixo Y: de 20 em 20 para escala fixa, ou ~10 divisoes do maior valor
+        if self.maximo_fixo is not None:
+            ticks = range(0, int(maximo) + 1, 20)
+        else:
+            ticks = range(0, int(maximo) + 1, max(1, int(maximo) // 10))
+        ticks = [(i, f"{i}{self.sufixo}") for i in ticks]
+        #a posicao de cada tick depende do maximo, entao ele tambem entra na comparacao
+        if (maximo, ticks) == self.rotulos_y:
+            return
+        self.rotulos_y = (maximo, ticks)
+
+        #cria itens so quando faltam; os que sobram ficam escondidos
+        while len(self.marcas_y) < len(ticks):
+            linha = self.canvas.create_line(0, 0, 0, 0, fill="lightgray", dash=(2, 2))
+            texto = self.canvas.create_text(0, 0, anchor="e", fill="white", font=("Arial", 8))
+            self.marcas_y.append((linha, texto))
+        for posicao, (linha, texto) in enumerate(self.marcas_y):
+            if posicao < len(ticks):
+                i, rotulo = ticks[posicao]
+                y = self.y_do_valor(i, maximo)
+                self.canvas.coords(linha, self.margem_x, y, self.largura, y)
+                self.canvas.coords(texto, self.margem_x - 5, y)
+                self.canvas.itemconfig(linha, state="normal")
+                self.canvas.itemconfig(texto, text=rotulo, state="normal")
+            else:
+                self.canvas.itemconfig(linha, state="hidden")
+                self.canvas.itemconfig(texto, state="hidden")
+
+    def atualizar_eixo_x(self, total):
+        #o eixo X so muda se o numero de amostras do historico mudar
+        if total == self.pontos_eixo_x:
+            return
+        self.pontos_eixo_x = total
+        for linha, texto in self.marcas_x:
+            self.canvas.delete(linha, texto)
+        self.marcas_x = []
+        for i in range(0, total, self.passo_eixo_x):
+            x = self.x_da_amostra(i, total)
+            tempo_seg = (total - i) * self.intervalo_atualizacao
+            linha = self.canvas.create_line(x, self.margem_y, x, self.altura + self.margem_y, fill="lightgray", dash=(2, 2))
+            texto = self.canvas.create_text(x, self.altura + self.margem_y + 2, text=f"-{tempo_seg}s", anchor="n", fill="white", font=("Arial", 8))
+            self.marcas_x.append((linha, texto))
+
+    def atualizar(self, valores):
+        """Redesenha o grafico com os valores mais recentes (do mais antigo ao mais novo).
+
+        Args:
+            valores (Sequence[float]): Historico da serie.
+        """
+        valores = list(valores)
+        if len(valores) < 2:
+            return
+        total = max(self.pontos or 0, len(valores))
+        inicio = total - len(valores)  #posicao da amostra mais antiga no eixo X
+        if self.maximo_fixo is not None:
+            maximo = self.maximo_fixo
+        else:
+            maximo = max(valores) or 1
+
+        self.atualizar_eixo_x(total)
+        self.atualizar_eixo_y(maximo)
+
+        #a serie inteira e uma unica polilinha
+        coordenadas = []
+        for i, valor in enumerate(valores):
+            coordenadas.append(self.x_da_amostra(inicio + i, total))
+            coordenadas.append(self.y_do_valor(valor, maximo))
+        if self.linha_serie is None:
+            self.linha_serie = self.canvas.create_line(*coordenadas, fill=self.cor, width=2)
+        else:
+            self.canvas.coords(self.linha_serie, *coordenadas)
+        #a serie fica sempre por cima da grade
+        self.canvas.tag_raise(self.linha_serie)
@@ -0,0 +1,213 @@
+# scr/collection_stats.py
+"""
+Instrumentação do custo da própria coleta.
+
+Cada etapa do ciclo (coleta global, varredura de processos, resolução de nomes
+de usuário, cálculo das métricas por processo e publicação) é medida com um
+relógio monotônico. Durante uma etapa, as leituras do /proc são contadas em um
+CollectionCounters da thread atual (arquivos abertos, bytes lidos, PIDs lidos e
+PIDs que terminaram no meio da leitura); workers da varredura devolvem seus
+próprios contadores, que são somados aos da etapa.
+
+Os valores de cada ciclo ficam em buffers circulares (RingBuffer), então o
+histórico tem tamanho fixo e min/max/média custam O(1).
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+from metric_history import RingBuffer
+
+# Etapas medidas pelo controller, na ordem em que acontecem em um ciclo
+STAGES: Tuple[str, ...] = ("global", "varredura", "usuarios", "calculo", "publicacao")
+
+# Contadores de cada ciclo (ver CollectionCounters)
+COUNTER_FIELDS: Tuple[str, ...] = (
+    "files_opened",
+    "bytes_read",
+    "pids_scanned",
+    "pids_vanished",
+    "user_lookups",
+)
+
+
+class CollectionCounters:
+    """Classe que acumula os contadores de leitura do /proc de uma etapa (ou de um ciclo)."""
+
+    __slots__ = COUNTER_FIELDS + ("user_lookup_sec",)
+
+    def __init__(self) -> None:
+        """Inicializa todos os contadores com zero."""
+        self.files_opened: int = 0  # Arquivos abertos com sucesso
+        self.bytes_read: int = 0  # Bytes lidos desses arquivos
+        self.pids_scanned: int = 0  # PIDs cuja leitura foi tentada
+        self.pids_vanished: int = 0  # PIDs que terminaram entre a listagem e a leitura
+        self.user_lookups: int = 0  # Conversões de UID em nome de usuário
+        self.user_lookup_sec: float = 0.0  # Tempo gasto nessas conversões (todas as threads)
+
+    def merge(self, other: "CollectionCounters") -> None:
+        """Soma os contadores de outro objeto a este."""
+        for name in self.__slots__:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+    def as_dict(self) -> Dict[str, float]:
+        """Retorna os contadores como dicionário {campo: valor}."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+# Contadores ativos em cada thread (None = leitura fora de uma etapa medida)
+_local = threading.local()
+
+
+def current_counters() -> Optional[CollectionCounters]:
+    """Retorna os contadores da etapa em andamento na thread atual, se houver."""
+    return getattr(_local, "counters", None)
+
+
+@contextmanager
+def counting() -> Iterator[CollectionCounters]:
+    """Conta as leituras feitas na thread atual dentro do bloco.
+
+    Blocos aninhados somam seus contadores aos do bloco externo ao terminar.
+
+    Yields:
+        CollectionCounters: Contadores do bloco.
+    """
+    previous = current_counters()
+    counters = CollectionCounters()
+    _local.counters = counters
+    try:
+        yield counters
+    finally:
+        _local.counters = previous
+        if previous is not None:
+            previous.merge(counters)
+
+
+def count_file(nbytes: int) -> None:
+    """Registra a leitura de um arquivo com `nbytes` bytes (chamado pelo leitor do /proc)."""
+    counters = getattr(_local, "counters", None)
+    if counters is not None:
+        counters.files_opened += 1
+        counters.bytes_read += nbytes
+
+
+def count_pids(scanned: int = 0, vanished: int = 0) -> None:
+    """Registra PIDs lidos e PIDs que terminaram durante a leitura."""
+    counters = getattr(_local, "counters", None)
+    if counters is not None:
+        counters.pids_scanned += scanned
+        counters.pids_vanished += vanished
+
+
+def count_user_lookup(seconds: float) -> None:
+    """Registra uma conversão de UID em nome de usuário e sua duração."""
+    counters = getattr(_local, "counters", None)
+    if counters is not None:
+        counters.user_lookups += 1
+        counters.user_lookup_sec += seconds
+
+
+def merge_counters(counters: CollectionCounters) -> None:
+    """Soma contadores vindos de um worker aos da etapa em andamento na thread atual."""
+    current = current_counters()
+    if current is not None:
+        current.merge(counters)
+
+
+class CollectionStats:
+    """Classe que guarda o histórico recente das etapas e contadores de cada ciclo de coleta."""
+
+    def __init__(self, history_length: int = 120) -> None:
+        """Inicializa o histórico vazio.
+
+        Args:
+            history_length (int, optional): Ciclos guardados por série.
+        """
+        self.history_length: int = history_length
+        self._stages: Dict[str, RingBuffer] = {
+            name: RingBuffer(history_length) for name in STAGES
+        }
+        self._counters: Dict[str, RingBuffer] = {
+            name: RingBuffer(history_length) for name in COUNTER_FIELDS
+        }
+        self._cycle_ms: RingBuffer = RingBuffer(history_length)
+        self._pending_stages: Dict[str, float] = {}  # Etapas do ciclo em andamento (ms)
+        self._pending_counters: CollectionCounters = CollectionCounters()
+        self.cycles: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[CollectionCounters]:
+        """Mede a duração de uma etapa e conta as leituras feitas dentro dela.
+
+        Args:
+            name (str): Nome da etapa (ver STAGES).
+
+        Yields:
+            CollectionCounters: Contadores da etapa.
+        """
+        start = time.monotonic()
+        with counting() as counters:
+            try:
+                yield counters
+            finally:
+                elapsed_ms = (time.monotonic() - start) * 1000.0
+                self._pending_stages[name] = self._pending_stages.get(name, 0.0) + elapsed_ms
+                self._pending_counters.merge(counters)
+
+    def end_cycle(self) -> None:
+        """Fecha o ciclo em andamento, movendo suas etapas e contadores para o histórico.
+
+        Etapas que não rodaram no ciclo (ex.: varredura com intervalo maior) não
+        recebem amostra. A etapa "usuarios" vem do tempo somado das conversões de
+        UID, que acontecem dentro da varredura (inclusive nos workers).
+        """
+        pending = self._pending_counters
+        stages = self._pending_stages
+        if pending.user_lookups:
+            stages["usuarios"] = pending.user_lookup_sec * 1000.0
+        with self._lock:
+            for name, elapsed_ms in stages.items():
+                buffer = self._stages.get(name)
+                if buffer is None:
+                    buffer = self._stages[name] = RingBuffer(self.history_length)
+                buffer.append(elapsed_ms)
+            self._cycle_ms.append(
+                sum(ms for name, ms in stages.items() if name != "usuarios")
+            )
+            for name in COUNTER_FIELDS:
+                self._counters[name].append(getattr(pending, name))
+            self.cycles += 1
+        self._pending_stages = {}
+        self._pending_counters = CollectionCounters()
+
+    @staticmethod
+    def _summary(buffer: RingBuffer) -> Dict[str, object]:
+        if not len(buffer):
+            return {"last": None, "min": None, "max": None, "mean": None, "history": []}
+        return {
+            "last": buffer.latest(),
+            "min": buffer.min(),
+            "max": buffer.max(),
+            "mean": buffer.mean(),
+            "history": buffer.to_list(),
+        }
+
+    def summary(self) -> Dict[str, object]:
+        """Retorna o resumo do histórico.
+
+        Returns:
+            Dict[str, object]: {"cycles": n, "cycle_ms": resumo, "stages_ms": {etapa: resumo},
+                "counters": {contador: resumo}}, em que cada resumo tem "last", "min",
+                "max", "mean" e "history" (do mais antigo para o mais recente).
+        """
+        with self._lock:
+            return {
+                "cycles": self.cycles,
+                "cycle_ms": self._summary(self._cycle_ms),
+                "stages_ms": {name: self._summary(b) for name, b in self._stages.items()},
+                "counters": {name: self._summary(b) for name, b in self._counters.items()},
+            }
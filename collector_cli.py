@@ -0,0 +1,381 @@
+# scr/collector_cli.py
+"""
+Coletor sem interface gráfica (modo headless).
+
+Executa o SystemMonitorController e grava cada snapshot publicado como JSON lines
+ou CSV, na saída padrão ou em um arquivo com rotação por tamanho. Cada snapshot é
+escrito assim que é publicado, sem acumular a execução inteira em memória.
+
+Uso:
+    python3 -m collector_cli [--formato jsonl|csv] [--nivel global|processos]
+                             [--campos a,b,c] [--intervalo S] [--amostras N]
+                             [--intervalo-global S] [--intervalo-processos S]
+                             [--arquivo CAMINHO --max-bytes N --backups K]
+                             [--gravar CAPTURA | --reproduzir CAPTURA --velocidade X]
+                             [--perfil minimal|table|full]
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import queue
+import sys
+from typing import Any, Dict, Iterable, List, Optional, TextIO, Tuple
+
+from controller import SystemMonitorController
+from data_model import ProcessInfo, SystemSnapshot
+from system_monitor import COLLECTION_PROFILES
+
+# Campos disponíveis em cada nível (os dois primeiros identificam o snapshot)
+GLOBAL_FIELDS: Tuple[str, ...] = (
+    "timestamp",
+    "generation",
+    "cpu_usage_percent",
+    "cpu_idle_percent",
+    "individual_cpu_usages",
+    "mem_total_kb",
+    "mem_used_kb",
+    "mem_available_kb",
+    "mem_used_percent",
+    "swap_used_kb",
+    "swap_used_percent",
+    "total_processes",
+    "total_threads",
+    "running_processes",
+    "procs_blocked",
+    "load_avg",
+    "uptime_seconds",
+    "context_switches_per_sec",
+    "forks_per_sec",
+    "interrupts_per_sec",
+)
+
+PROCESS_FIELDS: Tuple[str, ...] = (
+    "timestamp",
+    "generation",
+    "pid",
+    "ppid",
+    "user",
+    "state",
+    "cpu_percent",
+    "mem_percent",
+    "vm_rss_kb",
+    "vm_size_kb",
+    "num_threads",
+    "start_time_str",
+    "comm",
+    "cmdline",
+)
+
+DEFAULT_GLOBAL_FIELDS: Tuple[str, ...] = (
+    "timestamp",
+    "generation",
+    "cpu_usage_percent",
+    "mem_used_percent",
+    "swap_used_kb",
+    "total_processes",
+    "total_threads",
+    "load_avg",
+)
+
+DEFAULT_PROCESS_FIELDS: Tuple[str, ...] = (
+    "timestamp",
+    "generation",
+    "pid",
+    "user",
+    "cpu_percent",
+    "mem_percent",
+    "vm_rss_kb",
+    "cmdline",
+)
+
+
+# Campos calculados pelo controller e o campo lido do /proc de que cada um depende
+_DERIVED_FIELDS: Dict[str, str] = {
+    "cpu_percent": "utime",
+    "mem_percent": "vm_rss_kb",
+    "start_time_str": "starttime_jiffies",
+}
+
+# Campos de processo usados pelo exportador OpenMetrics (ver metrics_exporter)
+_METRICS_FIELDS: Tuple[str, ...] = ("user", "comm", "vm_rss_kb")
+
+
+class RotatingWriter:
+    """Classe que grava texto em um arquivo e o rotaciona ao atingir um tamanho máximo.
+
+    Os arquivos antigos recebem os sufixos .1, .2, ... (o .1 é o mais recente), como no
+    logging.handlers.RotatingFileHandler.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 0, backups: int = 5) -> None:
+        """Abre o arquivo para acréscimo.
+
+        Args:
+            path (str): Caminho do arquivo.
+            max_bytes (int, optional): Tamanho que dispara a rotação (0 = nunca rotaciona).
+            backups (int, optional): Quantidade de arquivos antigos mantidos.
+        """
+        self.path: str = path
+        self.max_bytes: int = max_bytes
+        self.backups: int = backups
+        self._file: TextIO = open(path, "a", encoding="utf-8", newline="")
+
+    def is_empty(self) -> bool:
+        """Indica se o arquivo atual ainda não tem conteúdo (para escrever o cabeçalho CSV)."""
+        return self._file.tell() == 0
+
+    def should_rotate(self, pending: int) -> bool:
+        """Indica se gravar mais `pending` bytes ultrapassaria o limite do arquivo."""
+        return 0 < self.max_bytes < self._file.tell() + pending and not self.is_empty()
+
+    def rotate(self) -> None:
+        """Fecha o arquivo atual, renomeia os antigos e abre um arquivo vazio."""
+        self._file.close()
+        if self.backups > 0:
+            for i in range(self.backups - 1, 0, -1):
+                older = f"{self.path}.{i}"
+                if os.path.exists(older):
+                    os.replace(older, f"{self.path}.{i + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, "a", encoding="utf-8", newline="")
+
+    def write(self, text: str) -> None:
+        self._file.write(text)
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _format_value(value: Any) -> Any:
+    """Converte valores compostos (tuplas de load average, listas por core) para JSON."""
+    if isinstance(value, tuple):
+        return list(value)
+    return value
+
+
+def snapshot_rows(
+    snapshot: SystemSnapshot, level: str, fields: Iterable[str], top: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Converte um snapshot em linhas de saída.
+
+    Args:
+        snapshot (SystemSnapshot): Snapshot publicado pelo controller.
+        level (str): "global" (uma linha por snapshot) ou "processos" (uma por processo).
+        fields (Iterable[str]): Campos de cada linha.
+        top (Optional[int], optional): No nível "processos", limita aos N de maior %CPU.
+
+    Returns:
+        List[Dict[str, Any]]: Linhas na ordem dos campos pedidos.
+    """
+    fields = list(fields)
+    common = {"timestamp": round(snapshot.timestamp, 3), "generation": snapshot.generation}
+
+    if level == "global":
+        info = snapshot.global_info
+        return [
+            {f: common[f] if f in common else _format_value(getattr(info, f)) for f in fields}
+        ]
+
+    processes: Iterable[ProcessInfo]
+    if top is not None:
+        processes = snapshot.get_top_processes(top)
+    else:
+        processes = snapshot.processes
+    return [
+        {f: common[f] if f in common else _format_value(getattr(proc, f)) for f in fields}
+        for proc in processes
+    ]
+
+
+class SnapshotSink:
+    """Classe que serializa linhas em JSON lines ou CSV para um destino de texto."""
+
+    def __init__(self, out: Any, fmt: str, fields: List[str]) -> None:
+        """Inicializa o destino.
+
+        Args:
+            out: sys.stdout ou RotatingWriter.
+            fmt (str): "jsonl" ou "csv".
+            fields (List[str]): Campos (colunas do CSV).
+        """
+        self.out = out
+        self.fmt: str = fmt
+        self.fields: List[str] = fields
+        self._header_written: bool = False
+
+    def _render(self, rows: List[Dict[str, Any]]) -> str:
+        if self.fmt == "jsonl":
+            return "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        for row in rows:
+            # Listas (uso por core, load average) viram um único campo separado por ";"
+            writer.writerow(
+                ";".join(str(v) for v in value) if isinstance(value, list) else value
+                for value in row.values()
+            )
+        return buffer.getvalue()
+
+    def _header(self) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerow(self.fields)
+        return buffer.getvalue()
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        """Grava as linhas de um snapshot e descarrega o buffer do destino."""
+        text = self._render(rows)
+        rotating = isinstance(self.out, RotatingWriter)
+        if rotating and self.out.should_rotate(len(text.encode("utf-8"))):
+            self.out.rotate()
+        if self.fmt == "csv":
+            # O cabeçalho vai no início de cada arquivo (inclusive após a rotação)
+            if (rotating and self.out.is_empty()) or (not rotating and not self._header_written):
+                text = self._header() + text
+                self._header_written = True
+        self.out.write(text)
+        self.out.flush()
+
+
+def _parse_fields(value: Optional[str], level: str) -> List[str]:
+    """Valida a lista de campos pedida na linha de comando."""
+    available = GLOBAL_FIELDS if level == "global" else PROCESS_FIELDS
+    if not value:
+        return list(DEFAULT_GLOBAL_FIELDS if level == "global" else DEFAULT_PROCESS_FIELDS)
+    fields = [f.strip() for f in value.split(",") if f.strip()]
+    unknown = [f for f in fields if f not in available]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"Campos inválidos para o nível '{level}': {', '.join(unknown)}. "
+            f"Disponíveis: {', '.join(available)}"
+        )
+    return fields
+
+
+def _choose_profile(level: str, fields: Iterable[str], metrics: bool) -> str:
+    """Retorna o perfil de coleta mais barato que fornece os campos de processo gravados.
+
+    No nível global, a varredura só alimenta os totais de processos e threads.
+    """
+    needed = set(_METRICS_FIELDS) if metrics else set()
+    if level == "processos":
+        needed.update(_DERIVED_FIELDS.get(field, field) for field in fields)
+    # Os perfis estão em ordem crescente de custo
+    for name, provided in COLLECTION_PROFILES.items():
+        if needed & COLLECTION_PROFILES["full"] <= provided:
+            return name
+    return "full"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--formato", choices=("jsonl", "csv"), default="jsonl")
+    parser.add_argument("--nivel", choices=("global", "processos"), default="global")
+    parser.add_argument("--campos", help="Campos separados por vírgula (padrão depende do nível)")
+    parser.add_argument("--listar-campos", action="store_true", help="Mostra os campos disponíveis")
+    parser.add_argument("--intervalo", type=float, default=2.0, help="Segundos entre coletas")
+    parser.add_argument("--intervalo-global", type=float, help="Segundos entre coletas globais")
+    parser.add_argument("--intervalo-processos", type=float, help="Segundos entre varreduras de processos")
+    parser.add_argument("--orcamento-cpu", type=float, help="Custo máximo da coleta (%% de um núcleo)")
+    parser.add_argument("--amostras", type=int, default=0, help="Snapshots a gravar (0 = sem limite)")
+    parser.add_argument("--top", type=int, help="No nível processos, grava só os N de maior %%CPU")
+    parser.add_argument("--arquivo", help="Arquivo de saída (padrão: saída padrão)")
+    parser.add_argument("--max-bytes", type=int, default=0, help="Tamanho para rotação do arquivo")
+    parser.add_argument("--backups", type=int, default=5, help="Arquivos antigos mantidos na rotação")
+    parser.add_argument("--workers", type=int, default=1, help="Workers da varredura de /proc")
+    parser.add_argument("--colunar", action="store_true", help="Usa o cálculo colunar de %%CPU/%%MEM")
+    parser.add_argument("--metrics-port", type=int, help="Serve /metrics (OpenMetrics) nesta porta")
+    parser.add_argument("--proc-root", help="Lê outra árvore no lugar de /proc (ex.: fixture sintética)")
+    parser.add_argument("--gravar", help="Grava as leituras do /proc de cada ciclo nesta captura")
+    parser.add_argument("--reproduzir", help="Reproduz uma captura no lugar do /proc")
+    parser.add_argument("--velocidade", type=float, default=1.0, help="Velocidade da reprodução (0 = máxima)")
+    parser.add_argument(
+        "--perfil",
+        choices=tuple(COLLECTION_PROFILES),
+        help="Campos lidos de cada processo (padrão: o perfil mais barato com os campos gravados)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.listar_campos:
+        print("global:", ", ".join(GLOBAL_FIELDS))
+        print("processos:", ", ".join(PROCESS_FIELDS))
+        return 0
+    try:
+        fields = _parse_fields(args.campos, args.nivel)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    profile = args.perfil or _choose_profile(args.nivel, fields, args.metrics_port is not None)
+
+    # Os dados vão para o destino escolhido; mensagens do controller vão para stderr
+    stdout = sys.stdout
+    out = RotatingWriter(args.arquivo, args.max_bytes, args.backups) if args.arquivo else stdout
+    sink = SnapshotSink(out, args.formato, fields)
+
+    try:
+        controller = SystemMonitorController(
+            update_interval_sec=args.intervalo,
+            scan_workers=args.workers,
+            columnar=args.colunar,
+            metrics_port=args.metrics_port,
+            global_interval_sec=args.intervalo_global,
+            process_interval_sec=args.intervalo_processos,
+            cpu_budget_percent=args.orcamento_cpu,
+            proc_root=args.proc_root,
+            capture_path=args.gravar,
+            replay_path=args.reproduzir,
+            replay_speed=args.velocidade,
+            collection_profile=profile,
+        )
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    # Na reprodução nenhum ciclo é pulado: a reprodução acelerada pode publicar mais rápido
+    # do que a saída é gravada, então os snapshots passam por uma fila
+    replay_queue: Optional["queue.Queue[SystemSnapshot]"] = None
+    if args.reproduzir:
+        replay_queue = queue.Queue()
+        controller.add_snapshot_listener(replay_queue.put)
+    written = 0
+    generation = 0
+    with contextlib.redirect_stdout(sys.stderr):
+        controller.start()
+        try:
+            while args.amostras <= 0 or written < args.amostras:
+                if replay_queue is not None:
+                    try:
+                        snapshot = replay_queue.get(timeout=1.0)
+                    except queue.Empty:
+                        snapshot = None
+                else:
+                    snapshot = controller.wait_for_snapshot(generation, timeout=1.0)
+                if snapshot is None:
+                    # A reprodução de uma captura termina sozinha no último ciclo
+                    if not controller.is_running():
+                        break
+                    continue
+                generation = snapshot.generation
+                sink.write(snapshot_rows(snapshot, args.nivel, fields, args.top))
+                written += 1
+        except KeyboardInterrupt:
+            pass
+        except BrokenPipeError:
+            # Leitor fechou o pipe (ex.: "| head"); evita o erro ao fechar a saída padrão
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, stdout.fileno())
+        finally:
+            controller.stop()
+            if isinstance(out, RotatingWriter):
+                out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
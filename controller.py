@@ -7,12 +7,33 @@ Este módulo implementa o padrão MVC (Model-View-Controller) como a camada de c
 gerenciando a atualização periódica dos dados e calculando métricas derivadas.
 """
 
+import os
 import threading
 import time
-from typing import Dict, List, Optional
+import traceback
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Sequence, Tuple
 
 # Importações dos modelos e funções de coleta de dados
-from data_model import SystemGlobalInfo, ProcessInfo, ThreadInfo
+from data_model import (
+    CpuCounterFrame,
+    ProcessInfo,
+    SystemGlobalInfo,
+    SnapshotDelta,
+    SystemSnapshot,
+    ThreadInfo,
+)
+from system_constants import SystemConstants, get_system_constants
+from collection_stats import CollectionStats
+from history_store import DEFAULT_BUDGET_BYTES, HistoryQueryResult, HistoryStore
+from metrics_exporter import MetricsExporter
+from proc_capture import CaptureRecorder, CaptureReplay
+from process_columns import ProcessColumns
+from process_history import ProcessHistoryStore
+from process_scanner import ProcessScanner
+from process_table import ProcessTable
+from scheduler import CollectionScheduler, CollectionTask
+import procfs
 import system_monitor  # Módulo para coleta direta de dados do sistema
 
 
@@ -24,33 +45,200 @@ class SystemMonitorController:
     métodos para a camada de visualização acessar informações processadas do sistema.
     """
 
-    def __init__(self, update_interval_sec: float = 2.0) -> None:
+    # Quantidade de snapshots antigos mantidos para o cálculo de deltas
+    DELTA_HISTORY_LENGTH: int = 8
+
+    def __init__(
+        self,
+        update_interval_sec: float = 2.0,
+        system_constants: Optional[SystemConstants] = None,
+        scan_workers: int = 1,
+        scan_backend: str = "thread",
+        columnar: bool = False,
+        history_path: Optional[str] = None,
+        history_budget_bytes: int = DEFAULT_BUDGET_BYTES,
+        process_history_tracked: int = 32,
+        metrics_port: Optional[int] = None,
+        metrics_host: str = "127.0.0.1",
+        global_interval_sec: Optional[float] = None,
+        process_interval_sec: Optional[float] = None,
+        cpu_budget_percent: Optional[float] = None,
+        proc_root: Optional[str] = None,
+        capture_path: Optional[str] = None,
+        replay_path: Optional[str] = None,
+        replay_speed: float = 1.0,
+        collection_profile: str = "full",
+    ) -> None:
         """
         Inicializa o controlador com configurações e estruturas de dados básicas.
 
         Args:
             update_interval_sec (float, optional): Intervalo em segundos entre atualizações.
                                                   Padrão é 2.0 segundos.
+            system_constants (Optional[SystemConstants], optional): Constantes do sistema
+                (HZ, cores, tamanho de página). Se omitido, usa o provedor global.
+            scan_workers (int, optional): Número de workers para ler /proc/[pid] em paralelo.
+                Padrão é 1 (leitura serial na thread do controller).
+            scan_backend (str, optional): Tipo de pool usado quando scan_workers > 1:
+                "thread" ou "process". Padrão é "thread".
+            columnar (bool, optional): Se True, calcula %CPU e %MEM em lote sobre um
+                snapshot colunar (ProcessColumns) e só materializa os ProcessInfo pedidos
+                pela View. Padrão é False.
+            history_path (Optional[str], optional): Arquivo onde as métricas globais de cada
+                ciclo são gravadas (ver HistoryStore). Se omitido, o histórico fica desativado.
+            history_budget_bytes (int, optional): Tamanho máximo do arquivo de histórico.
+            process_history_tracked (int, optional): Máximo de processos (os mais pesados
+                em CPU e RSS) com histórico de %CPU e RSS. Padrão é 32.
+            metrics_port (Optional[int], optional): Se informado, serve /metrics no formato
+                OpenMetrics nesta porta enquanto o controller estiver em execução.
+            metrics_host (str, optional): Endereço de escuta do exportador de métricas.
+            global_interval_sec (Optional[float], optional): Intervalo da coleta global
+                (CPU, memória, carga). Padrão é update_interval_sec.
+            process_interval_sec (Optional[float], optional): Intervalo da varredura de
+                processos. Padrão é update_interval_sec.
+            cpu_budget_percent (Optional[float], optional): Custo máximo da coleta em
+                percentual de um núcleo; acima dele os intervalos são alongados
+                automaticamente. Se omitido, os intervalos são fixos.
+            proc_root (Optional[str], optional): Raiz do procfs a ser lida no lugar de /proc
+                (ex.: uma árvore gerada por procfs_fixture). A configuração vale para todo
+                o processo enquanto o controller estiver em execução: start() a aplica e
+                stop() restaura a raiz anterior (ver procfs.set_proc_root).
+            capture_path (Optional[str], optional): Arquivo onde o conteúdo bruto de cada
+                leitura do /proc é gravado a cada ciclo (ver proc_capture.CaptureRecorder).
+            replay_path (Optional[str], optional): Captura reproduzida no lugar do /proc;
+                a thread de atualização aplica um frame por ciclo gravado e termina no fim
+                da captura (ver proc_capture.CaptureReplay).
+            replay_speed (float, optional): Velocidade da reprodução (1 = tempo real,
+                0 = sem espera entre os ciclos).
+            collection_profile (str, optional): Campos lidos de cada processo na varredura:
+                "minimal", "table" ou "full" (ver system_monitor.COLLECTION_PROFILES).
+                Padrão é "full"; a janela de detalhes lê o perfil completo do seu PID
+                com load_full_process_details.
+
+        Raises:
+            ValueError: Se a gravação e a reprodução forem pedidas juntas, ou combinadas
+                com a varredura em um pool de processos (os workers não compartilham o
+                gravador nem a fonte da reprodução), ou se o perfil de coleta não existir.
         """
+        if collection_profile not in system_monitor.COLLECTION_PROFILES:
+            raise ValueError(
+                f"Perfil de coleta inválido: '{collection_profile}'. "
+                f"Use um de {tuple(system_monitor.COLLECTION_PROFILES)}."
+            )
+        if capture_path is not None and replay_path is not None:
+            raise ValueError("Não é possível gravar e reproduzir uma captura ao mesmo tempo.")
+        if (capture_path or replay_path) and scan_backend == "process" and scan_workers > 1:
+            raise ValueError(
+                "Gravação e reprodução de capturas exigem a varredura serial ou em threads."
+            )
+        if proc_root is not None and not os.path.isdir(proc_root):
+            raise ValueError(f"Raiz do procfs inválida (não é um diretório): {proc_root}")
+        self._proc_root: Optional[str] = proc_root
+        self._previous_proc_root: Optional[str] = None  # Restaurada por stop()
+
+        # Gravação (ou reprodução) das leituras do /proc; valem para todo o processo e
+        # só são instaladas no procfs por start() (ver _install_proc_hooks)
+        self._capture_path: Optional[str] = capture_path
+        self._recorder: Optional[CaptureRecorder] = None
+        self._replay: Optional[CaptureReplay] = None
+        self._replay_consumed: bool = False  # A reprodução só pode ser executada uma vez
+        if replay_path is not None:
+            self._replay = CaptureReplay(replay_path, speed=replay_speed)
+        elif capture_path is not None:
+            self._recorder = CaptureRecorder(capture_path)
+
+        # /proc/stat, meminfo, uptime e loadavg ficam abertos enquanto o controller existir
+        # e são relidos com pread a cada coleta global (ver procfs.PersistentFiles)
+        self._global_files: procfs.PersistentFiles = procfs.PersistentFiles()
+
         # Intervalo de atualização dos dados
         self.update_interval_sec: float = update_interval_sec
+        # Intervalos de cada coletor (ver CollectionScheduler) e orçamento de CPU da coleta
+        self.global_interval_sec: float = (
+            global_interval_sec if global_interval_sec is not None else update_interval_sec
+        )
+        self.process_interval_sec: float = (
+            process_interval_sec if process_interval_sec is not None else update_interval_sec
+        )
+        self.cpu_budget_percent: Optional[float] = cpu_budget_percent
+        self._scheduler: CollectionScheduler = self._create_scheduler()
 
-        # Instâncias para armazenar dados do sistema (protegidas por lock)
-        self._system_global_info: SystemGlobalInfo = SystemGlobalInfo()
-        self._processes_info_list: List[ProcessInfo] = []
+        # Constantes do sistema resolvidas uma única vez e reutilizadas a cada ciclo
+        self._system_constants: SystemConstants = (
+            system_constants if system_constants is not None else get_system_constants()
+        )
+
+        # Snapshot imutável publicado a cada ciclo (geração 0 = ainda sem coleta).
+        # Os leitores compartilham o mesmo objeto sem cópia; o lock só protege a publicação.
+        self._snapshot: SystemSnapshot = SystemSnapshot(
+            generation=0, global_info=SystemGlobalInfo(self._system_constants)
+        )
         self._data_lock: threading.Lock = (
             threading.Lock()
-        )  # Para acesso thread-safe aos dados
+        )  # Para publicação thread-safe dos snapshots
+        # Avisa os leitores que esperam por uma nova geração (wait_for_snapshot)
+        self._snapshot_published: threading.Condition = threading.Condition(self._data_lock)
+        # Snapshots recentes, usados para calcular deltas para leitores atrasados
+        self._recent_snapshots: Deque[SystemSnapshot] = deque(
+            [self._snapshot], maxlen=self.DELTA_HISTORY_LENGTH
+        )
+        # Último delta calculado (vários leitores costumam pedir o mesmo par de gerações)
+        self._last_delta: Optional[SnapshotDelta] = None
 
         # Dados da leitura anterior para cálculos de delta (uso de CPU)
         self._prev_global_cpu_times: List[int] = []  # Tempos de CPU globais anteriores
         self._prev_per_core_cpu_times: List[
             List[int]
         ] = []  # Tempos de CPU por core anteriores
+        # Frame anterior do /proc/stat (para taxas de trocas de contexto e forks)
+        self._prev_cpu_counter_frame: Optional[CpuCounterFrame] = None
+        # Tempos de CPU globais da varredura de processos anterior (base do %CPU por processo)
+        self._prev_scan_cpu_times: List[int] = []
         # Dicionário para armazenar tempos de CPU anteriores por processo
+        # (indexado por (pid, starttime) para não misturar processos que reutilizam um PID)
         self._prev_processes_cpu_times: Dict[
-            int, Dict[str, int]
-        ] = {}  # {pid: {"utime": x, "stime": y}}
+            Tuple[int, int], Dict[str, int]
+        ] = {}  # {(pid, starttime): {"utime": x, "stime": y}}
+
+        # Resultado mais recente de cada coletor, combinados a cada publicação
+        self._latest_global: SystemGlobalInfo = self._snapshot.global_info
+        self._pending_global: Optional[SystemGlobalInfo] = None  # Coletado e não publicado
+        self._system_boot_time_epoch: float = 0.0
+        self._latest_processes: Tuple[ProcessInfo, ...] = ()
+        self._latest_columns: Optional[ProcessColumns] = None
+        self._process_totals: Tuple[int, int, int] = (0, 0, 0)  # Processos, threads, running
+
+        # Snapshot colunar (usado apenas no modo columnar)
+        self.columnar: bool = columnar
+        self._prev_process_columns: Optional[ProcessColumns] = None  # Ciclo anterior
+
+        # Tabela de processos persistente: evita reler cmdline e usuário a cada ciclo
+        self._process_table: ProcessTable = ProcessTable(
+            ProcessScanner(workers=scan_workers, backend=scan_backend),
+            profile=collection_profile,
+        )
+
+        # Histórico persistente em disco (opcional); fechado por stop() e reaberto por start()
+        self._history_path: Optional[str] = history_path
+        self._history_budget_bytes: int = history_budget_bytes
+        self._history: Optional[HistoryStore] = None
+        self._open_history()
+
+        # Séries de %CPU e RSS apenas para os processos mais pesados (memória limitada)
+        self._process_history: ProcessHistoryStore = ProcessHistoryStore(
+            max_tracked=process_history_tracked
+        )
+
+        # Exportador OpenMetrics (opcional), servido a partir do snapshot publicado
+        self._metrics_exporter: Optional[MetricsExporter] = None
+        if metrics_port is not None:
+            self._metrics_exporter = MetricsExporter(self, host=metrics_host, port=metrics_port)
+
+        # Custo da própria coleta: duração de cada etapa e contadores de leitura do /proc
+        self._collection_stats: CollectionStats = CollectionStats()
+
+        # Funções chamadas a cada snapshot publicado (ver add_snapshot_listener)
+        self._snapshot_listeners: List[Callable[[SystemSnapshot], None]] = []
 
         # Controle da thread de atualização
         self._update_thread: Optional[threading.Thread] = None
@@ -58,160 +246,340 @@ class SystemMonitorController:
             threading.Event()
         )  # Sinaliza para parar a thread
 
-    def _update_data(self) -> None:
+    def _collect_global(self) -> None:
         """
-        Coleta, processa e atualiza os dados do sistema e dos processos.
-
-        Este método é executado periodicamente pela thread de atualização e executa:
-        1. Coleta de informações globais do sistema (CPU, memória, etc.)
-        2. Cálculo de percentuais de uso de CPU global e por core
-        3. Coleta de informações sobre todos os processos
-        4. Cálculo de métricas derivadas para cada processo (CPU%, mem%, etc.)
-        5. Atualização thread-safe dos dados compartilhados
-        """
-        # --- 1. Coletar dados globais atuais do sistema ---
-        # Cria uma nova instância para trabalho isolado (não afeta os dados compartilhados até o final)
-        current_global_info_snapshot: SystemGlobalInfo = SystemGlobalInfo()
-        # Popula a instância com dados brutos do sistema
-        system_monitor.populate_system_global_data(current_global_info_snapshot)
-
-        # --- 2. Calcular percentuais de uso de CPU ---
-        # Calcula o percentual de uso global da CPU usando os dados anteriores como base
-        current_global_info_snapshot.calculate_and_set_cpu_percent(
-            prev_cpu_times=self._prev_global_cpu_times,
-        )
-        # Calcula o percentual de uso para cada núcleo de CPU
-        current_global_info_snapshot.calculate_and_set_per_core_cpu_usages(
-            prev_per_core_cpu_times=self._prev_per_core_cpu_times,
-        )
+        Coleta as informações globais do sistema (CPU, memória, carga, escalonador).
 
-        # --- 3. Coletar informações de todos os processos ---
-        current_processes_list: List[ProcessInfo] = (
-            system_monitor.get_all_processes_info_list()
-        )
+        O resultado fica pendente até a próxima publicação (ver _publish_current), que
+        completa os totais de processos e threads com a última varredura de processos.
+        """
+        with self._collection_stats.stage("global"):
+            # Cria uma nova instância para trabalho isolado (não afeta os dados compartilhados até o final)
+            current_global_info_snapshot: SystemGlobalInfo = SystemGlobalInfo(
+                self._system_constants
+            )
+            # Popula a instância com dados brutos do sistema
+            system_monitor.populate_system_global_data(current_global_info_snapshot)
 
-        # --- 4. Calcular métricas derivadas para cada processo ---
-        # Dicionário para armazenar os tempos de CPU atuais para a próxima iteração
-        new_prev_processes_cpu_times: Dict[int, Dict[str, int]] = {}
-
-        # Calcula o delta total de jiffies do sistema entre esta leitura e a anterior
-        # Este delta é necessário para calcular o percentual de CPU de cada processo
-        delta_total_system_jiffies: int = (
-            lambda curr, prev: sum(curr) - sum(prev) if prev and curr else 0
-        )(
-            current_global_info_snapshot.last_cpu_times_jiffies_all,
-            self._prev_global_cpu_times,
-        )
+            # Calcula o percentual de uso global da CPU usando os dados anteriores como base
+            current_global_info_snapshot.calculate_and_set_cpu_percent(
+                prev_cpu_times=self._prev_global_cpu_times,
+            )
+            # Calcula o percentual de uso para cada núcleo de CPU
+            current_global_info_snapshot.calculate_and_set_per_core_cpu_usages(
+                prev_per_core_cpu_times=self._prev_per_core_cpu_times,
+            )
+            # Calcula as taxas do escalonador (trocas de contexto, forks e interrupções)
+            current_global_info_snapshot.calculate_and_set_scheduler_rates(
+                prev_frame=self._prev_cpu_counter_frame,
+            )
 
-        # Contador de threads para atualizar a estatística global
-        total_threads_count: int = 0
+            # Calcula o tempo de boot do sistema (usado para determinar hora de início dos processos)
+            self._system_boot_time_epoch = (
+                procfs.wall_time() - current_global_info_snapshot.uptime_seconds
+            )
 
-        # Calcula o tempo de boot do sistema (usado para determinar hora de início dos processos)
-        system_boot_time_epoch: float = (
-            time.time() - current_global_info_snapshot.uptime_seconds
+        # Armazena os dados atuais para serem usados como "anteriores" na próxima coleta
+        self._prev_global_cpu_times = (
+            current_global_info_snapshot.last_cpu_times_jiffies_all
         )
+        self._prev_per_core_cpu_times = (
+            current_global_info_snapshot.last_cpu_times_jiffies_cores
+        )
+        self._prev_cpu_counter_frame = current_global_info_snapshot.cpu_counter_frame
+        self._latest_global = current_global_info_snapshot
+        self._pending_global = current_global_info_snapshot
+
+    def _collect_processes(self) -> None:
+        """
+        Coleta todos os processos e calcula suas métricas derivadas (CPU%, mem%, início).
 
-        # Itera sobre cada processo para calcular suas métricas
-        for proc_info in current_processes_list:
-            # Acumula o número total de threads de todos os processos
-            total_threads_count += proc_info.num_threads
-
-            # Armazena os tempos atuais deste processo para a próxima iteração
-            new_prev_processes_cpu_times[proc_info.pid] = {
-                "utime": proc_info.utime,  # Tempo em modo usuário
-                "stime": proc_info.stime,  # Tempo em modo kernel
-            }
-
-            # Calcula o percentual de CPU do processo
-            if proc_info.pid in self._prev_processes_cpu_times:
-                # Se temos dados anteriores deste processo, calculamos o percentual
-                prev_times_for_this_proc = self._prev_processes_cpu_times[proc_info.pid]
-                proc_info.calculate_and_set_cpu_percent(
-                    prev_utime=prev_times_for_this_proc["utime"],
-                    prev_stime=prev_times_for_this_proc["stime"],
+        O %CPU de cada processo é relativo aos jiffies do sistema decorridos desde a
+        varredura anterior de processos, que pode ter outro intervalo que a coleta global.
+        """
+        stats = self._collection_stats
+        with stats.stage("varredura"):
+            # Reaproveita a leitura do /proc/stat se a coleta global rodou neste mesmo tick
+            if self._pending_global is not None:
+                cpu_times: List[int] = self._pending_global.last_cpu_times_jiffies_all
+            else:
+                cpu_times = system_monitor.get_cpu_times_global()
+            # Apenas dados voláteis são relidos para processos já conhecidos pela tabela
+            current_processes_list: List[ProcessInfo] = self._process_table.refresh()
+        global_info = self._latest_global
+
+        with stats.stage("calculo"):
+            # Calcula o delta total de jiffies do sistema entre esta varredura e a anterior
+            # Este delta é necessário para calcular o percentual de CPU de cada processo
+            delta_total_system_jiffies: int = (
+                lambda curr, prev: sum(curr) - sum(prev) if prev and curr else 0
+            )(cpu_times, self._prev_scan_cpu_times)
+            system_boot_time_epoch: float = self._system_boot_time_epoch
+
+            # Contador de threads para atualizar a estatística global
+            total_threads_count: int = 0
+            current_process_columns: Optional[ProcessColumns] = None
+            # Dicionário para armazenar os tempos de CPU atuais para a próxima iteração
+            new_prev_processes_cpu_times: Dict[Tuple[int, int], Dict[str, int]] = {}
+
+            if self.columnar:
+                # Modo colunar: %CPU e %MEM calculados em lote; os objetos ProcessInfo
+                # só recebem esses valores quando forem materializados para exibição
+                current_process_columns = ProcessColumns(
+                    current_processes_list,
+                    system_boot_time_epoch=system_boot_time_epoch,
+                    system_hz=global_info.system_hz,
+                )
+                current_process_columns.compute(
+                    prev=self._prev_process_columns,
                     delta_total_system_jiffies=delta_total_system_jiffies,
-                    system_hz=current_global_info_snapshot.system_hz,
-                    num_cores=current_global_info_snapshot.num_cores,
+                    num_cores=global_info.num_cores,
+                    system_total_mem_kb=global_info.mem_total_kb,
                 )
+                total_threads_count = current_process_columns.total_threads()
             else:
-                # Se é a primeira vez que vemos este processo, não podemos calcular o delta
-                proc_info.cpu_percent = 0.0
+                # Itera sobre cada processo para calcular suas métricas
+                for proc_info in current_processes_list:
+                    # Acumula o número total de threads de todos os processos
+                    total_threads_count += proc_info.num_threads
+
+                    # Armazena os tempos atuais deste processo para a próxima iteração
+                    proc_key = (proc_info.pid, proc_info.starttime_jiffies)
+                    new_prev_processes_cpu_times[proc_key] = {
+                        "utime": proc_info.utime,  # Tempo em modo usuário
+                        "stime": proc_info.stime,  # Tempo em modo kernel
+                    }
+
+                    # Calcula o percentual de CPU do processo
+                    if proc_key in self._prev_processes_cpu_times:
+                        # Se temos dados anteriores deste processo, calculamos o percentual
+                        prev_times_for_this_proc = self._prev_processes_cpu_times[proc_key]
+                        proc_info.calculate_and_set_cpu_percent(
+                            prev_utime=prev_times_for_this_proc["utime"],
+                            prev_stime=prev_times_for_this_proc["stime"],
+                            delta_total_system_jiffies=delta_total_system_jiffies,
+                            system_hz=global_info.system_hz,
+                            num_cores=global_info.num_cores,
+                        )
+                    else:
+                        # Se é a primeira vez que vemos este processo, não podemos calcular o delta
+                        proc_info.cpu_percent = 0.0
 
-            # Calcula o percentual de memória do processo
-            proc_info.calculate_and_set_mem_percent(
-                system_total_mem_kb=current_global_info_snapshot.mem_total_kb
-            )
+                    # Calcula o percentual de memória do processo
+                    proc_info.calculate_and_set_mem_percent(
+                        system_total_mem_kb=global_info.mem_total_kb
+                    )
+
+                    # Calcula e formata o horário de início do processo
+                    proc_info.calculate_and_set_start_time_str(
+                        system_boot_time_epoch=system_boot_time_epoch,
+                        system_hz=global_info.system_hz,
+                    )
 
-            # Calcula e formata o horário de início do processo
-            proc_info.calculate_and_set_start_time_str(
-                system_boot_time_epoch=system_boot_time_epoch,
-                system_hz=current_global_info_snapshot.system_hz,
+            # Totais usados por todas as publicações até a próxima varredura
+            self._process_totals = (
+                len(current_processes_list),
+                total_threads_count,
+                sum(1 for p in current_processes_list if p.state == "R"),
             )
 
-        # --- 5. Atualizar estatísticas globais do sistema ---
-        # Atualiza contadores de processos e threads
-        current_global_info_snapshot.total_processes = len(current_processes_list)
-        current_global_info_snapshot.total_threads = total_threads_count
-        # Conta processos no estado "running" (R)
-        current_global_info_snapshot.running_processes = sum(
-            1 for p in current_processes_list if p.state == "R"
-        )
+            # Armazena os dados atuais para serem usados como "anteriores" na próxima varredura
+            self._prev_scan_cpu_times = cpu_times
+            self._prev_processes_cpu_times = new_prev_processes_cpu_times
+            self._prev_process_columns = current_process_columns
+            self._latest_processes = tuple(current_processes_list)
+            self._latest_columns = current_process_columns
+
+            # Atualiza o histórico dos processos mais pesados
+            if current_process_columns is not None:
+                self._process_history.update(
+                    list(zip(current_process_columns.pid, current_process_columns.starttime)),
+                    current_process_columns.cpu_percent,
+                    current_process_columns.rss_kb,
+                )
+            else:
+                self._process_history.update(
+                    [(p.pid, p.starttime_jiffies) for p in current_processes_list],
+                    [p.cpu_percent for p in current_processes_list],
+                    [p.vm_rss_kb for p in current_processes_list],
+                )
 
-        # Armazena os dados atuais para serem usados como "anteriores" na próxima iteração
-        self._prev_global_cpu_times = (
-            current_global_info_snapshot.last_cpu_times_jiffies_all
-        )
-        self._prev_per_core_cpu_times = (
-            current_global_info_snapshot.last_cpu_times_jiffies_cores
+    def _publish_current(self, collected: Optional[List[str]] = None) -> None:
+        """
+        Publica um snapshot com os dados mais recentes de cada coletor.
+
+        Chamado uma única vez por tick do agendador, depois de todos os coletores
+        vencidos. Se só os processos foram coletados, as métricas globais do snapshot
+        anterior são copiadas para um novo objeto (o publicado nunca é alterado).
+
+        Args:
+            collected (Optional[List[str]], optional): Coletores executados no tick.
+        """
+        with self._collection_stats.stage("publicacao"):
+            global_info = self._pending_global
+            self._pending_global = None
+            if global_info is None:
+                global_info = SystemGlobalInfo(self._system_constants)
+                global_info.copy_data_from(self._latest_global)
+
+            # Atualiza contadores de processos e threads com a última varredura
+            (
+                global_info.total_processes,
+                global_info.total_threads,
+                global_info.running_processes,
+            ) = self._process_totals
+
+            # Grava as métricas globais no histórico em disco (se ativado) quando forem novas
+            if self._history is not None and (collected is None or "global" in collected):
+                self._history.append_global_info(global_info, procfs.wall_time())
+
+            # Os objetos deste ciclo não são mais alterados a partir daqui; a publicação é
+            # apenas a troca de uma referência, então o lock fica retido por tempo mínimo
+            self._publish_snapshot(global_info, self._latest_processes, self._latest_columns)
+        # Fecha o ciclo do histórico de custo (etapas e contadores deste tick)
+        self._collection_stats.end_cycle()
+        # Grava as leituras do ciclo como um frame da captura (se ativada)
+        if self._recorder is not None:
+            self._recorder.end_cycle(collected or ("global", "processos"))
+
+    def _update_data(self) -> None:
+        """
+        Coleta, processa e atualiza os dados do sistema e dos processos.
+
+        Executa um ciclo completo, independente do agendador:
+        1. Coleta de informações globais do sistema e cálculo dos percentuais de CPU
+        2. Coleta de todos os processos e cálculo de suas métricas (CPU%, mem%, etc.)
+        3. Publicação de um único snapshot imutável
+        """
+        self._collect_global()
+        self._collect_processes()
+        self._publish_current()
+
+    def _replay_tick(self, collected: List[str]) -> None:
+        """
+        Executa um ciclo gravado: os mesmos coletores do ciclo original e uma publicação.
+
+        Args:
+            collected (List[str]): Coletores executados no ciclo gravado.
+        """
+        if "global" in collected:
+            self._collect_global()
+        if "processos" in collected:
+            self._collect_processes()
+        self._publish_current(collected)
+
+    def _create_scheduler(self) -> CollectionScheduler:
+        """Cria o agendador com os coletores "global" e "processos" deste controller."""
+        return CollectionScheduler(
+            [
+                # Global antes dos processos: a varredura reaproveita a leitura do /proc/stat
+                CollectionTask("global", self._collect_global, self.global_interval_sec),
+                CollectionTask("processos", self._collect_processes, self.process_interval_sec),
+            ],
+            on_tick=self._publish_current,
+            cpu_budget_percent=self.cpu_budget_percent,
         )
-        self._prev_processes_cpu_times = new_prev_processes_cpu_times
 
-        # --- 6. Atualizar os dados compartilhados (protegidos por lock) ---
-        # O lock garante que a View não acesse dados parcialmente atualizados
+    def _publish_snapshot(
+        self,
+        global_info: SystemGlobalInfo,
+        processes: Sequence[ProcessInfo],
+        columns: Optional[ProcessColumns] = None,
+    ) -> SystemSnapshot:
+        """
+        Cria e publica um novo snapshot com a próxima geração.
+
+        Args:
+            global_info (SystemGlobalInfo): Informações globais já calculadas.
+            processes (Sequence[ProcessInfo]): Processos com as métricas calculadas.
+            columns (Optional[ProcessColumns], optional): Dados colunares (modo colunar).
+
+        Returns:
+            SystemSnapshot: Snapshot publicado.
+        """
         with self._data_lock:
-            # Copia todos os dados da instância temporária para a instância compartilhada
-            self._system_global_info.copy_data_from(current_global_info_snapshot)
-            # Atualiza a lista de processos
-            self._processes_info_list = current_processes_list
+            snapshot = SystemSnapshot(
+                generation=self._snapshot.generation + 1,
+                global_info=global_info,
+                processes=tuple(processes),
+                columns=columns,
+                timestamp=procfs.wall_time(),
+                previous=self._snapshot,
+            )
+            self._snapshot = snapshot
+            self._recent_snapshots.append(snapshot)
+            self._snapshot_published.notify_all()
+            listeners = list(self._snapshot_listeners)
+
+        # Os ouvintes são chamados fora do lock, na thread de coleta
+        for listener in listeners:
+            try:
+                listener(snapshot)
+            except Exception as e:
+                print(f"Aviso: Erro em um ouvinte de snapshots: {e}")
+        return snapshot
 
     def _run_update_loop(self) -> None:
         """
         Loop principal da thread de atualização de dados.
 
         Este método é executado em uma thread separada e gerencia o ciclo de vida das atualizações.
-        Realiza a primeira coleta inicial e depois entra em um loop contínuo de coleta,
-        respeitando o intervalo de atualização configurado.
+        Realiza a primeira coleta inicial e depois entrega a thread ao agendador, que executa
+        cada coletor no seu intervalo e publica um snapshot por tick.
         """
+        if self._replay is not None:
+            # Reprodução: cada frame da captura repete os coletores do ciclo gravado
+            frames = self._replay.run(self._replay_tick, self._running)
+            print(f"Controller: Reprodução concluída ({frames} ciclos).")
+            return
+
         # Primeira coleta para inicializar os dados de comparação
         print("Controller: Primeira coleta de dados...")
         # Executa a primeira coleta para popular os dados de referência (_prev_*)
-        self._update_data()
+        try:
+            self._update_data()
+        except Exception as e:
+            # Como nos ticks do agendador, um erro não derruba a thread de atualização
+            print(f"Erro no loop de atualização do controller: {e}")
+            traceback.print_exc()
         print("Controller: Primeira coleta concluída.")
 
-        # Loop principal de atualização que continua até que o sinal de parada seja dado
-        while not self._running.is_set():
-            # Marca o início da atualização para controle de tempo
-            start_time: float = time.monotonic()
+        # Coletores com intervalos próprios em ticks de taxa fixa, até o sinal de parada
+        self._scheduler.reset()
+        self._scheduler.run(self._running)
 
-            try:
-                # Coleta e processa os dados do sistema e dos processos
-                self._update_data()
-            except Exception as e:
-                # Tratamento de erros para evitar que a thread morra por exceções não tratadas
-                print(f"Erro no loop de atualização do controller: {e}")
-                import traceback
-
-                traceback.print_exc()
-                # Poderia implementar uma estratégia de retry ou log mais robusto aqui
+    def _open_history(self) -> None:
+        """Abre o histórico em disco, se configurado e ainda não aberto."""
+        if self._history_path is None or self._history is not None:
+            return
+        try:
+            self._history = HistoryStore(
+                self._history_path, budget_bytes=self._history_budget_bytes
+            )
+        except (OSError, ValueError) as e:
+            print(f"Aviso: Não foi possível abrir o histórico em {self._history_path}: {e}")
 
-            # Controle de tempo para garantir o intervalo configurado
-            elapsed_time: float = time.monotonic() - start_time
-            wait_time: float = self.update_interval_sec - elapsed_time
+    def _install_proc_hooks(self) -> None:
+        """
+        Instala no procfs a raiz, a gravação ou a reprodução e os arquivos globais persistentes.
 
-            # Espera o tempo restante do intervalo, mas permite interrupção
-            if wait_time > 0:
-                # Usa o evento para esperar, o que permite interromper a espera se necessário
-                self._running.wait(timeout=wait_time)
+        São configurações de todo o processo, então só valem enquanto o controller está em
+        execução: cada start() (inclusive o do AsyncSystemMonitorController) as instala e
+        stop() as desfaz.
+        """
+        if self._proc_root is not None:
+            if self._previous_proc_root is None:
+                self._previous_proc_root = procfs.get_proc_root()
+            procfs.set_proc_root(self._proc_root)
+        if self._replay is not None:
+            procfs.set_source(self._replay)
+        elif self._capture_path is not None:
+            if self._recorder is None:
+                # Os novos frames são acrescentados ao fim da captura
+                self._recorder = CaptureRecorder(self._capture_path)
+            procfs.set_recorder(self._recorder)
+        # Os descritores fechados por stop() são reabertos na primeira leitura
+        procfs.set_persistent_files(self._global_files)
 
     def start(self) -> None:
         """
@@ -220,12 +588,29 @@ class SystemMonitorController:
         Cria e inicia uma nova thread para executar o loop de atualização, se ainda não houver
         uma thread em execução. A thread é configurada como daemon para terminar quando o
         programa principal terminar.
+
+        Raises:
+            RuntimeError: Se o controller reproduz uma captura que já foi reproduzida.
         """
         # Verifica se já existe uma thread em execução
         if self._update_thread is not None and self._update_thread.is_alive():
             print("Controller: Thread de atualização já está em execução.")
             return
 
+        if self._replay is not None:
+            if self._replay_consumed:
+                raise RuntimeError("A reprodução de uma captura não pode ser reiniciada.")
+            self._replay_consumed = True
+        self._install_proc_hooks()
+        self._open_history()
+
+        # Abre a porta do exportador de métricas (se configurado)
+        if self._metrics_exporter is not None:
+            try:
+                self._metrics_exporter.start()
+            except OSError as e:
+                print(f"Aviso: Não foi possível iniciar o exportador de métricas: {e}")
+
         # Inicia uma nova thread
         print("Controller: Iniciando thread de atualização...")
         # Limpa o evento de parada para que o loop possa executar
@@ -251,6 +636,7 @@ class SystemMonitorController:
         self._running.set()
 
         # Se a thread existir e estiver em execução, aguarda a conclusão
+        thread_alive = False
         if self._update_thread is not None and self._update_thread.is_alive():
             # Espera a thread terminar com timeout para evitar bloqueio indefinido
             self._update_thread.join(timeout=self.update_interval_sec + 1)
@@ -258,79 +644,253 @@ class SystemMonitorController:
             # Verifica se a thread realmente terminou
             if self._update_thread.is_alive():
                 print("Aviso: Thread de atualização não terminou no tempo esperado.")
+                thread_alive = True
 
         print("Controller: Thread de atualização parada.")
         # Limpa a referência à thread
         self._update_thread = None
+        # Encerra o pool de workers da varredura de processos (se houver)
+        self._process_table.close()
+        # Fecha a porta do exportador de métricas
+        if self._metrics_exporter is not None:
+            self._metrics_exporter.stop()
+        # Garante que as amostras do histórico estejam gravadas em disco
+        if self._history is not None:
+            self._history.flush()
+        if thread_alive:
+            # A thread ainda pode ler o /proc: a gravação, a reprodução e os arquivos
+            # globais continuam instalados (fechá-los agora vazaria um descritor reaberto)
+            return
+        # Fecha os descritores dos arquivos globais
+        procfs.set_persistent_files(None)
+        self._global_files.close()
+        # Fecha o arquivo e o mmap do histórico (reabertos pelo próximo start())
+        if self._history is not None:
+            history, self._history = self._history, None
+            history.close()
+        # Encerra a gravação ou a reprodução da captura
+        if self._recorder is not None:
+            procfs.set_recorder(None)
+            self._recorder.close()
+            self._recorder = None  # Reaberto por start()
+        if self._replay is not None:
+            procfs.set_source(None)
+        if self._previous_proc_root is not None:
+            procfs.set_proc_root(self._previous_proc_root)
+            self._previous_proc_root = None
+
+    def is_running(self) -> bool:
+        """
+        Indica se a thread de atualização está ativa (a reprodução termina sozinha).
+        """
+        return self._update_thread is not None and self._update_thread.is_alive()
 
     # --- Métodos para a View ---
 
-    def get_system_global_info(self) -> SystemGlobalInfo:
-        """Retorna uma cópia dos dados globais do sistema."""
+    def get_snapshot(self, newer_than: Optional[int] = None) -> Optional[SystemSnapshot]:
+        """
+        Retorna o snapshot mais recente, sem cópia (O(1)).
+
+        Args:
+            newer_than (Optional[int], optional): Se informado, retorna o snapshot apenas
+                se sua geração for maior que este valor.
+
+        Returns:
+            Optional[SystemSnapshot]: Snapshot atual (somente leitura), ou None se não
+                houver snapshot mais novo que a geração pedida.
+        """
+        # A leitura de uma referência é atômica; não é preciso disputar o lock com a coleta
+        snapshot = self._snapshot
+        if newer_than is not None and snapshot.generation <= newer_than:
+            return None
+        return snapshot
+
+    def add_snapshot_listener(self, listener: Callable[[SystemSnapshot], None]) -> None:
+        """
+        Registra uma função chamada a cada novo snapshot publicado.
+
+        A função é chamada na thread de coleta e deve apenas sinalizar o consumidor
+        (por exemplo, agendar um evento na thread da interface), sem trabalho pesado.
+
+        Args:
+            listener (Callable[[SystemSnapshot], None]): Função que recebe o snapshot.
+        """
         with self._data_lock:
-            # Retornar uma cópia para evitar modificações externas e problemas de thread-safety
-            # Se SystemGlobalInfo for grande, considerar se uma cópia profunda é necessária
-            # ou se o acesso direto (com lock) é aceitável pela View,
-            # mas cópia é mais seguro.
-            # Para simplificar, retornamos o objeto, mas a View deve tratar como read-only.
-            # Idealmente, a View pediria dados específicos, não o objeto inteiro.
-            import copy  # Usar copy.copy() ou copy.deepcopy() se necessário
-
-            return copy.deepcopy(self._system_global_info)
-
-    def get_all_processes(self) -> List[ProcessInfo]:
-        """Retorna uma cópia da lista de informações de processos."""
+            if listener not in self._snapshot_listeners:
+                self._snapshot_listeners.append(listener)
+
+    def remove_snapshot_listener(self, listener: Callable[[SystemSnapshot], None]) -> None:
+        """Remove uma função registrada com add_snapshot_listener (se existir)."""
         with self._data_lock:
-            import copy
+            if listener in self._snapshot_listeners:
+                self._snapshot_listeners.remove(listener)
 
-            return copy.deepcopy(
-                self._processes_info_list
-            )  # Cópia profunda da lista e seus itens
+    def wait_for_snapshot(
+        self, newer_than: int, timeout: Optional[float] = None
+    ) -> Optional[SystemSnapshot]:
+        """
+        Bloqueia até que exista um snapshot com geração maior que a informada.
+
+        Args:
+            newer_than (int): Última geração que o leitor já processou.
+            timeout (Optional[float], optional): Tempo máximo de espera em segundos.
+                Se omitido, espera indefinidamente.
+
+        Returns:
+            Optional[SystemSnapshot]: Snapshot mais recente (pode pular gerações se o leitor
+                estiver atrasado), ou None se o tempo de espera acabar.
+        """
+        with self._snapshot_published:
+            self._snapshot_published.wait_for(
+                lambda: self._snapshot.generation > newer_than, timeout=timeout
+            )
+            snapshot = self._snapshot
+        return snapshot if snapshot.generation > newer_than else None
+
+    def get_changes_since(self, generation: int) -> Optional[SnapshotDelta]:
+        """
+        Retorna as alterações na lista de processos desde a geração informada.
+
+        Args:
+            generation (int): Geração que o leitor já aplicou (0 se ainda não tiver nenhuma).
+
+        Returns:
+            Optional[SnapshotDelta]: Processos adicionados, removidos e campos alterados até
+                o snapshot atual, ou None se não houver geração mais nova. Se a geração
+                pedida for antiga demais, o delta vem com full_resync=True.
+        """
+        snapshot = self._snapshot
+        if generation >= snapshot.generation:
+            return None
+
+        cached = self._last_delta
+        if (
+            cached is not None
+            and cached.base_generation == generation
+            and cached.generation == snapshot.generation
+        ):
+            return cached
 
-    def get_process_by_pid(self, pid: int) -> Optional[ProcessInfo]:
-        """Retorna informações de um processo específico por PID."""
         with self._data_lock:
-            import copy
+            recent = list(self._recent_snapshots)
+        base = next(
+            (s for s in recent if s.generation == generation and generation > 0), None
+        )
+
+        delta = SnapshotDelta.between(base, snapshot)
+        self._last_delta = delta
+        return delta
+
+    def get_system_global_info(self) -> SystemGlobalInfo:
+        """Retorna os dados globais do sistema do snapshot atual (somente leitura)."""
+        return self._snapshot.global_info
+
+    def get_all_processes(self) -> Tuple[ProcessInfo, ...]:
+        """Retorna os processos do snapshot atual (somente leitura)."""
+        return self._snapshot.processes
+
+    def get_top_processes(
+        self, limit: int, sort_key: str = "cpu_percent"
+    ) -> List[ProcessInfo]:
+        """Retorna os processos com maior uso de CPU ou memória.
+
+        No modo colunar, apenas as linhas retornadas são materializadas.
+
+        Args:
+            limit (int): Quantidade máxima de processos.
+            sort_key (str, optional): "cpu_percent" ou "mem_percent". Padrão é "cpu_percent".
+
+        Returns:
+            List[ProcessInfo]: Processos ordenados do maior para o menor valor (somente leitura).
+        """
+        return self._snapshot.get_top_processes(limit, sort_key)
+
+    def get_process_by_pid(self, pid: int) -> Optional[ProcessInfo]:
+        """Retorna informações de um processo específico por PID (somente leitura)."""
+        return self._snapshot.get_process(pid)
 
-            for proc_info in self._processes_info_list:
-                if proc_info.pid == pid:
-                    return copy.deepcopy(proc_info)
+    def load_full_process_details(
+        self, pid: int, starttime: Optional[int] = None
+    ) -> Optional[ProcessInfo]:
+        """
+        Lê todos os campos de um processo (perfil "full"), independentemente do perfil da varredura.
+        Destinada à janela de detalhes, que precisa da memória detalhada apenas do seu PID.
+
+        Com o starttime do processo no snapshot, retorna None se o PID tiver sido reutilizado
+        por outro processo desde a varredura (e cmdline e usuário, já conhecidos, não são lidos).
+
+        O objeto retornado pertence a quem chamou e não tem os percentuais calculados;
+        %CPU e %MEM continuam vindo do snapshot (get_process_by_pid).
+        """
+        process_info = system_monitor.get_process_details(pid, starttime, profile="full")
+        if (
+            process_info is not None
+            and starttime is not None
+            and process_info.starttime_jiffies != starttime
+        ):
             return None
+        return process_info
 
     def load_and_get_threads_for_process(self, pid: int) -> List[ThreadInfo]:
         """
         Carrega e retorna os detalhes das threads para um processo específico.
         Esta função é destinada a ser chamada pela View quando detalhes de um processo são solicitados.
+
+        As threads não são gravadas no ProcessInfo do snapshot, que é imutável;
+        a lista retornada pertence a quem chamou.
         """
-        # Coleta os detalhes das threads FORA do lock principal para evitar segurá-lo
-        # durante operações de I/O potencialmente demoradas.
+        # A leitura é feita sem nenhum lock, pois não altera o estado do controller
+        return system_monitor.get_thread_details_for_process(pid)
 
-        collected_threads = system_monitor.get_thread_details_for_process(pid)
-        # Agora, precisamos ATUALIZAR o ProcessInfo na lista principal com os dados coletados.
-        # Isso requer adquirir o lock novamente.
-        with self._data_lock:
-            # Encontra o processo na lista
-            for i, proc_in_list in enumerate(self._processes_info_list):
-                if proc_in_list.pid == pid:
-                    # Atualiza o objeto ProcessInfo diretamente na lista
-                    self._processes_info_list[i].threads = collected_threads
-                    # Atualiza o num_threads se a contagem for diferente
-                    if (
-                        self._processes_info_list[i].num_threads
-                        != len(collected_threads)
-                        and collected_threads
-                    ):
-                        # print(f"Ajustando num_threads para PID {pid} de {self._processes_info_list[i].num_threads} para {len(collected_threads)}")
-                        self._processes_info_list[i].num_threads = len(
-                            collected_threads
-                        )
+    def get_process_history(self, pid: int) -> Optional[Tuple[List[float], List[float]]]:
+        """
+        Retorna o histórico recente de %CPU e RSS (KB) de um processo.
+
+        Apenas os processos mais pesados possuem histórico; para os demais retorna None.
+        """
+        return self._process_history.get_history(pid)
+
+    def get_history(
+        self, start: float, end: float, max_points: Optional[int] = None
+    ) -> Optional[HistoryQueryResult]:
+        """
+        Consulta o histórico em disco das métricas globais.
+
+        Args:
+            start (float): Início do intervalo (segundos desde a época Unix).
+            end (float): Fim do intervalo (segundos desde a época Unix).
+            max_points (Optional[int], optional): Número máximo de pontos desejado; a
+                resolução (amostras, minutos ou horas) é escolhida para respeitá-lo.
+
+        Returns:
+            Optional[HistoryQueryResult]: Pontos do intervalo, ou None se o histórico
+                estiver desativado.
+        """
+        if self._history is None:
+            return None
+        return self._history.query(start, end, max_points=max_points)
+
+    def get_collection_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Retorna o intervalo em uso e o custo medido de cada coletor.
+
+        Com um orçamento de CPU configurado, "effective_interval_sec" mostra quanto o
+        agendador alongou o intervalo configurado (ver CollectionScheduler.stats).
+        """
+        return self._scheduler.stats()
 
-                    import copy
+    def get_collection_overhead(self) -> Dict[str, object]:
+        """
+        Retorna o histórico recente do custo da própria coleta.
 
-                    return copy.deepcopy(
-                        self._processes_info_list[i].threads
-                    )  # Retorna a cópia dos dados atualizados
-        return []  # Se o processo desapareceu da lista entre as verificações
+        Returns:
+            Dict[str, object]: Resumo de CollectionStats.summary() ("cycle_ms", "stages_ms"
+                por etapa e "counters" de leitura do /proc, cada um com last/min/max/mean
+                e history) mais "collectors", com os intervalos e o custo de cada coletor.
+        """
+        summary = self._collection_stats.summary()
+        summary["collectors"] = self._scheduler.stats()
+        return summary
 
 
 # --- Exemplo de Uso (para teste) ---
@@ -365,6 +925,11 @@ if __name__ == "__main__":
                 f"Uptime: {system_info.uptime_seconds // 3600}h {(system_info.uptime_seconds % 3600) // 60}m"
             )
             print(f"Load Avg: {system_info.load_avg}")
+            print(
+                f"Trocas de contexto/s: {system_info.context_switches_per_sec:.1f} | "
+                f"Forks/s: {system_info.forks_per_sec:.1f} | "
+                f"Bloqueados: {system_info.procs_blocked}"
+            )
 
             if all_procs:
                 print("\n--- Top 5 Processos por CPU ---")
@@ -374,17 +939,17 @@ if __name__ == "__main__":
                 )
                 a = False
                 for proc in sorted_procs[:5]:
+                    # Os ProcessInfo do snapshot são somente leitura: threads ficam numa variável local
+                    threads = []
                     if not a:
                         a = True
-                        proc.threads = controller.load_and_get_threads_for_process(
-                            proc.pid
-                        )
+                        threads = controller.load_and_get_threads_for_process(proc.pid)
                     print(
                         f"  PID: {proc.pid:<5} Usuário: {proc.user:<10} CPU%: {proc.cpu_percent:>6.2f}% "
                         f"Mem%: {proc.mem_percent:>5.2f}% MemRSS: {proc.vm_rss_kb / 1024:>6.2f}MB "
                         f"Início: {proc.start_time_str[:30]:<30} Cmd: {proc.cmdline[:30]}"
                     )
-                    for thr in proc.threads[:5]:
+                    for thr in threads[:5]:
                         print(
                             f"  TID: {thr.tid:<5} Nome: {thr.name:<10} State: {thr.state}"
                         )
@@ -1,9 +1,22 @@
 import time
+from typing import TYPE_CHECKING, Optional
+
+from system_constants import SystemConstants, get_system_constants
+
+if TYPE_CHECKING:  # Evita importação circular (process_columns importa este módulo)
+    from process_columns import ProcessColumns
 
 
 class ThreadInfo:
     """Classe para armazenar informações sobre uma thread específica de um processo."""
 
+    __slots__ = (
+        "tid",
+        "pid",
+        "state",
+        "name",
+    )
+
     def __init__(self, tid: int, process_pid: int) -> None:
         """Inicializa um objeto ThreadInfo com identificadores básicos.
 
@@ -30,6 +43,43 @@ class ThreadInfo:
 class ProcessInfo:
     """Classe para armazenar e processar informações detalhadas sobre um processo do sistema."""
 
+    # Atributos fixos (sem __dict__ por instância) para reduzir o uso de memória:
+    # com dezenas de milhares de processos, o __dict__ dominava o RSS do dashboard
+    __slots__ = (
+        "pid",
+        "comm",
+        "cmdline",
+        "state",
+        "ppid",
+        "user",
+        "uid",
+        "utime",
+        "stime",
+        "priority",
+        "nice",
+        "num_threads",
+        "starttime_jiffies",
+        "threads",
+        "cpu_percent",
+        "mem_percent",
+        "vm_peak_kb",
+        "vm_size_kb",
+        "vm_lck_kb",
+        "vm_pin_kb",
+        "vm_hwm_kb",
+        "vm_rss_kb",
+        "rss_anon_kb",
+        "rss_file_kb",
+        "rss_shmem_kb",
+        "vm_data_kb",
+        "vm_stk_kb",
+        "vm_exe_kb",
+        "vm_lib_kb",
+        "vm_pte_kb",
+        "vm_swap_kb",
+        "start_time_str",
+    )
+
     def __init__(self, pid: int) -> None:
         """Inicializa um objeto ProcessInfo com valores padrão.
 
@@ -252,11 +302,94 @@ class ProcessInfo:
             self.start_time_str = "N/A (Calc Error)"
 
 
+class CpuCounterFrame:
+    """Classe para armazenar os contadores de /proc/stat lidos em uma única passagem."""
+
+    __slots__ = (
+        "timestamp",
+        "cpu_total",
+        "cpu_cores",
+        "ctxt",
+        "intr_total",
+        "processes",
+        "procs_running",
+        "procs_blocked",
+        "btime",
+    )
+
+    def __init__(self) -> None:
+        """Inicializa um objeto CpuCounterFrame com contadores zerados."""
+        self.timestamp: float = 0.0  # Momento da leitura (time.monotonic)
+        self.cpu_total: list[int] = []  # Linha 'cpu': [user, nice, system, idle, iowait, irq, softirq, steal]
+        self.cpu_cores: dict[int, list[int]] = {}  # Linhas 'cpuN' indexadas pelo id do core
+        self.ctxt: int = 0  # Trocas de contexto desde o boot
+        self.intr_total: int = 0  # Total de interrupções atendidas desde o boot
+        self.processes: int = 0  # Processos/threads criados (forks) desde o boot
+        self.procs_running: int = 0  # Tarefas executáveis no momento da leitura
+        self.procs_blocked: int = 0  # Tarefas bloqueadas esperando E/S
+        self.btime: int = 0  # Momento do boot (segundos desde a época Unix)
+
+    def __repr__(self) -> str:
+        """Retorna uma representação em string do objeto CpuCounterFrame.
+
+        Returns:
+            str: Representação resumida dos contadores.
+        """
+        return (
+            f"<CpuCounterFrame Cores:{len(self.cpu_cores)} Ctxt:{self.ctxt} "
+            f"Forks:{self.processes} Running:{self.procs_running} Blocked:{self.procs_blocked}>"
+        )
+
+    def cores_as_list(self) -> list[list[int]]:
+        """Retorna os tempos por core como lista ordenada pelo id do core.
+
+        Returns:
+            list[list[int]]: Lista de tempos de cada core no formato de cpu_total.
+        """
+        return [self.cpu_cores[core_id] for core_id in sorted(self.cpu_cores)]
+
+
 class SystemGlobalInfo:
     """Classe para armazenar e processar informações globais do sistema operacional."""
 
-    def __init__(self) -> None:
-        """Inicializa um objeto SystemGlobalInfo com valores padrão."""
+    __slots__ = (
+        "cpu_usage_percent",
+        "cpu_idle_percent",
+        "individual_cpu_usages",
+        "last_cpu_times_jiffies_all",
+        "last_cpu_times_jiffies_cores",
+        "mem_total_kb",
+        "mem_free_kb",
+        "mem_available_kb",
+        "mem_buffers_kb",
+        "mem_cached_kb",
+        "mem_used_kb",
+        "mem_used_percent",
+        "swap_total_kb",
+        "swap_free_kb",
+        "swap_used_kb",
+        "swap_used_percent",
+        "total_processes",
+        "total_threads",
+        "running_processes",
+        "procs_blocked",
+        "cpu_counter_frame",
+        "context_switches_per_sec",
+        "forks_per_sec",
+        "interrupts_per_sec",
+        "system_hz",
+        "uptime_seconds",
+        "load_avg",
+        "num_cores",
+    )
+
+    def __init__(self, constants: Optional[SystemConstants] = None) -> None:
+        """Inicializa um objeto SystemGlobalInfo com valores padrão.
+
+        Args:
+            constants (Optional[SystemConstants]): Constantes do sistema a serem usadas.
+                Se omitido, usa o provedor global de get_system_constants().
+        """
         # Métricas de CPU
         self.cpu_usage_percent: float = 0.0  # Percentual de uso da CPU (todas as cores)
         self.cpu_idle_percent: float = 0.0  # Percentual de tempo ocioso da CPU
@@ -291,21 +424,20 @@ class SystemGlobalInfo:
         self.total_processes: int = 0  # Número total de processos no sistema
         self.total_threads: int = 0  # Número total de threads no sistema
         self.running_processes: int = 0  # Número de processos no estado 'running' (R)
+        self.procs_blocked: int = 0  # Tarefas bloqueadas em E/S (procs_blocked do /proc/stat)
 
-        # Configurações do sistema
-        # Obtém o valor de HZ (clock ticks por segundo) do sistema
-        # Realizando o cálculo de t2 - t1 para saber Hz
-        with open("/proc/self/stat", "r") as f:
-            campos = f.read().split()
-            t1 = int(campos[13]) + int(campos[14])
-
-        time.sleep(1)
-
-        with open("/proc/self/stat", "r") as f:
-            campos = f.read().split()
-            t2 = int(campos[13]) + int(campos[14])
+        # Métricas do escalonador (calculadas a partir de dois CpuCounterFrame consecutivos)
+        self.cpu_counter_frame: Optional[CpuCounterFrame] = None  # Leitura atual do /proc/stat
+        self.context_switches_per_sec: float = 0.0  # Trocas de contexto por segundo
+        self.forks_per_sec: float = 0.0  # Processos/threads criados por segundo
+        self.interrupts_per_sec: float = 0.0  # Interrupções atendidas por segundo
 
-        self.system_hz = round(t2 - t1)
+        # Configurações do sistema
+        # As constantes (HZ, número de cores) são resolvidas uma única vez por processo
+        # e compartilhadas, para que criar um snapshot novo a cada ciclo seja barato
+        if constants is None:
+            constants = get_system_constants()
+        self.system_hz: int = constants.clock_ticks  # Clock ticks por segundo (HZ)
 
         # Outras informações do sistema
         self.uptime_seconds: float = (
@@ -317,10 +449,8 @@ class SystemGlobalInfo:
             0.0,
         )  # Carga média (1, 5, 15 min)
 
-        # Aqui conta as linhas que comecam com processador
-        with open("/proc/cpuinfo") as f:
-            self.num_cores = sum(1 for line in f if line.startswith("processor"))
-        
+        # Número de cores online (mesma contagem das linhas 'cpuN' do /proc/stat)
+        self.num_cores: int = constants.num_cores_online
 
     def __repr__(self) -> str:
         """Retorna uma representação em string do objeto SystemGlobalInfo.
@@ -422,6 +552,13 @@ class SystemGlobalInfo:
         self.total_processes = other.total_processes
         self.total_threads = other.total_threads
         self.running_processes = other.running_processes
+        self.procs_blocked = other.procs_blocked
+
+        # Copia as métricas do escalonador (o frame não é alterado após a leitura)
+        self.cpu_counter_frame = other.cpu_counter_frame
+        self.context_switches_per_sec = other.context_switches_per_sec
+        self.forks_per_sec = other.forks_per_sec
+        self.interrupts_per_sec = other.interrupts_per_sec
 
         # Copia outras informações do sistema
         self.uptime_seconds = other.uptime_seconds
@@ -484,3 +621,283 @@ class SystemGlobalInfo:
         # Armazena os resultados nos atributos da instância
         self.cpu_usage_percent = usage
         self.cpu_idle_percent = idle
+
+    def calculate_and_set_scheduler_rates(
+        self, prev_frame: Optional[CpuCounterFrame]
+    ) -> None:
+        """Calcula e armazena as taxas de trocas de contexto, forks e interrupções.
+
+        Usa a diferença entre os contadores do frame atual (cpu_counter_frame) e do
+        frame anterior, dividida pelo tempo decorrido entre as duas leituras.
+
+        Args:
+            prev_frame (Optional[CpuCounterFrame]): Frame da leitura anterior do /proc/stat.
+        """
+        curr_frame = self.cpu_counter_frame
+        if curr_frame is None or prev_frame is None:
+            self.context_switches_per_sec = 0.0
+            self.forks_per_sec = 0.0
+            self.interrupts_per_sec = 0.0
+            return
+
+        elapsed: float = curr_frame.timestamp - prev_frame.timestamp
+        if elapsed <= 0:  # Previne divisão por zero com leituras no mesmo instante
+            self.context_switches_per_sec = 0.0
+            self.forks_per_sec = 0.0
+            self.interrupts_per_sec = 0.0
+            return
+
+        # Os contadores só crescem; deltas negativos indicam leitura inconsistente
+        self.context_switches_per_sec = max(0, curr_frame.ctxt - prev_frame.ctxt) / elapsed
+        self.forks_per_sec = max(0, curr_frame.processes - prev_frame.processes) / elapsed
+        self.interrupts_per_sec = (
+            max(0, curr_frame.intr_total - prev_frame.intr_total) / elapsed
+        )
+
+
+class SystemSnapshot:
+    """Classe imutável com o estado publicado pelo controller em um ciclo de coleta.
+
+    Cada snapshot recebe um número de geração crescente. Os objetos contidos
+    (SystemGlobalInfo e ProcessInfo) nunca são alterados depois da publicação, de modo
+    que vários leitores podem compartilhá-los sem cópia; eles devem ser tratados
+    como somente leitura.
+    """
+
+    __slots__ = (
+        "generation",
+        "timestamp",
+        "global_info",
+        "_processes",
+        "_columns",
+        "_pid_index",
+    )
+
+    def __init__(
+        self,
+        generation: int,
+        global_info: SystemGlobalInfo,
+        processes: "tuple[ProcessInfo, ...]" = (),
+        columns: Optional["ProcessColumns"] = None,
+        timestamp: Optional[float] = None,
+        previous: Optional["SystemSnapshot"] = None,
+    ) -> None:
+        """Inicializa o snapshot (único momento em que os atributos podem ser definidos).
+
+        Args:
+            generation (int): Número de geração (cresce a cada publicação).
+            global_info (SystemGlobalInfo): Informações globais do sistema neste ciclo.
+            processes (tuple[ProcessInfo, ...], optional): Processos com as métricas calculadas.
+            columns (Optional[ProcessColumns], optional): Snapshot colunar, no modo colunar
+                do controller (os ProcessInfo são materializados sob demanda).
+            timestamp (Optional[float], optional): Momento da publicação (time.time()).
+            previous (Optional[SystemSnapshot], optional): Snapshot anterior; se ele tiver
+                os mesmos objetos de processos (ciclo só global), seu índice é reaproveitado.
+        """
+        set_attr = object.__setattr__
+        set_attr(self, "generation", generation)  # Número de geração do snapshot
+        set_attr(self, "timestamp", time.time() if timestamp is None else timestamp)
+        set_attr(self, "global_info", global_info)  # Métricas globais (somente leitura)
+        processes = tuple(processes)
+        set_attr(self, "_processes", processes)  # Processos do ciclo
+        set_attr(self, "_columns", columns)  # Dados colunares (modo colunar)
+        if (
+            previous is not None
+            and previous._processes is processes
+            and previous._columns is columns
+        ):
+            # Mesmos processos do snapshot anterior: o índice (somente leitura) é compartilhado
+            set_attr(self, "_pid_index", previous._pid_index)
+            return
+        # Índice PID -> posição, montado na thread de coleta para buscas O(1)
+        pids = columns.pid if columns is not None else (p.pid for p in processes)
+        set_attr(self, "_pid_index", {pid: i for i, pid in enumerate(pids)})
+
+    def __setattr__(self, name: str, value: object) -> None:
+        """Impede qualquer alteração depois da criação."""
+        raise AttributeError("SystemSnapshot é imutável.")
+
+    def __delattr__(self, name: str) -> None:
+        """Impede a remoção de atributos depois da criação."""
+        raise AttributeError("SystemSnapshot é imutável.")
+
+    def __repr__(self) -> str:
+        """Retorna uma representação em string do objeto SystemSnapshot.
+
+        Returns:
+            str: Representação com a geração e o número de processos.
+        """
+        return f"<SystemSnapshot Gen:{self.generation} Procs:{len(self._pid_index)}>"
+
+    def __len__(self) -> int:
+        """Retorna o número de processos no snapshot."""
+        return len(self._pid_index)
+
+    @property
+    def processes(self) -> "tuple[ProcessInfo, ...]":
+        """Processos do snapshot (no modo colunar, materializa todas as linhas)."""
+        if self._columns is not None:
+            return tuple(self._columns.materialize_all())
+        return self._processes
+
+    def get_process(self, pid: int) -> Optional[ProcessInfo]:
+        """Retorna o processo com o PID informado, ou None se não estiver no snapshot.
+
+        Args:
+            pid (int): ID do processo.
+
+        Returns:
+            Optional[ProcessInfo]: Processo encontrado (somente leitura).
+        """
+        index = self._pid_index.get(pid)
+        if index is None:
+            return None
+        if self._columns is not None:
+            return self._columns.materialize(index)
+        return self._processes[index]
+
+    def get_top_processes(
+        self, limit: int, sort_key: str = "cpu_percent"
+    ) -> "list[ProcessInfo]":
+        """Retorna os processos com os maiores valores de CPU ou memória.
+
+        Args:
+            limit (int): Quantidade máxima de processos.
+            sort_key (str, optional): "cpu_percent" ou "mem_percent". Padrão é "cpu_percent".
+
+        Returns:
+            list[ProcessInfo]: Processos ordenados do maior para o menor valor.
+        """
+        if self._columns is not None:
+            return [
+                self._columns.materialize(i)
+                for i in self._columns.top_indices(limit, sort_key)
+            ]
+        return sorted(
+            self._processes, key=lambda p: getattr(p, sort_key), reverse=True
+        )[:limit]
+
+
+class SnapshotDelta:
+    """Classe com as diferenças na lista de processos entre duas gerações de snapshot."""
+
+    __slots__ = (
+        "base_generation",
+        "generation",
+        "snapshot",
+        "added",
+        "removed",
+        "changed",
+        "full_resync",
+    )
+
+    # Campos comparados entre as gerações para montar o dicionário de alterações
+    COMPARED_FIELDS: "tuple[str, ...]" = (
+        "user",
+        "state",
+        "cpu_percent",
+        "mem_percent",
+        "vm_rss_kb",
+        "num_threads",
+        "cmdline",
+    )
+
+    def __init__(
+        self,
+        base_generation: int,
+        snapshot: "SystemSnapshot",
+        added: "tuple[ProcessInfo, ...]" = (),
+        removed: "tuple[int, ...]" = (),
+        changed: Optional["dict[int, dict[str, object]]"] = None,
+        full_resync: bool = False,
+    ) -> None:
+        """Inicializa o delta entre a geração base e a geração do snapshot informado.
+
+        Args:
+            base_generation (int): Geração que o leitor já possui.
+            snapshot (SystemSnapshot): Snapshot atual (geração de destino).
+            added (tuple[ProcessInfo, ...], optional): Processos novos.
+            removed (tuple[int, ...], optional): PIDs que saíram da lista.
+            changed (Optional[dict[int, dict[str, object]]], optional): {pid: {campo: novo valor}}.
+            full_resync (bool, optional): Se True, a geração base não está mais disponível
+                e 'added' contém todos os processos (o leitor deve descartar seu estado).
+        """
+        self.base_generation: int = base_generation  # Geração que o leitor possuía
+        self.generation: int = snapshot.generation  # Geração de destino
+        self.snapshot: SystemSnapshot = snapshot  # Snapshot de destino (somente leitura)
+        self.added: tuple[ProcessInfo, ...] = added  # Processos novos
+        self.removed: tuple[int, ...] = removed  # PIDs removidos
+        self.changed: dict[int, dict[str, object]] = changed or {}  # Campos alterados por PID
+        self.full_resync: bool = full_resync  # Indica reconstrução completa
+
+    def __repr__(self) -> str:
+        """Retorna uma representação em string do objeto SnapshotDelta.
+
+        Returns:
+            str: Representação com as gerações e a quantidade de alterações.
+        """
+        return (
+            f"<SnapshotDelta {self.base_generation}->{self.generation} "
+            f"+{len(self.added)} -{len(self.removed)} ~{len(self.changed)}"
+            f"{' resync' if self.full_resync else ''}>"
+        )
+
+    def is_empty(self) -> bool:
+        """Retorna True se não houver nenhuma alteração na lista de processos."""
+        return not (self.added or self.removed or self.changed or self.full_resync)
+
+    @classmethod
+    def between(
+        cls, base: Optional["SystemSnapshot"], target: "SystemSnapshot"
+    ) -> "SnapshotDelta":
+        """Calcula o delta entre dois snapshots.
+
+        Processos são identificados por (pid, starttime): um PID reutilizado aparece
+        como removido e adicionado no mesmo delta.
+
+        Args:
+            base (Optional[SystemSnapshot]): Snapshot que o leitor possui, ou None se a
+                geração do leitor não estiver mais disponível.
+            target (SystemSnapshot): Snapshot atual.
+
+        Returns:
+            SnapshotDelta: Diferenças de base para target.
+        """
+        if base is None:
+            return cls(0, target, added=target.processes, full_resync=True)
+        if base._processes is target._processes and base._columns is target._columns:
+            # Publicação sem nova varredura de processos (só as métricas globais mudaram)
+            return cls(base.generation, target)
+
+        base_by_pid = {p.pid: p for p in base.processes}
+        added: list[ProcessInfo] = []
+        removed: list[int] = []
+        changed: dict[int, dict[str, object]] = {}
+
+        for proc in target.processes:
+            old = base_by_pid.pop(proc.pid, None)
+            if old is None:
+                added.append(proc)
+                continue
+            if old.starttime_jiffies != proc.starttime_jiffies:  # PID reutilizado
+                removed.append(proc.pid)
+                added.append(proc)
+                continue
+            fields = {
+                name: getattr(proc, name)
+                for name in cls.COMPARED_FIELDS
+                if getattr(proc, name) != getattr(old, name)
+            }
+            if fields:
+                changed[proc.pid] = fields
+
+        # Os PIDs que sobraram no dicionário não existem mais
+        removed.extend(base_by_pid)
+
+        return cls(
+            base.generation,
+            target,
+            added=tuple(added),
+            removed=tuple(removed),
+            changed=changed,
+        )
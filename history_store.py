@@ -0,0 +1,437 @@
+# scr/history_store.py
+"""
+Histórico persistente das métricas globais em um arquivo binário mapeado em memória.
+
+O arquivo tem um cabeçalho fixo seguido de três regiões circulares de registros de
+tamanho fixo:
+
+- "raw": uma amostra por ciclo do controller;
+- "1min": mínimo/máximo/média de cada minuto;
+- "1h": mínimo/máximo/média de cada hora.
+
+Os agregados são atualizados a cada amostra (o registro do intervalo em andamento
+é regravado no lugar até o intervalo fechar), então nada precisa ser recalculado
+ao reabrir o arquivo. O tamanho total é fixo e limitado pelo orçamento em bytes:
+quando uma região enche, os registros mais antigos são sobrescritos.
+"""
+
+import math
+import mmap
+import os
+import struct
+import threading
+import zlib
+from typing import List, Optional, Sequence, Tuple
+
+from data_model import SystemGlobalInfo
+
+# Métricas gravadas em cada amostra (a ordem define o layout do arquivo)
+HISTORY_FIELDS: Tuple[str, ...] = (
+    "cpu_usage_percent",
+    "mem_used_percent",
+    "mem_used_kb",
+    "swap_used_kb",
+    "total_processes",
+    "total_threads",
+    "running_processes",
+    "procs_blocked",
+    "load_avg_1m",
+    "context_switches_per_sec",
+    "forks_per_sec",
+    "interrupts_per_sec",
+)
+
+_MAGIC: bytes = b"DSHHIST\x00"
+_VERSION: int = 1
+
+# Cabeçalho: magic, versão, nº de campos, crc32 dos nomes dos campos e, para cada
+# camada, (capacidade, posição de escrita, registros completos, intervalo em andamento)
+_HEADER = struct.Struct("<8sHHI" + "QQQQ" * 3)
+
+DEFAULT_BUDGET_BYTES: int = 16 * 1024 * 1024  # 16 MiB
+DEFAULT_MINUTE_CAPACITY: int = 7 * 24 * 60  # 7 dias de minutos
+DEFAULT_HOUR_CAPACITY: int = 400 * 24  # ~13 meses de horas
+
+
+def values_from_global_info(info: SystemGlobalInfo) -> Tuple[float, ...]:
+    """Extrai de um SystemGlobalInfo os valores de HISTORY_FIELDS.
+
+    Args:
+        info (SystemGlobalInfo): Informações globais de um ciclo.
+
+    Returns:
+        Tuple[float, ...]: Valores na ordem de HISTORY_FIELDS.
+    """
+    values: List[float] = []
+    for field in HISTORY_FIELDS:
+        if field == "load_avg_1m":
+            values.append(float(info.load_avg[0]) if info.load_avg else 0.0)
+        else:
+            values.append(float(getattr(info, field)))
+    return tuple(values)
+
+
+class HistoryPoint:
+    """Classe que representa um ponto do histórico (amostra ou agregado de um intervalo)."""
+
+    __slots__ = ("timestamp", "count", "minimum", "maximum", "average")
+
+    def __init__(
+        self,
+        timestamp: float,
+        count: int,
+        minimum: Tuple[float, ...],
+        maximum: Tuple[float, ...],
+        average: Tuple[float, ...],
+    ) -> None:
+        """Inicializa o ponto.
+
+        Args:
+            timestamp (float): Momento da amostra, ou início do intervalo agregado (época Unix).
+            count (int): Número de amostras agregadas (1 na camada "raw").
+            minimum (Tuple[float, ...]): Mínimo de cada campo, na ordem de HISTORY_FIELDS.
+            maximum (Tuple[float, ...]): Máximo de cada campo.
+            average (Tuple[float, ...]): Média de cada campo.
+        """
+        self.timestamp: float = timestamp
+        self.count: int = count
+        self.minimum: Tuple[float, ...] = minimum
+        self.maximum: Tuple[float, ...] = maximum
+        self.average: Tuple[float, ...] = average
+
+    def value(self, field: str, kind: str = "average") -> float:
+        """Retorna o valor de um campo.
+
+        Args:
+            field (str): Nome do campo (um de HISTORY_FIELDS).
+            kind (str, optional): "minimum", "maximum" ou "average". Padrão é "average".
+
+        Returns:
+            float: Valor pedido.
+        """
+        return getattr(self, kind)[HISTORY_FIELDS.index(field)]
+
+    def __repr__(self) -> str:
+        return f"<HistoryPoint ts:{self.timestamp:.0f} n:{self.count}>"
+
+
+class HistoryQueryResult:
+    """Classe que representa o resultado de uma consulta por intervalo de tempo."""
+
+    __slots__ = ("tier", "resolution_sec", "points")
+
+    def __init__(self, tier: str, resolution_sec: int, points: List[HistoryPoint]) -> None:
+        """Inicializa o resultado.
+
+        Args:
+            tier (str): Camada usada ("raw", "1min" ou "1h").
+            resolution_sec (int): Resolução da camada em segundos (0 para "raw").
+            points (List[HistoryPoint]): Pontos em ordem cronológica.
+        """
+        self.tier: str = tier
+        self.resolution_sec: int = resolution_sec
+        self.points: List[HistoryPoint] = points
+
+
+class _Tier:
+    """Estado de uma região circular do arquivo (uso interno do HistoryStore)."""
+
+    __slots__ = (
+        "name", "resolution_sec", "record", "capacity", "offset",
+        "head", "count", "pending", "bucket", "acc_count", "acc_min", "acc_max", "acc_sum",
+    )
+
+    def __init__(self, name: str, resolution_sec: int, num_fields: int, capacity: int) -> None:
+        self.name: str = name
+        self.resolution_sec: int = resolution_sec
+        if resolution_sec == 0:
+            self.record: struct.Struct = struct.Struct("<d" + "d" * num_fields)
+        else:
+            self.record = struct.Struct("<dd" + "d" * (3 * num_fields))
+        self.capacity: int = capacity
+        self.offset: int = 0  # Posição da região no arquivo (definida pelo HistoryStore)
+        self.head: int = 0  # Próxima posição a ser gravada
+        self.count: int = 0  # Registros completos na região
+        self.pending: bool = False  # Há um intervalo em andamento gravado em head
+
+        # Acumulador do intervalo em andamento (apenas camadas agregadas)
+        self.bucket: float = 0.0
+        self.acc_count: int = 0
+        self.acc_min: List[float] = []
+        self.acc_max: List[float] = []
+        self.acc_sum: List[float] = []
+
+    @property
+    def size(self) -> int:
+        return self.capacity * self.record.size
+
+    def slot_offset(self, logical_index: int) -> int:
+        """Converte a posição cronológica (0 = mais antigo) no deslocamento do registro."""
+        slot = (self.head - self.count + logical_index) % self.capacity
+        return self.offset + slot * self.record.size
+
+
+class HistoryStore:
+    """Classe que grava e consulta o histórico das métricas globais em disco."""
+
+    def __init__(
+        self,
+        path: str,
+        budget_bytes: int = DEFAULT_BUDGET_BYTES,
+        minute_capacity: int = DEFAULT_MINUTE_CAPACITY,
+        hour_capacity: int = DEFAULT_HOUR_CAPACITY,
+    ) -> None:
+        """Abre (ou cria) o arquivo de histórico.
+
+        As camadas agregadas têm capacidade fixa; o restante do orçamento fica com a
+        camada "raw". Se o arquivo existente tiver outro layout, ele é recriado.
+
+        Args:
+            path (str): Caminho do arquivo.
+            budget_bytes (int, optional): Tamanho máximo do arquivo em bytes.
+            minute_capacity (int, optional): Registros da camada de 1 minuto.
+            hour_capacity (int, optional): Registros da camada de 1 hora.
+
+        Raises:
+            ValueError: Se o orçamento não comportar as camadas agregadas e ao menos
+                uma amostra "raw".
+            OSError: Se o arquivo não puder ser criado ou mapeado.
+        """
+        self.path: str = path
+        num_fields = len(HISTORY_FIELDS)
+        minute = _Tier("1min", 60, num_fields, max(1, minute_capacity))
+        hour = _Tier("1h", 3600, num_fields, max(1, hour_capacity))
+        raw_record_size = struct.calcsize("<d" + "d" * num_fields)
+        raw_capacity = (budget_bytes - _HEADER.size - minute.size - hour.size) // raw_record_size
+        if raw_capacity < 1:
+            raise ValueError(
+                f"Orçamento de {budget_bytes} bytes é pequeno demais para o histórico."
+            )
+        raw = _Tier("raw", 0, num_fields, raw_capacity)
+
+        self._tiers: Tuple[_Tier, ...] = (raw, minute, hour)
+        offset = _HEADER.size
+        for tier in self._tiers:
+            tier.offset = offset
+            offset += tier.size
+        self.size_bytes: int = offset
+
+        self._lock: threading.Lock = threading.Lock()
+        self._fields_crc: int = zlib.crc32(",".join(HISTORY_FIELDS).encode())
+        self._fd: int = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            existing_size = os.fstat(self._fd).st_size
+            if existing_size != self.size_bytes:
+                os.ftruncate(self._fd, 0)  # Descarta o conteúdo de um layout diferente
+                os.ftruncate(self._fd, self.size_bytes)
+            self._mm: mmap.mmap = mmap.mmap(self._fd, self.size_bytes)
+        except OSError:
+            os.close(self._fd)
+            raise
+
+        if existing_size == self.size_bytes and self._load_header():
+            return
+        if existing_size > 0:
+            print(f"Aviso: Histórico em {path} tem outro formato; o arquivo será recriado.")
+        for tier in self._tiers:
+            tier.head, tier.count, tier.pending = 0, 0, False
+        self._write_header()
+
+    # --- Cabeçalho ---
+
+    def _load_header(self) -> bool:
+        """Restaura o estado das camadas a partir do cabeçalho do arquivo.
+
+        Returns:
+            bool: True se o cabeçalho for compatível com o layout atual.
+        """
+        fields = _HEADER.unpack_from(self._mm, 0)
+        magic, version, num_fields, crc = fields[:4]
+        if (magic, version, num_fields, crc) != (_MAGIC, _VERSION, len(HISTORY_FIELDS), self._fields_crc):
+            return False
+        states = [fields[4 + 4 * i: 8 + 4 * i] for i in range(len(self._tiers))]
+        if any(state[0] != tier.capacity for state, tier in zip(states, self._tiers)):
+            return False
+
+        for (capacity, head, count, pending), tier in zip(states, self._tiers):
+            tier.head = head % capacity
+            tier.count = min(count, capacity)
+            tier.pending = bool(pending) and tier.resolution_sec > 0
+            if tier.pending:
+                # Retoma o intervalo em andamento a partir do registro gravado em head
+                values = tier.record.unpack_from(self._mm, tier.offset + tier.head * tier.record.size)
+                n = len(HISTORY_FIELDS)
+                tier.bucket = values[0]
+                tier.acc_count = int(values[1])
+                tier.acc_min = list(values[2: 2 + n])
+                tier.acc_max = list(values[2 + n: 2 + 2 * n])
+                tier.acc_sum = [avg * tier.acc_count for avg in values[2 + 2 * n:]]
+        return True
+
+    def _write_header(self) -> None:
+        """Grava o estado atual das camadas no cabeçalho do arquivo."""
+        states: List[int] = []
+        for tier in self._tiers:
+            states.extend((tier.capacity, tier.head, tier.count, int(tier.pending)))
+        _HEADER.pack_into(
+            self._mm, 0, _MAGIC, _VERSION, len(HISTORY_FIELDS), self._fields_crc, *states
+        )
+
+    # --- Escrita ---
+
+    def append(self, timestamp: float, values: Sequence[float]) -> None:
+        """Grava uma amostra e atualiza os agregados de 1 minuto e 1 hora.
+
+        Args:
+            timestamp (float): Momento da amostra (segundos desde a época Unix).
+            values (Sequence[float]): Valores na ordem de HISTORY_FIELDS.
+        """
+        with self._lock:
+            raw = self._tiers[0]
+            raw.record.pack_into(self._mm, raw.offset + raw.head * raw.record.size, timestamp, *values)
+            raw.head = (raw.head + 1) % raw.capacity
+            raw.count = min(raw.count + 1, raw.capacity)
+
+            for tier in self._tiers[1:]:
+                self._accumulate(tier, timestamp, values)
+            self._write_header()
+
+    def append_global_info(self, info: SystemGlobalInfo, timestamp: float) -> None:
+        """Grava as métricas de um SystemGlobalInfo (ver values_from_global_info)."""
+        self.append(timestamp, values_from_global_info(info))
+
+    def _accumulate(self, tier: _Tier, timestamp: float, values: Sequence[float]) -> None:
+        """Soma a amostra ao intervalo em andamento da camada, fechando-o se necessário."""
+        bucket = math.floor(timestamp / tier.resolution_sec) * tier.resolution_sec
+        if tier.pending and bucket != tier.bucket:
+            # Fecha o intervalo anterior: o registro em head passa a ser definitivo
+            tier.head = (tier.head + 1) % tier.capacity
+            tier.count += 1
+            tier.pending = False
+
+        if not tier.pending:
+            # O registro em andamento ocupa a posição do mais antigo quando a região está cheia
+            if tier.count == tier.capacity:
+                tier.count -= 1
+            tier.pending = True
+            tier.bucket = bucket
+            tier.acc_count = 1
+            tier.acc_min = list(values)
+            tier.acc_max = list(values)
+            tier.acc_sum = list(values)
+        else:
+            tier.acc_count += 1
+            tier.acc_min = [min(a, v) for a, v in zip(tier.acc_min, values)]
+            tier.acc_max = [max(a, v) for a, v in zip(tier.acc_max, values)]
+            tier.acc_sum = [a + v for a, v in zip(tier.acc_sum, values)]
+
+        averages = [s / tier.acc_count for s in tier.acc_sum]
+        tier.record.pack_into(
+            self._mm,
+            tier.offset + tier.head * tier.record.size,
+            tier.bucket,
+            float(tier.acc_count),
+            *tier.acc_min,
+            *tier.acc_max,
+            *averages,
+        )
+
+    def flush(self) -> None:
+        """Força a gravação das páginas alteradas no disco."""
+        with self._lock:
+            if not self._mm.closed:
+                self._mm.flush()
+
+    def close(self) -> None:
+        """Grava as alterações pendentes e fecha o arquivo."""
+        with self._lock:
+            if not self._mm.closed:
+                self._mm.flush()
+                self._mm.close()
+                os.close(self._fd)
+
+    # --- Consulta ---
+
+    def _available(self, tier: _Tier) -> int:
+        """Número de registros legíveis da camada (incluindo o intervalo em andamento)."""
+        return tier.count + (1 if tier.pending else 0)
+
+    def _timestamp_at(self, tier: _Tier, logical_index: int) -> float:
+        return struct.unpack_from("<d", self._mm, tier.slot_offset(logical_index))[0]
+
+    def _bisect(self, tier: _Tier, timestamp: float, right: bool) -> int:
+        """Busca binária pela posição cronológica do timestamp na camada."""
+        lo, hi = 0, self._available(tier)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            ts = self._timestamp_at(tier, mid)
+            if ts < timestamp or (right and ts == timestamp):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _read_point(self, tier: _Tier, logical_index: int) -> HistoryPoint:
+        values = tier.record.unpack_from(self._mm, tier.slot_offset(logical_index))
+        if tier.resolution_sec == 0:
+            samples = tuple(values[1:])
+            return HistoryPoint(values[0], 1, samples, samples, samples)
+        n = len(HISTORY_FIELDS)
+        return HistoryPoint(
+            values[0],
+            int(values[1]),
+            tuple(values[2: 2 + n]),
+            tuple(values[2 + n: 2 + 2 * n]),
+            tuple(values[2 + 2 * n:]),
+        )
+
+    def query(self, start: float, end: float, max_points: Optional[int] = None) -> HistoryQueryResult:
+        """Retorna os pontos de um intervalo de tempo na resolução mais adequada.
+
+        Usa a camada mais fina que respeite max_points. Se ela não cobrir o início do
+        intervalo (amostras antigas já sobrescritas), passa para uma camada mais grossa
+        que tenha dados mais antigos.
+
+        Args:
+            start (float): Início do intervalo (época Unix).
+            end (float): Fim do intervalo (época Unix).
+            max_points (Optional[int], optional): Número máximo de pontos desejado.
+
+        Returns:
+            HistoryQueryResult: Camada escolhida e pontos em ordem cronológica.
+        """
+        with self._lock:
+            if self._mm.closed:
+                return HistoryQueryResult("raw", 0, [])
+
+            # Candidatas em ordem da mais fina para a mais grossa: (camada, início, fim, mais antigo)
+            candidates: List[Tuple[_Tier, int, int, float]] = []
+            for tier in self._tiers:
+                if self._available(tier) == 0:
+                    continue
+                lo = self._bisect(tier, start, right=False)
+                hi = self._bisect(tier, end, right=True)
+                # O intervalo agregado que contém start começa antes dele
+                if (
+                    tier.resolution_sec
+                    and lo > 0
+                    and self._timestamp_at(tier, lo - 1) + tier.resolution_sec > start
+                ):
+                    lo -= 1
+                candidates.append((tier, lo, hi, self._timestamp_at(tier, 0)))
+
+            if not candidates:
+                return HistoryQueryResult("raw", 0, [])
+            fitting = [c for c in candidates if max_points is None or c[2] - c[1] <= max_points]
+            if not fitting:
+                fitting = candidates[-1:]
+            chosen = fitting[0]
+            for candidate in fitting[1:]:
+                if chosen[3] <= start:
+                    break  # A camada escolhida já cobre o início do intervalo
+                # Troca por uma camada mais grossa só se ela tiver dados mais antigos
+                if candidate[3] + candidate[0].resolution_sec <= chosen[3]:
+                    chosen = candidate
+            tier, lo, hi = chosen[:3]
+            points = [self._read_point(tier, i) for i in range(lo, hi)]
+            return HistoryQueryResult(tier.name, tier.resolution_sec, points)
@@ -0,0 +1,118 @@
+# scr/metric_history.py
+"""
+Histórico de métricas em buffer circular com estatísticas incrementais.
+
+Cada amostra nova sobrescreve a mais antiga em um array de tamanho fixo. O mínimo
+e o máximo da janela são mantidos por deques monotônicas e a média por uma soma
+acumulada, de modo que inserir uma amostra e consultar min/max/média custa O(1)
+(amortizado), independentemente do tamanho do histórico.
+"""
+
+from array import array
+from collections import deque
+from typing import Deque, Iterator, List, Optional, Tuple
+
+
+class RingBuffer:
+    """Classe que guarda as últimas N amostras de uma métrica e suas estatísticas."""
+
+    __slots__ = ("capacity", "_values", "_count", "_next", "_seq", "_sum", "_min_deque", "_max_deque")
+
+    def __init__(self, capacity: int = 100) -> None:
+        """Inicializa o buffer vazio.
+
+        Args:
+            capacity (int, optional): Número máximo de amostras guardadas. Padrão é 100.
+
+        Raises:
+            ValueError: Se a capacidade for menor que 1.
+        """
+        if capacity < 1:
+            raise ValueError("A capacidade do histórico deve ser pelo menos 1.")
+        self.capacity: int = capacity
+        self._values: array = array("d", bytes(8 * capacity))
+        self._count: int = 0  # Amostras válidas no buffer (até capacity)
+        self._next: int = 0  # Posição onde a próxima amostra será gravada
+        self._seq: int = 0  # Número de sequência da próxima amostra (nunca volta)
+        self._sum: float = 0.0  # Soma das amostras presentes na janela
+
+        # Deques monotônicas de (sequência, valor): crescente para o mínimo, decrescente para o máximo
+        self._min_deque: Deque[Tuple[int, float]] = deque()
+        self._max_deque: Deque[Tuple[int, float]] = deque()
+
+    def __len__(self) -> int:
+        """Retorna o número de amostras presentes no buffer."""
+        return self._count
+
+    def __iter__(self) -> Iterator[float]:
+        """Itera pelas amostras da mais antiga para a mais recente."""
+        start = (self._next - self._count) % self.capacity
+        for i in range(self._count):
+            yield self._values[(start + i) % self.capacity]
+
+    def append(self, value: float) -> None:
+        """Adiciona uma amostra, descartando a mais antiga se o buffer estiver cheio.
+
+        Args:
+            value (float): Valor da amostra.
+        """
+        value = float(value)
+        if self._count == self.capacity:
+            self._sum -= self._values[self._next]
+        else:
+            self._count += 1
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self._sum += value
+
+        seq = self._seq
+        self._seq += 1
+        oldest_seq = seq - self._count + 1  # Sequência da amostra mais antiga ainda na janela
+
+        min_deque = self._min_deque
+        while min_deque and min_deque[-1][1] >= value:
+            min_deque.pop()
+        min_deque.append((seq, value))
+        if min_deque[0][0] < oldest_seq:
+            min_deque.popleft()
+
+        max_deque = self._max_deque
+        while max_deque and max_deque[-1][1] <= value:
+            max_deque.pop()
+        max_deque.append((seq, value))
+        if max_deque[0][0] < oldest_seq:
+            max_deque.popleft()
+
+        # Recalcula a soma a cada volta completa para não acumular erro de ponto flutuante
+        if self._next == 0:
+            self._sum = sum(self._values[: self._count])
+
+    def latest(self) -> Optional[float]:
+        """Retorna a amostra mais recente, ou None se o buffer estiver vazio."""
+        if self._count == 0:
+            return None
+        return self._values[self._next - 1]
+
+    def min(self) -> Optional[float]:
+        """Retorna o menor valor da janela, ou None se o buffer estiver vazio."""
+        return self._min_deque[0][1] if self._count else None
+
+    def max(self) -> Optional[float]:
+        """Retorna o maior valor da janela, ou None se o buffer estiver vazio."""
+        return self._max_deque[0][1] if self._count else None
+
+    def mean(self) -> Optional[float]:
+        """Retorna a média da janela, ou None se o buffer estiver vazio."""
+        return self._sum / self._count if self._count else None
+
+    def to_list(self) -> List[float]:
+        """Retorna as amostras em uma lista, da mais antiga para a mais recente."""
+        return list(self)
+
+    def clear(self) -> None:
+        """Remove todas as amostras."""
+        self._count = 0
+        self._next = 0
+        self._sum = 0.0
+        self._min_deque.clear()
+        self._max_deque.clear()
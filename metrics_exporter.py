@@ -0,0 +1,216 @@
+# scr/metrics_exporter.py
+"""
+Exportador HTTP de métricas no formato OpenMetrics (compatível com Prometheus).
+
+Serve /metrics a partir do snapshot mais recente do controller, usando apenas a
+biblioteca padrão. O texto gerado é guardado por geração de snapshot: várias
+coletas (scrapes) da mesma geração reutilizam os mesmos bytes, sem nova leitura
+do /proc e sem formatar as strings novamente. As séries por processo são
+limitadas aos top-K processos por CPU e por memória residente.
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from data_model import ProcessInfo, SystemSnapshot
+
+if TYPE_CHECKING:
+    from controller import SystemMonitorController
+
+CONTENT_TYPE: str = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Prefixo de todas as métricas exportadas
+PREFIX: str = "dashboard_"
+
+
+def _escape_label(value: str) -> str:
+    """Escapa um valor de label conforme o formato de texto do OpenMetrics."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs: Dict[str, str]) -> str:
+    return "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in pairs.items()) + "}"
+
+
+def render_openmetrics(snapshot: SystemSnapshot, top_k: int = 10) -> bytes:
+    """Gera o texto OpenMetrics de um snapshot.
+
+    Args:
+        snapshot (SystemSnapshot): Snapshot publicado pelo controller.
+        top_k (int, optional): Processos exportados por critério (CPU e memória).
+
+    Returns:
+        bytes: Corpo da resposta, terminado por "# EOF".
+    """
+    info = snapshot.global_info
+    lines: List[str] = []
+
+    def family(name: str, help_text: str, samples: List[Tuple[str, float]], unit: str = "") -> None:
+        # Cada família: TYPE, UNIT (opcional), HELP e as amostras (sufixo de labels, valor)
+        full_name = PREFIX + name
+        lines.append(f"# TYPE {full_name} gauge")
+        if unit:
+            lines.append(f"# UNIT {full_name} {unit}")
+        lines.append(f"# HELP {full_name} {help_text}")
+        for labels, value in samples:
+            lines.append(f"{full_name}{labels} {float(value)!r}")
+
+    family("snapshot_generation", "Geração do snapshot exportado.", [("", snapshot.generation)])
+    family(
+        "snapshot_timestamp_seconds",
+        "Momento da coleta do snapshot (época Unix).",
+        [("", snapshot.timestamp)],
+        unit="seconds",
+    )
+    family("cpu_usage_percent", "Uso total da CPU em percentual.", [("", info.cpu_usage_percent)])
+    family(
+        "cpu_core_usage_percent",
+        "Uso de cada núcleo da CPU em percentual.",
+        [(_labels({"core": str(i)}), usage) for i, usage in enumerate(info.individual_cpu_usages)],
+    )
+    family("memory_total_bytes", "Memória física total.", [("", info.mem_total_kb * 1024)], unit="bytes")
+    family("memory_used_bytes", "Memória física em uso.", [("", info.mem_used_kb * 1024)], unit="bytes")
+    family(
+        "memory_available_bytes",
+        "Memória disponível para novos processos.",
+        [("", info.mem_available_kb * 1024)],
+        unit="bytes",
+    )
+    family("swap_total_bytes", "Espaço total de swap.", [("", info.swap_total_kb * 1024)], unit="bytes")
+    family("swap_used_bytes", "Espaço de swap em uso.", [("", info.swap_used_kb * 1024)], unit="bytes")
+    family(
+        "load_average",
+        "Carga média do sistema.",
+        [(_labels({"period": p}), v) for p, v in zip(("1m", "5m", "15m"), info.load_avg)],
+    )
+    family("uptime_seconds", "Tempo desde o boot.", [("", info.uptime_seconds)], unit="seconds")
+    family("processes", "Número de processos.", [("", info.total_processes)])
+    family("threads", "Número de threads.", [("", info.total_threads)])
+    family("processes_running", "Processos no estado running (R).", [("", info.running_processes)])
+    family("processes_blocked", "Tarefas bloqueadas em E/S.", [("", info.procs_blocked)])
+    family(
+        "context_switches_per_second",
+        "Trocas de contexto por segundo.",
+        [("", info.context_switches_per_sec)],
+    )
+    family("forks_per_second", "Processos/threads criados por segundo.", [("", info.forks_per_sec)])
+    family("interrupts_per_second", "Interrupções por segundo.", [("", info.interrupts_per_sec)])
+
+    # Séries por processo: união dos top-K por CPU e por memória (RSS)
+    selected: Dict[int, ProcessInfo] = {}
+    if top_k > 0:
+        for proc in snapshot.get_top_processes(top_k, "cpu_percent"):
+            selected[proc.pid] = proc
+        for proc in snapshot.get_top_processes(top_k, "mem_percent"):
+            selected.setdefault(proc.pid, proc)
+    process_labels = [
+        (_labels({"pid": str(p.pid), "user": p.user, "comm": p.comm}), p)
+        for p in selected.values()
+    ]
+    family(
+        "process_cpu_usage_percent",
+        f"Uso de CPU dos top-{top_k} processos por CPU/memória.",
+        [(labels, p.cpu_percent) for labels, p in process_labels],
+    )
+    family(
+        "process_resident_memory_bytes",
+        f"Memória residente (RSS) dos top-{top_k} processos por CPU/memória.",
+        [(labels, p.vm_rss_kb * 1024) for labels, p in process_labels],
+        unit="bytes",
+    )
+    family(
+        "process_threads",
+        f"Threads dos top-{top_k} processos por CPU/memória.",
+        [(labels, p.num_threads) for labels, p in process_labels],
+    )
+
+    lines.append("# EOF")
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+class MetricsExporter:
+    """Classe que serve /metrics em uma thread própria a partir do snapshot do controller."""
+
+    def __init__(
+        self,
+        controller: "SystemMonitorController",
+        host: str = "127.0.0.1",
+        port: int = 9105,
+        top_k: int = 10,
+    ) -> None:
+        """Inicializa o exportador sem abrir a porta (ver start()).
+
+        Args:
+            controller (SystemMonitorController): Fonte dos snapshots.
+            host (str, optional): Endereço de escuta. Padrão é 127.0.0.1.
+            port (int, optional): Porta de escuta (0 = porta livre escolhida pelo sistema).
+            top_k (int, optional): Processos exportados por critério (CPU e memória).
+        """
+        self.controller = controller
+        self.host: str = host
+        self.port: int = port
+        self.top_k: int = top_k
+
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        # Cache do payload: (geração, bytes); o lock garante uma única renderização por geração
+        self._cache: Tuple[int, bytes] = (-1, b"")
+        self._cache_lock: threading.Lock = threading.Lock()
+
+    def get_payload(self) -> bytes:
+        """Retorna o texto OpenMetrics do snapshot atual, renderizando-o só uma vez por geração."""
+        snapshot = self.controller.get_snapshot()
+        generation, payload = self._cache
+        if generation == snapshot.generation:
+            return payload
+        with self._cache_lock:
+            # Outro scrape pode ter renderizado esta geração (ou uma mais nova) enquanto
+            # esperávamos o lock; o cache nunca volta para uma geração mais antiga
+            generation, payload = self._cache
+            if snapshot.generation > generation:
+                payload = render_openmetrics(snapshot, self.top_k)
+                self._cache = (snapshot.generation, payload)
+            return payload
+
+    def _make_handler(self) -> type:
+        exporter = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 (nome definido pelo http.server)
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404, "Use /metrics")
+                    return
+                body = exporter.get_payload()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass  # Não imprime uma linha por scrape
+
+        return _Handler
+
+    def start(self) -> None:
+        """Abre a porta e começa a atender em uma thread daemon."""
+        if self._server is not None:
+            return
+        self._server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="metrics-exporter", daemon=True
+        )
+        self._thread.start()
+        print(f"Exportador de métricas em http://{self.host}:{self.port}/metrics")
+
+    def stop(self) -> None:
+        """Para o servidor e fecha a porta."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        self._thread = None
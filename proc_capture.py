@@ -0,0 +1,329 @@
+# scr/proc_capture.py
+"""
+Gravação e reprodução das leituras do /proc.
+
+O CaptureRecorder recebe de procfs o conteúdo bruto de cada arquivo lido (e cada
+listagem de diretório) e, ao fim de cada ciclo de coleta, grava um frame em um
+arquivo de captura somente de acréscimo. Um arquivo que não mudou desde a última
+leitura não é gravado de novo; o frame guarda só o que mudou, comprimido com zlib.
+
+A CaptureReplay reconstrói o conteúdo de cada frame e o serve no lugar do
+sistema de arquivos (procfs.set_source), junto com os relógios da gravação.
+Assim a reprodução passa pelo mesmo parser e pelo mesmo ciclo do controller, em
+velocidade real ou acelerada.
+
+Formato do arquivo:
+    MAGIC, seguido de frames [tamanho comprimido (uint32)][payload zlib]. O payload
+    tem o cabeçalho (monotonic, epoch, tamanho dos coletores, nº de entradas), os
+    nomes dos coletores do ciclo separados por vírgula e as entradas
+    [operação, errno, tamanho do caminho, tamanho dos dados][caminho][dados].
+"""
+
+import errno
+import hashlib
+import os
+import struct
+import threading
+import time
+import zlib
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+MAGIC: bytes = b"PROCCAP1\n"
+
+# Operações gravadas (o errno diferente de zero indica que a operação falhou)
+OP_FILE: int = 0  # Conteúdo de um arquivo
+OP_DIR: int = 1  # Nomes de um diretório, separados por "\0"
+OP_IS_DIR: int = 2  # Resultado de is_dir (b"1" ou b"0")
+OP_OPEN_DIR: int = 3  # Abertura de um diretório com procfs.ProcDir (sem dados)
+
+_FRAME_HEADER = struct.Struct("<I")
+_PAYLOAD_HEADER = struct.Struct("<ddHI")
+_ENTRY_HEADER = struct.Struct("<BHHI")
+
+# Entrada de um frame: (operação, caminho relativo à raiz, errno, dados)
+CaptureEntry = Tuple[int, str, int, bytes]
+
+
+class CaptureFrame:
+    """Classe que representa um ciclo de coleta gravado."""
+
+    __slots__ = ("monotonic", "wall_time", "collectors", "entries")
+
+    def __init__(
+        self,
+        monotonic: float,
+        wall_time: float,
+        collectors: List[str],
+        entries: List[CaptureEntry],
+    ) -> None:
+        """Inicializa o frame.
+
+        Args:
+            monotonic (float): Relógio monotônico no início do ciclo.
+            wall_time (float): Horário (epoch) no início do ciclo.
+            collectors (List[str]): Coletores executados no ciclo (ex.: ["global"]).
+            entries (List[CaptureEntry]): Leituras que mudaram desde o frame anterior.
+        """
+        self.monotonic: float = monotonic
+        self.wall_time: float = wall_time
+        self.collectors: List[str] = collectors
+        self.entries: List[CaptureEntry] = entries
+
+
+def _check_magic(path: str) -> None:
+    """Verifica se o arquivo começa com o MAGIC de uma captura.
+
+    Raises:
+        ValueError: Se o arquivo não for uma captura.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Arquivo não é uma captura do /proc: {path}")
+
+
+class CaptureRecorder:
+    """Classe que grava as leituras do /proc de cada ciclo em um arquivo de captura."""
+
+    def __init__(self, path: str, compress_level: int = 6) -> None:
+        """Abre (ou cria) o arquivo de captura para acréscimo.
+
+        Args:
+            path (str): Arquivo de captura. Se já existir, os novos frames são
+                acrescentados ao final (o primeiro deles contém todas as leituras).
+            compress_level (int, optional): Nível do zlib (1 a 9).
+
+        Raises:
+            ValueError: Se o arquivo existir e não for uma captura.
+            OSError: Se o arquivo não puder ser aberto.
+        """
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            _check_magic(path)
+        self.path: str = path
+        self.compress_level: int = compress_level
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        # Resumo do último conteúdo gravado de cada (operação, caminho), para a deduplicação
+        self._last: Dict[Tuple[int, str], bytes] = {}
+        self._read_keys: Set[Tuple[int, str]] = set()  # Lidos no ciclo em andamento
+        # Chaves lidas no último ciclo de cada combinação de coletores (ver end_cycle)
+        self._keys_by_collectors: Dict[Tuple[str, ...], Set[Tuple[int, str]]] = {}
+        self._entries: List[bytes] = []  # Entradas do ciclo em andamento, já serializadas
+        self._frame_times: Optional[Tuple[float, float]] = None
+        self._lock: threading.Lock = threading.Lock()  # Workers da varredura gravam em paralelo
+        self.frames: int = 0
+        self.reads: int = 0  # Leituras recebidas
+        self.reads_written: int = 0  # Leituras gravadas (as demais não mudaram)
+        self.bytes_written: int = 0
+
+    def _record(self, op: int, path: str, error: int, data: bytes) -> None:
+        digest = hashlib.blake2b(data, digest_size=16, person=bytes([op, error & 0xFF])).digest()
+        encoded_path = path.encode("utf-8", "surrogateescape")
+        with self._lock:
+            if self._frame_times is None:
+                self._frame_times = (time.monotonic(), time.time())
+            self.reads += 1
+            key = (op, path)
+            self._read_keys.add(key)
+            if self._last.get(key) == digest:
+                return
+            self._last[key] = digest
+            self._entries.append(
+                _ENTRY_HEADER.pack(op, error, len(encoded_path), len(data)) + encoded_path + data
+            )
+            self.reads_written += 1
+
+    def record_file(self, path: str, data: Optional[bytes], error: int = 0) -> None:
+        """Registra a leitura de um arquivo (data None e error != 0 se ela falhou)."""
+        self._record(OP_FILE, path, error, data or b"")
+
+    def record_dir(self, path: str, names: Optional[List[str]], error: int = 0) -> None:
+        """Registra a listagem de um diretório (names None e error != 0 se ela falhou)."""
+        data = "\0".join(names).encode("utf-8", "surrogateescape") if names else b""
+        self._record(OP_DIR, path, error, data)
+
+    def record_is_dir(self, path: str, result: bool) -> None:
+        """Registra o resultado de um is_dir."""
+        self._record(OP_IS_DIR, path, 0, b"1" if result else b"0")
+
+    def record_open_dir(self, path: str, error: int = 0) -> None:
+        """Registra a abertura de um diretório (error != 0 se ela falhou)."""
+        self._record(OP_OPEN_DIR, path, error, b"")
+
+    def end_cycle(self, collectors: Sequence[str]) -> None:
+        """Grava o frame do ciclo em andamento.
+
+        Os resumos das leituras que o último ciclo com os mesmos coletores fez e que este
+        ciclo não repetiu (ex.: PIDs que terminaram) são descartados, para que a tabela
+        de deduplicação não cresça sem limite. Comparar apenas ciclos com os mesmos
+        coletores evita descartar, em um ciclo só global, os arquivos dos processos.
+
+        Args:
+            collectors (Sequence[str]): Coletores executados no ciclo.
+        """
+        with self._lock:
+            entries, self._entries = self._entries, []
+            frame_times, self._frame_times = self._frame_times, None
+            read_keys, self._read_keys = self._read_keys, set()
+            previous = self._keys_by_collectors.get(tuple(collectors), set())
+            for key in previous - read_keys:
+                self._last.pop(key, None)
+            self._keys_by_collectors[tuple(collectors)] = read_keys
+        monotonic, wall_time = frame_times or (time.monotonic(), time.time())
+        names = ",".join(collectors).encode()
+        payload = b"".join(
+            [_PAYLOAD_HEADER.pack(monotonic, wall_time, len(names), len(entries)), names]
+            + entries
+        )
+        compressed = zlib.compress(payload, self.compress_level)
+        self._file.write(_FRAME_HEADER.pack(len(compressed)) + compressed)
+        # Cada frame é descarregado inteiro, então uma parada abrupta perde no máximo o último
+        self._file.flush()
+        self.frames += 1
+        self.bytes_written += _FRAME_HEADER.size + len(compressed)
+
+    def close(self) -> None:
+        """Fecha o arquivo de captura."""
+        if not self._file.closed:
+            self._file.close()
+
+
+def read_frames(path: str) -> Iterator[CaptureFrame]:
+    """Lê os frames de um arquivo de captura, do primeiro ao último.
+
+    Um frame incompleto no fim do arquivo (gravação interrompida) é ignorado.
+
+    Args:
+        path (str): Arquivo de captura.
+
+    Yields:
+        CaptureFrame: Frames na ordem em que foram gravados.
+
+    Raises:
+        ValueError: Se o arquivo não for uma captura.
+    """
+    _check_magic(path)
+    with open(path, "rb") as f:
+        f.seek(len(MAGIC))
+        while True:
+            header = f.read(_FRAME_HEADER.size)
+            if len(header) < _FRAME_HEADER.size:
+                return
+            (size,) = _FRAME_HEADER.unpack(header)
+            compressed = f.read(size)
+            try:
+                payload = zlib.decompress(compressed)
+            except zlib.error:
+                print(f"Aviso: Frame incompleto no fim da captura {path}; reprodução encerrada.")
+                return
+            monotonic, wall_time, names_size, count = _PAYLOAD_HEADER.unpack_from(payload)
+            offset = _PAYLOAD_HEADER.size
+            names = payload[offset : offset + names_size].decode()
+            offset += names_size
+            entries: List[CaptureEntry] = []
+            for _ in range(count):
+                op, error, path_size, data_size = _ENTRY_HEADER.unpack_from(payload, offset)
+                offset += _ENTRY_HEADER.size
+                entry_path = payload[offset : offset + path_size].decode("utf-8", "surrogateescape")
+                offset += path_size
+                entries.append((op, entry_path, error, payload[offset : offset + data_size]))
+                offset += data_size
+            yield CaptureFrame(monotonic, wall_time, names.split(",") if names else [], entries)
+
+
+class CaptureReplay:
+    """Classe que serve o conteúdo de uma captura no lugar do /proc (ver procfs.set_source)."""
+
+    def __init__(self, path: str, speed: float = 1.0) -> None:
+        """Inicializa a reprodução (nenhum frame é aplicado antes de run()).
+
+        Args:
+            path (str): Arquivo de captura.
+            speed (float, optional): Velocidade da reprodução (1 = tempo real,
+                10 = dez vezes mais rápido, 0 = sem espera entre os frames).
+
+        Raises:
+            ValueError: Se o arquivo não for uma captura ou a velocidade for negativa.
+            OSError: Se o arquivo não puder ser lido.
+        """
+        if speed < 0:
+            raise ValueError(f"Velocidade de reprodução inválida: {speed}")
+        _check_magic(path)
+        self.path: str = path
+        self.speed: float = speed
+        # Conteúdo atual de cada (operação, caminho): (errno, dados)
+        self._state: Dict[Tuple[int, str], Tuple[int, bytes]] = {}
+        self._monotonic: float = 0.0
+        self._wall_time: float = 0.0
+        self.frames_played: int = 0
+
+    def apply(self, frame: CaptureFrame) -> None:
+        """Aplica as leituras de um frame ao conteúdo servido."""
+        for op, path, error, data in frame.entries:
+            self._state[(op, path)] = (error, data)
+        self._monotonic = frame.monotonic
+        self._wall_time = frame.wall_time
+        self.frames_played += 1
+
+    def _lookup(self, op: int, path: str) -> bytes:
+        error, data = self._state.get((op, path), (errno.ENOENT, b""))
+        if error:
+            raise OSError(error, os.strerror(error), path)
+        return data
+
+    def read_bytes(self, path: str) -> bytes:
+        """Conteúdo gravado de um arquivo (caminho relativo à raiz)."""
+        return self._lookup(OP_FILE, path)
+
+    def open_dir(self, path: str) -> None:
+        """Repete o resultado gravado da abertura de um diretório (falha com o errno gravado)."""
+        error, _ = self._state.get((OP_OPEN_DIR, path), (0, b""))
+        if error:
+            raise OSError(error, os.strerror(error), path)
+
+    def list_dir(self, path: str) -> List[str]:
+        """Nomes gravados de um diretório (caminho relativo à raiz)."""
+        data = self._lookup(OP_DIR, path)
+        return data.decode("utf-8", "surrogateescape").split("\0") if data else []
+
+    def is_dir(self, path: str) -> bool:
+        """Resultado gravado de is_dir (o diretório existir na listagem também conta)."""
+        entry = self._state.get((OP_IS_DIR, path))
+        if entry is not None:
+            return entry[1] == b"1"
+        return (OP_DIR, path) in self._state
+
+    def monotonic(self) -> float:
+        """Relógio monotônico do frame em reprodução."""
+        return self._monotonic
+
+    def wall_time(self) -> float:
+        """Horário (epoch) do frame em reprodução."""
+        return self._wall_time
+
+    def run(self, on_frame: Callable[[List[str]], None], stop_event: threading.Event) -> int:
+        """Aplica os frames respeitando os intervalos gravados, divididos pela velocidade.
+
+        Args:
+            on_frame (Callable[[List[str]], None]): Chamada depois de aplicar cada frame,
+                com os coletores executados no ciclo gravado.
+            stop_event (threading.Event): Interrompe a reprodução quando sinalizado.
+
+        Returns:
+            int: Frames reproduzidos.
+        """
+        start = time.monotonic()
+        first: Optional[float] = None
+        for frame in read_frames(self.path):
+            if first is None:
+                first = frame.monotonic
+            if self.speed > 0:
+                delay = start + (frame.monotonic - first) / self.speed - time.monotonic()
+                # Espera pelo evento para que a parada interrompa a espera imediatamente
+                if delay > 0 and stop_event.wait(timeout=delay):
+                    break
+            if stop_event.is_set():
+                break
+            self.apply(frame)
+            on_frame(frame.collectors)
+        return self.frames_played
@@ -0,0 +1,241 @@
+# scr/process_columns.py
+"""
+Snapshot colunar dos processos, com cálculo de %CPU e %MEM em lote.
+
+Em vez de chamar os métodos de cálculo em cada ProcessInfo, os campos numéricos
+são copiados para arrays paralelos (pid, utime, stime, rss, starttime, ...) e os
+percentuais são calculados de uma só vez, junto com a junção com o snapshot anterior.
+Os objetos ProcessInfo com os valores calculados só são materializados para as
+linhas que forem realmente exibidas.
+
+Usa NumPy quando estiver instalado; caso contrário, usa o módulo array da biblioteca padrão.
+"""
+
+import copy
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from data_model import ProcessInfo
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional
+    np = None  # type: ignore[assignment]
+
+
+class ProcessColumns:
+    """Classe que armazena um snapshot de processos em formato colunar."""
+
+    def __init__(
+        self,
+        processes: Sequence[ProcessInfo],
+        system_boot_time_epoch: float,
+        system_hz: int,
+        use_numpy: Optional[bool] = None,
+    ) -> None:
+        """Copia os campos numéricos dos processos para arrays paralelos.
+
+        Args:
+            processes (Sequence[ProcessInfo]): Processos lidos neste ciclo (sem percentuais).
+            system_boot_time_epoch (float): Momento do boot em segundos desde a época Unix.
+            system_hz (int): Frequência do sistema em jiffies por segundo.
+            use_numpy (Optional[bool], optional): Força (True) ou desativa (False) o uso de
+                NumPy. Se omitido, usa NumPy quando disponível.
+        """
+        self.processes: List[ProcessInfo] = list(processes)  # Linhas ainda não materializadas
+        self.system_boot_time_epoch: float = system_boot_time_epoch
+        self.system_hz: int = system_hz
+        self.use_numpy: bool = (np is not None) if use_numpy is None else (use_numpy and np is not None)
+
+        # Colunas (uma posição por processo, na mesma ordem de self.processes)
+        self.pid: array = array("q", [p.pid for p in self.processes])
+        self.starttime: array = array("q", [p.starttime_jiffies for p in self.processes])
+        self.utime: array = array("q", [p.utime for p in self.processes])
+        self.stime: array = array("q", [p.stime for p in self.processes])
+        self.rss_kb: array = array("q", [p.vm_rss_kb for p in self.processes])
+        self.num_threads: array = array("q", [p.num_threads for p in self.processes])
+
+        # Colunas calculadas por compute()
+        self.cpu_percent: array = array("d", bytes(8 * len(self.processes)))
+        self.mem_percent: array = array("d", bytes(8 * len(self.processes)))
+
+        # Linhas já materializadas: {índice: ProcessInfo com os valores calculados}
+        self._materialized: Dict[int, ProcessInfo] = {}
+
+    def __len__(self) -> int:
+        """Retorna o número de processos no snapshot."""
+        return len(self.processes)
+
+    # --- Cálculos em lote ---
+
+    def compute(
+        self,
+        prev: Optional["ProcessColumns"],
+        delta_total_system_jiffies: int,
+        num_cores: int,
+        system_total_mem_kb: int,
+    ) -> None:
+        """Calcula %CPU e %MEM de todos os processos de uma só vez.
+
+        Usa as mesmas regras de ProcessInfo.calculate_and_set_cpu_percent e
+        calculate_and_set_mem_percent. A junção com o snapshot anterior é feita pela
+        chave (pid, starttime); processos sem leitura anterior ficam com 0% de CPU.
+
+        Args:
+            prev (Optional[ProcessColumns]): Snapshot colunar do ciclo anterior.
+            delta_total_system_jiffies (int): Delta total de jiffies do sistema entre medições.
+            num_cores (int): Número de núcleos de CPU disponíveis.
+            system_total_mem_kb (int): Memória total do sistema em KB.
+        """
+        if self.use_numpy:
+            self._compute_numpy(prev, delta_total_system_jiffies, num_cores, system_total_mem_kb)
+        else:
+            self._compute_python(prev, delta_total_system_jiffies, num_cores, system_total_mem_kb)
+        self._materialized = {}
+
+    def _compute_python(
+        self,
+        prev: Optional["ProcessColumns"],
+        delta_total_system_jiffies: int,
+        num_cores: int,
+        system_total_mem_kb: int,
+    ) -> None:
+        """Implementação de compute() com a biblioteca padrão."""
+        n = len(self.processes)
+
+        # %MEM: (rss / memória total) * 100
+        if system_total_mem_kb > 0:
+            factor = 100.0 / system_total_mem_kb
+            self.mem_percent = array("d", [rss * factor for rss in self.rss_kb])
+        else:
+            self.mem_percent = array("d", bytes(8 * n))
+
+        # %CPU: requer delta do sistema válido e leitura anterior do processo
+        if prev is None or delta_total_system_jiffies <= 0 or self.system_hz <= 0:
+            self.cpu_percent = array("d", bytes(8 * n))
+            return
+
+        prev_index: Dict[Tuple[int, int], int] = {
+            key: i for i, key in enumerate(zip(prev.pid, prev.starttime))
+        }
+        prev_utime, prev_stime = prev.utime, prev.stime
+        scale = num_cores * 100.0 / delta_total_system_jiffies
+        upper = 100.0 * num_cores
+
+        cpu: List[float] = []
+        append = cpu.append
+        for pid, start, utime, stime in zip(self.pid, self.starttime, self.utime, self.stime):
+            j = prev_index.get((pid, start))
+            if j is None:
+                append(0.0)
+                continue
+            delta = (utime - prev_utime[j]) + (stime - prev_stime[j])
+            append(0.0 if delta < 0 else min(delta * scale, upper))
+        self.cpu_percent = array("d", cpu)
+
+    def _compute_numpy(
+        self,
+        prev: Optional["ProcessColumns"],
+        delta_total_system_jiffies: int,
+        num_cores: int,
+        system_total_mem_kb: int,
+    ) -> None:
+        """Implementação vetorizada de compute() com NumPy."""
+        n = len(self.processes)
+        rss = np.frombuffer(self.rss_kb, dtype=np.int64)
+
+        if system_total_mem_kb > 0:
+            mem = rss * (100.0 / system_total_mem_kb)
+        else:
+            mem = np.zeros(n)
+        self.mem_percent = array("d", mem.astype(np.float64).tobytes())
+
+        if (
+            prev is None
+            or len(prev) == 0
+            or n == 0
+            or delta_total_system_jiffies <= 0
+            or self.system_hz <= 0
+        ):
+            self.cpu_percent = array("d", bytes(8 * n))
+            return
+
+        pid = np.frombuffer(self.pid, dtype=np.int64)
+        start = np.frombuffer(self.starttime, dtype=np.int64)
+        total = np.frombuffer(self.utime, dtype=np.int64) + np.frombuffer(self.stime, dtype=np.int64)
+
+        # Junção com o snapshot anterior: busca binária nos PIDs anteriores ordenados
+        prev_pid = np.frombuffer(prev.pid, dtype=np.int64)
+        order = np.argsort(prev_pid, kind="stable")
+        sorted_pid = prev_pid[order]
+        pos = np.clip(np.searchsorted(sorted_pid, pid), 0, len(sorted_pid) - 1)
+        j = order[pos]
+        prev_start = np.frombuffer(prev.starttime, dtype=np.int64)[j]
+        prev_total = (
+            np.frombuffer(prev.utime, dtype=np.int64)[j]
+            + np.frombuffer(prev.stime, dtype=np.int64)[j]
+        )
+        matched = (sorted_pid[pos] == pid) & (prev_start == start)
+
+        delta = total - prev_total
+        cpu = delta * (num_cores * 100.0 / delta_total_system_jiffies)
+        cpu = np.where(matched & (delta >= 0), np.minimum(cpu, 100.0 * num_cores), 0.0)
+        self.cpu_percent = array("d", cpu.astype(np.float64).tobytes())
+
+    def total_threads(self) -> int:
+        """Retorna a soma do número de threads de todos os processos."""
+        return sum(self.num_threads)
+
+    # --- Materialização sob demanda ---
+
+    def materialize(self, index: int) -> ProcessInfo:
+        """Retorna uma cópia do ProcessInfo da linha com os valores calculados preenchidos.
+
+        O objeto original (lido do /proc) não é modificado; a cópia é criada apenas na
+        primeira chamada para cada linha.
+
+        Args:
+            index (int): Posição da linha no snapshot.
+
+        Returns:
+            ProcessInfo: Processo com cpu_percent, mem_percent e start_time_str definidos.
+        """
+        proc_info = self._materialized.get(index)
+        if proc_info is None:
+            proc_info = copy.copy(self.processes[index])
+            proc_info.cpu_percent = self.cpu_percent[index]
+            proc_info.mem_percent = self.mem_percent[index]
+            proc_info.calculate_and_set_start_time_str(
+                system_boot_time_epoch=self.system_boot_time_epoch,
+                system_hz=self.system_hz,
+            )
+            self._materialized[index] = proc_info
+        return proc_info
+
+    def materialize_all(self) -> List[ProcessInfo]:
+        """Materializa todas as linhas do snapshot (mesma ordem da coleta)."""
+        return [self.materialize(i) for i in range(len(self.processes))]
+
+    def find_index(self, pid: int) -> Optional[int]:
+        """Retorna a posição do processo com o PID informado, ou None se não existir."""
+        for i, row_pid in enumerate(self.pid):
+            if row_pid == pid:
+                return i
+        return None
+
+    def top_indices(self, limit: int, key: str = "cpu_percent") -> List[int]:
+        """Retorna as posições das linhas com os maiores valores da coluna informada.
+
+        Args:
+            limit (int): Quantidade máxima de linhas.
+            key (str, optional): "cpu_percent" ou "mem_percent". Padrão é "cpu_percent".
+
+        Returns:
+            List[int]: Posições ordenadas do maior para o menor valor.
+        """
+        column = self.cpu_percent if key == "cpu_percent" else self.mem_percent
+        if self.use_numpy and len(column) > limit > 0:
+            values = np.frombuffer(column, dtype=np.float64)
+            candidates = np.argpartition(-values, limit - 1)[:limit]
+            return sorted(candidates.tolist(), key=lambda i: column[i], reverse=True)
+        return sorted(range(len(column)), key=column.__getitem__, reverse=True)[:limit]
@@ -0,0 +1,189 @@
+# scr/process_history.py
+"""
+Histórico por processo limitado aos processos que mais consomem CPU e memória.
+
+Todos os processos passam por dois resumos "space-saving" (um ponderado por %CPU
+e outro por RSS) com um número fixo de contadores; processos leves disputam
+esses contadores e só custam uma entrada de dicionário enquanto estiverem neles.
+Apenas os K processos mais pesados segundo os resumos guardam séries completas
+(RingBuffer de %CPU e RSS), então a memória usada não depende do número de
+processos no sistema.
+
+Os contadores decaem a cada ciclo, de modo que o ranking reflete o consumo
+recente e não o acumulado desde o início da coleta.
+"""
+
+import heapq
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from metric_history import RingBuffer
+from process_table import ProcessKey
+
+
+class SpaceSavingCounter:
+    """Classe que estima os itens de maior peso de um fluxo com memória fixa (space-saving)."""
+
+    __slots__ = ("capacity", "decay", "_counts", "_errors")
+
+    def __init__(self, capacity: int, decay: float = 1.0) -> None:
+        """Inicializa o resumo vazio.
+
+        Args:
+            capacity (int): Número máximo de contadores.
+            decay (float, optional): Fator aplicado aos contadores a cada ciclo (1.0 = sem decaimento).
+        """
+        self.capacity: int = max(1, capacity)
+        self.decay: float = decay
+        self._counts: Dict[ProcessKey, float] = {}
+        self._errors: Dict[ProcessKey, float] = {}  # Superestimativa máxima de cada contador
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def update(self, weights: Sequence[Tuple[ProcessKey, float]]) -> None:
+        """Soma os pesos de um ciclo aos contadores.
+
+        Chaves que não aparecem no ciclo são removidas (o processo terminou), o que
+        libera seus contadores.
+
+        Args:
+            weights (Sequence[Tuple[ProcessKey, float]]): Pares (chave, peso) do ciclo.
+        """
+        present = {key for key, _ in weights}
+        counts: Dict[ProcessKey, float] = {}
+        errors: Dict[ProcessKey, float] = {}
+        for key, count in self._counts.items():
+            if key in present:
+                counts[key] = count * self.decay
+                errors[key] = self._errors[key] * self.decay
+
+        candidates: List[Tuple[float, ProcessKey]] = []
+        for key, weight in weights:
+            if weight <= 0:
+                continue
+            if key in counts:
+                counts[key] += weight
+            else:
+                candidates.append((weight, key))
+
+        # Novas chaves, das mais pesadas para as mais leves: ocupam contadores livres ou
+        # substituem o menor contador, herdando seu valor como erro (regra do space-saving)
+        candidates.sort(reverse=True)
+        heap: List[Tuple[float, ProcessKey]] = []
+        heap_ready = False
+        for weight, key in candidates:
+            if len(counts) < self.capacity:
+                counts[key] = weight
+                errors[key] = 0.0
+                continue
+            if not heap_ready:
+                heap = [(count, k) for k, count in counts.items()]
+                heapq.heapify(heap)
+                heap_ready = True
+            minimum, evicted = heapq.heappop(heap)
+            del counts[evicted]
+            del errors[evicted]
+            counts[key] = minimum + weight
+            errors[key] = minimum
+            heapq.heappush(heap, (counts[key], key))
+
+        self._counts = counts
+        self._errors = errors
+
+    def top(self, limit: int) -> List[ProcessKey]:
+        """Retorna as chaves com os maiores contadores.
+
+        Args:
+            limit (int): Quantidade máxima de chaves.
+
+        Returns:
+            List[ProcessKey]: Chaves em ordem decrescente de contador.
+        """
+        return heapq.nlargest(limit, self._counts, key=self._counts.__getitem__)
+
+
+class ProcessHistoryStore:
+    """Classe que guarda séries de %CPU e RSS para os K processos mais pesados."""
+
+    def __init__(
+        self,
+        max_tracked: int = 32,
+        history_length: int = 120,
+        counters_per_tracked: int = 4,
+        decay: float = 0.9,
+    ) -> None:
+        """Inicializa o histórico vazio.
+
+        Args:
+            max_tracked (int, optional): Máximo de processos com série completa (K).
+            history_length (int, optional): Amostras guardadas por série.
+            counters_per_tracked (int, optional): Contadores do space-saving por processo
+                acompanhado (mais contadores = ranking mais preciso).
+            decay (float, optional): Decaimento dos contadores a cada ciclo.
+        """
+        self.max_tracked: int = max(1, max_tracked)
+        self.history_length: int = history_length
+        counters = self.max_tracked * max(1, counters_per_tracked)
+        self._cpu_counter: SpaceSavingCounter = SpaceSavingCounter(counters, decay)
+        self._rss_counter: SpaceSavingCounter = SpaceSavingCounter(counters, decay)
+        # Séries dos processos acompanhados: {chave: (RingBuffer de %CPU, RingBuffer de RSS em KB)}
+        self._series: Dict[ProcessKey, Tuple[RingBuffer, RingBuffer]] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def update(
+        self, keys: Sequence[ProcessKey], cpu_percent: Sequence[float], rss_kb: Sequence[float]
+    ) -> None:
+        """Processa um ciclo de coleta.
+
+        Args:
+            keys (Sequence[ProcessKey]): Chave (pid, starttime) de cada processo.
+            cpu_percent (Sequence[float]): %CPU de cada processo, na mesma ordem.
+            rss_kb (Sequence[float]): RSS em KB de cada processo, na mesma ordem.
+        """
+        self._cpu_counter.update(list(zip(keys, cpu_percent)))
+        self._rss_counter.update(list(zip(keys, rss_kb)))
+
+        # Metade das vagas para os maiores consumidores de CPU, o restante para os de memória
+        tracked: Dict[ProcessKey, None] = dict.fromkeys(
+            self._cpu_counter.top((self.max_tracked + 1) // 2)
+        )
+        for key in self._rss_counter.top(self.max_tracked):
+            if len(tracked) >= self.max_tracked:
+                break
+            tracked.setdefault(key, None)
+
+        with self._lock:
+            series: Dict[ProcessKey, Tuple[RingBuffer, RingBuffer]] = {}
+            for key, cpu, rss in zip(keys, cpu_percent, rss_kb):
+                if key not in tracked:
+                    continue
+                buffers = self._series.get(key)
+                if buffers is None:
+                    buffers = (RingBuffer(self.history_length), RingBuffer(self.history_length))
+                buffers[0].append(cpu)
+                buffers[1].append(rss)
+                series[key] = buffers
+            # Processos que saíram do top-K (ou terminaram) perdem a série
+            self._series = series
+
+    def get_history(self, pid: int) -> Optional[Tuple[List[float], List[float]]]:
+        """Retorna as séries de um processo acompanhado.
+
+        Args:
+            pid (int): PID do processo.
+
+        Returns:
+            Optional[Tuple[List[float], List[float]]]: (%CPU, RSS em KB), das amostras mais
+                antigas para as mais recentes, ou None se o processo não estiver no top-K.
+        """
+        with self._lock:
+            for (key_pid, _), (cpu, rss) in self._series.items():
+                if key_pid == pid:
+                    return cpu.to_list(), rss.to_list()
+        return None
+
+    def tracked_pids(self) -> List[int]:
+        """Retorna os PIDs que possuem série completa."""
+        with self._lock:
+            return [pid for pid, _ in self._series]
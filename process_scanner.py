@@ -0,0 +1,176 @@
+# scr/process_scanner.py
+"""
+Varredura de /proc/[pid] dividida em fatias (shards) executadas por um pool de workers.
+
+A lista de PIDs é dividida em fatias contíguas; cada fatia é lida por um worker
+(thread ou processo) e os resultados são concatenados na ordem das fatias, de
+modo que a ordem final é sempre a mesma da lista de PIDs recebida.
+"""
+
+import functools
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from collection_stats import CollectionCounters, counting, merge_counters
+from data_model import ProcessInfo
+import procfs
+import system_monitor
+
+# Backends de varredura suportados
+SCAN_BACKENDS: Tuple[str, ...] = ("serial", "thread", "process")
+
+# Cada item de uma fatia: (pid, starttime conhecido ou None)
+_ShardItem = Tuple[int, Optional[int]]
+
+
+def _scan_shard(
+    shard: List[_ShardItem], proc_root: Optional[str] = None, profile: str = "full"
+) -> Tuple[List[ProcessInfo], CollectionCounters]:
+    """Lê os processos de uma fatia (executado dentro do worker).
+
+    Precisa ser uma função de módulo para poder ser enviada a um pool de processos.
+
+    Args:
+        shard (List[_ShardItem]): Pares (pid, starttime conhecido) a serem lidos.
+        proc_root (Optional[str], optional): Raiz do procfs de quem chamou; workers de
+            um pool de processos não herdam a configuração (ver procfs.set_proc_root).
+        profile (str, optional): Perfil de coleta (ver system_monitor.COLLECTION_PROFILES).
+
+    Returns:
+        Tuple[List[ProcessInfo], CollectionCounters]: Processos lidos com sucesso, na
+            ordem da fatia, e os contadores de leitura do worker (ver collection_stats).
+    """
+    if proc_root is not None and proc_root != procfs.get_proc_root():
+        procfs.set_proc_root(proc_root)
+    processes_list: List[ProcessInfo] = []
+    with counting() as counters:
+        counters.pids_scanned = len(shard)
+        for pid, known_starttime in shard:
+            process_info = system_monitor.get_process_details(pid, known_starttime, profile)
+            if process_info is not None:
+                processes_list.append(process_info)
+    return processes_list, counters
+
+
+def split_into_shards(items: Sequence[_ShardItem], num_shards: int) -> List[List[_ShardItem]]:
+    """Divide uma sequência em até num_shards fatias contíguas de tamanhos equilibrados.
+
+    Args:
+        items (Sequence[_ShardItem]): Itens a serem divididos.
+        num_shards (int): Número desejado de fatias.
+
+    Returns:
+        List[List[_ShardItem]]: Fatias não vazias, na ordem original dos itens.
+    """
+    num_shards = max(1, min(num_shards, len(items)))
+    base, extra = divmod(len(items), num_shards)
+    shards: List[List[_ShardItem]] = []
+    start = 0
+    for i in range(num_shards):
+        end = start + base + (1 if i < extra else 0)
+        if end > start:
+            shards.append(list(items[start:end]))
+        start = end
+    return shards
+
+
+class ProcessScanner:
+    """Classe que lê /proc/[pid] de forma serial ou paralela com um pool persistente."""
+
+    def __init__(
+        self,
+        workers: int = 1,
+        backend: str = "thread",
+        shards_per_worker: int = 4,
+    ) -> None:
+        """Inicializa o scanner sem criar o pool (criado na primeira varredura).
+
+        Args:
+            workers (int, optional): Número de workers. Com 1 worker a varredura é serial.
+            backend (str, optional): "serial", "thread" ou "process". Padrão é "thread".
+            shards_per_worker (int, optional): Fatias por worker, para equilibrar a carga
+                quando alguns PIDs são mais lentos de ler que outros.
+
+        Raises:
+            ValueError: Se o backend não for suportado ou workers for menor que 1.
+        """
+        if backend not in SCAN_BACKENDS:
+            raise ValueError(
+                f"Backend de varredura inválido: '{backend}'. Use um de {SCAN_BACKENDS}."
+            )
+        if workers < 1:
+            raise ValueError("O número de workers deve ser pelo menos 1.")
+
+        self.workers: int = workers
+        self.backend: str = "serial" if workers == 1 else backend
+        self.shards_per_worker: int = max(1, shards_per_worker)
+        self._executor: Optional[Executor] = None  # Pool criado sob demanda
+
+    def _get_executor(self) -> Executor:
+        """Retorna o pool de workers, criando-o na primeira chamada.
+
+        Returns:
+            Executor: Pool de threads ou de processos.
+        """
+        if self._executor is None:
+            if self.backend == "process":
+                # forkserver evita fazer fork de um processo com threads em execução (Tk, controller)
+                method = (
+                    "forkserver"
+                    if "forkserver" in multiprocessing.get_all_start_methods()
+                    else "spawn"
+                )
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(method),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="proc-scan"
+                )
+        return self._executor
+
+    def scan(
+        self,
+        pids: Sequence[int],
+        known_starttimes: Optional[Dict[int, int]] = None,
+        profile: str = "full",
+    ) -> List[ProcessInfo]:
+        """Lê os processos da lista de PIDs.
+
+        Args:
+            pids (Sequence[int]): PIDs a serem lidos.
+            known_starttimes (Optional[Dict[int, int]], optional): starttime já conhecido
+                de cada PID (ver system_monitor.get_process_details).
+            profile (str, optional): Perfil de coleta, que define quais arquivos de
+                /proc/[pid] são lidos (ver system_monitor.COLLECTION_PROFILES).
+
+        Returns:
+            List[ProcessInfo]: Processos lidos, na mesma ordem da lista de PIDs.
+        """
+        known = known_starttimes or {}
+        items: List[_ShardItem] = [(pid, known.get(pid)) for pid in pids]
+        if not items:
+            return []
+
+        if self.backend == "serial":
+            # Na thread atual os contadores já são somados aos da etapa em andamento
+            return _scan_shard(items, profile=profile)[0]
+
+        shards = split_into_shards(items, self.workers * self.shards_per_worker)
+        processes_list: List[ProcessInfo] = []
+        # Executor.map devolve os resultados na ordem das fatias (ordem determinística)
+        scan_shard = functools.partial(
+            _scan_shard, proc_root=procfs.get_proc_root(), profile=profile
+        )
+        for shard_result, counters in self._get_executor().map(scan_shard, shards):
+            processes_list.extend(shard_result)
+            merge_counters(counters)
+        return processes_list
+
+    def close(self) -> None:
+        """Encerra o pool de workers, se existir."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,107 @@
+# scr/process_table.py
+"""
+Tabela de processos persistente entre ciclos de atualização do controller.
+
+Cada processo é identificado por (pid, starttime_jiffies), o que distingue um
+processo de outro que reutilizou o mesmo PID. Em processos já conhecidos, apenas
+os dados voláteis (/proc/[pid]/stat e os campos de memória do perfil de coleta) são
+relidos; cmdline e nome de usuário vêm do cache da tabela.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from data_model import ProcessInfo
+from process_scanner import ProcessScanner
+import system_monitor
+
+# Chave de um processo na tabela: (pid, starttime_jiffies)
+ProcessKey = Tuple[int, int]
+
+
+class ProcessTable:
+    """Classe que mantém o estado de cada processo entre ciclos de coleta."""
+
+    def __init__(self, scanner: Optional[ProcessScanner] = None, profile: str = "full") -> None:
+        """Inicializa a tabela vazia (a primeira atualização faz uma coleta completa).
+
+        Args:
+            scanner (Optional[ProcessScanner], optional): Scanner usado para ler /proc/[pid].
+                Se omitido, a leitura é serial.
+            profile (str, optional): Perfil de coleta usado nas varreduras
+                (ver system_monitor.COLLECTION_PROFILES). Padrão é "full".
+
+        Raises:
+            ValueError: Se o perfil de coleta não existir.
+        """
+        if profile not in system_monitor.COLLECTION_PROFILES:
+            raise ValueError(
+                f"Perfil de coleta inválido: '{profile}'. "
+                f"Use um de {tuple(system_monitor.COLLECTION_PROFILES)}."
+            )
+        self.scanner: ProcessScanner = scanner if scanner is not None else ProcessScanner()
+        self.profile: str = profile
+        self._entries: Dict[ProcessKey, ProcessInfo] = {}  # Última leitura de cada processo
+
+        # Estatísticas da última atualização (úteis para diagnóstico)
+        self.last_new_count: int = 0  # Processos novos (coleta completa)
+        self.last_reused_count: int = 0  # Processos conhecidos (apenas dados voláteis)
+        self.last_evicted_count: int = 0  # Processos que terminaram ou tiveram o PID reutilizado
+
+    def __len__(self) -> int:
+        """Retorna o número de processos presentes na tabela."""
+        return len(self._entries)
+
+    def refresh(self) -> List[ProcessInfo]:
+        """Atualiza a tabela com os processos em execução e retorna a lista atual.
+
+        Sempre cria novos objetos ProcessInfo, de modo que os objetos retornados em
+        ciclos anteriores (possivelmente em uso pela View) nunca são modificados.
+
+        Returns:
+            List[ProcessInfo]: Lista de processos ativos, sem o cálculo de percentuais.
+        """
+        # starttime conhecido de cada PID presente na tabela
+        known_starttimes: Dict[int, int] = {pid: start for pid, start in self._entries}
+
+        new_entries: Dict[ProcessKey, ProcessInfo] = {}
+        processes_list: List[ProcessInfo] = []
+        reused_count: int = 0
+
+        # Processos que terminaram durante a leitura não aparecem no resultado
+        scanned = self.scanner.scan(system_monitor.list_pids(), known_starttimes, self.profile)
+
+        for process_info in scanned:
+            pid = process_info.pid
+            key: ProcessKey = (pid, process_info.starttime_jiffies)
+            cached = self._entries.get(key)
+            if cached is not None:
+                # Mesmo processo do ciclo anterior: reaproveita os campos imutáveis
+                reused_count += 1
+                process_info.cmdline = cached.cmdline
+                if process_info.uid == -1 or process_info.uid == cached.uid:
+                    # UID inalterado, ou não relido (perfil sem a memória do status)
+                    process_info.uid = cached.uid
+                    process_info.user = cached.user
+                else:  # UID mudou (setuid): resolve o nome novamente
+                    process_info.user = system_monitor.get_username_from_uid(
+                        process_info.uid
+                    )
+
+            new_entries[key] = process_info
+            processes_list.append(process_info)
+
+        # Entradas que não foram vistas neste ciclo são descartadas (PID sumiu ou foi reutilizado)
+        self.last_evicted_count = sum(1 for key in self._entries if key not in new_entries)
+        self.last_reused_count = reused_count
+        self.last_new_count = len(processes_list) - reused_count
+        self._entries = new_entries
+
+        return processes_list
+
+    def clear(self) -> None:
+        """Remove todas as entradas, forçando uma coleta completa na próxima atualização."""
+        self._entries = {}
+
+    def close(self) -> None:
+        """Libera os recursos do scanner (pool de workers)."""
+        self.scanner.close()
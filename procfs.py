@@ -0,0 +1,358 @@
+# scr/procfs.py
+"""
+Leitura dos arquivos do /proc.
+
+Todas as leituras do coletor passam por estas funções, que leem o arquivo
+inteiro de uma vez e registram cada arquivo aberto e os bytes lidos nos
+contadores da etapa em andamento (ver collection_stats).
+
+As leituras usam os.open/os.read direto no descritor, sem objeto de arquivo
+do Python, em um buffer reaproveitado por thread; o resultado é sempre bytes,
+e os parsers trabalham em bytes. Os arquivos de um mesmo processo são lidos
+pelo ProcDir, que abre /proc/<pid> uma única vez e abre cada arquivo relativo
+a esse diretório (dir_fd), sem resolver o caminho inteiro a cada arquivo.
+
+Os arquivos globais relidos a cada ciclo (stat, meminfo, uptime, loadavg) podem
+ficar abertos em um PersistentFiles (set_persistent_files): cada leitura é um
+único os.pread no offset 0, que faz o kernel gerar o conteúdo de novo, em um
+buffer alocado uma vez por arquivo.
+
+A raiz do procfs é configurável (set_proc_root), o que permite coletar de uma
+árvore sintética (ver procfs_fixture) em vez do /proc da máquina. As leituras
+também podem ser gravadas (set_recorder) ou servidas por outra fonte no lugar do
+sistema de arquivos (set_source), como na gravação e reprodução de capturas
+(ver proc_capture). Nesses dois casos os caminhos são relativos à raiz.
+"""
+
+import errno
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
+
+import collection_stats
+
+if TYPE_CHECKING:
+    from proc_capture import CaptureRecorder, CaptureReplay
+
+DEFAULT_PROC_ROOT: str = "/proc"
+
+# Raiz usada por todas as leituras do processo atual
+_proc_root: str = DEFAULT_PROC_ROOT
+# Gravador que recebe o conteúdo de cada leitura (None = sem gravação)
+_recorder: Optional["CaptureRecorder"] = None
+# Fonte que substitui o sistema de arquivos e os relógios (None = /proc real)
+_source: Optional["CaptureReplay"] = None
+
+# Tamanho inicial do buffer de leitura (cresce se um arquivo não couber)
+_BUFFER_SIZE: int = 16384
+# Buffer de leitura de cada thread (os workers da varredura leem em paralelo)
+_buffers = threading.local()
+
+# Arquivos globais relidos a cada ciclo da coleta
+GLOBAL_FILES: Tuple[str, ...] = ("stat", "meminfo", "uptime", "loadavg")
+# Descritores mantidos abertos para os arquivos globais (None = abre a cada leitura)
+_persistent_files: Optional["PersistentFiles"] = None
+
+
+def get_proc_root() -> str:
+    """Retorna a raiz do procfs em uso."""
+    return _proc_root
+
+
+def set_proc_root(root: str) -> None:
+    """Define a raiz do procfs usada por todas as leituras deste processo.
+
+    Args:
+        root (str): Diretório com a estrutura do /proc (ex.: uma fixture sintética).
+
+    Raises:
+        ValueError: Se o diretório não existir.
+    """
+    global _proc_root
+    if not os.path.isdir(root):
+        raise ValueError(f"Raiz do procfs inválida (não é um diretório): {root}")
+    _proc_root = root.rstrip("/") or "/"
+
+
+def set_recorder(recorder: Optional["CaptureRecorder"]) -> None:
+    """Define o gravador que recebe cada leitura deste processo (None desativa)."""
+    global _recorder
+    _recorder = recorder
+
+
+def set_source(source: Optional["CaptureReplay"]) -> None:
+    """Define a fonte que substitui o sistema de arquivos e os relógios (None = /proc real)."""
+    global _source
+    _source = source
+
+
+def set_persistent_files(files: Optional["PersistentFiles"]) -> None:
+    """Define os descritores persistentes usados por read_global (None = abre a cada leitura)."""
+    global _persistent_files
+    _persistent_files = files
+
+
+def path(*parts: Union[int, str]) -> str:
+    """Monta um caminho dentro da raiz do procfs (ex.: path(pid, "stat"))."""
+    return "/".join([_proc_root, *map(str, parts)])
+
+
+def relative(path: str) -> str:
+    """Converte um caminho dentro da raiz em um caminho relativo (ex.: "1/stat")."""
+    if path.startswith(_proc_root):
+        return path[len(_proc_root):].strip("/")
+    return path
+
+
+def monotonic() -> float:
+    """Relógio monotônico da coleta (o da captura durante uma reprodução)."""
+    return _source.monotonic() if _source is not None else time.monotonic()
+
+
+def wall_time() -> float:
+    """Horário (epoch) da coleta (o da captura durante uma reprodução)."""
+    return _source.wall_time() if _source is not None else time.time()
+
+
+def _read_fd(fd: int) -> bytes:
+    """Lê um descritor até o fim no buffer da thread e retorna uma cópia do conteúdo."""
+    buffer = getattr(_buffers, "buffer", None)
+    if buffer is None:
+        buffer = _buffers.buffer = bytearray(_BUFFER_SIZE)
+    size = 0
+    while True:
+        if size == len(buffer):
+            buffer.extend(bytes(len(buffer)))  # Dobra o buffer (arquivos grandes, ex.: status)
+        with memoryview(buffer) as view:
+            n = os.readv(fd, [view[size:]])
+        if n == 0:
+            with memoryview(buffer) as view:
+                return bytes(view[:size])
+        size += n
+
+
+def _record_file(path: str, data: Optional[bytes], error: int = 0) -> None:
+    if _recorder is not None:
+        _recorder.record_file(relative(path), data, error)
+
+
+def read_bytes(path: str) -> bytes:
+    """Lê um arquivo inteiro como bytes.
+
+    Args:
+        path (str): Caminho do arquivo.
+
+    Returns:
+        bytes: Conteúdo do arquivo.
+
+    Raises:
+        OSError: Se o arquivo não puder ser aberto ou lido (ex.: FileNotFoundError
+            quando o processo terminou).
+    """
+    if _source is not None:
+        data = _source.read_bytes(relative(path))
+    else:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                data = _read_fd(fd)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            _record_file(path, None, e.errno or errno.EIO)
+            raise
+        _record_file(path, data)
+    collection_stats.count_file(len(data))
+    return data
+
+
+def read_global(name: str) -> bytes:
+    """Lê um arquivo da raiz do procfs (ex.: "stat"), pelo descritor persistente se houver.
+
+    Raises:
+        OSError: Se o arquivo não puder ser aberto ou lido.
+    """
+    files = _persistent_files
+    if files is not None and _source is None and name in files:
+        return files.read(name)
+    return read_bytes(path(name))
+
+
+def read_text(path: str) -> str:
+    """Lê um arquivo inteiro como texto (os arquivos do /proc são ASCII, salvo nomes)."""
+    return read_bytes(path).decode("utf-8", "replace")
+
+
+def list_dir(path: str) -> List[str]:
+    """Lista as entradas de um diretório do /proc."""
+    if _source is not None:
+        return _source.list_dir(relative(path))
+    try:
+        names = os.listdir(path)
+    except OSError as e:
+        if _recorder is not None:
+            _recorder.record_dir(relative(path), None, e.errno or errno.EIO)
+        raise
+    if _recorder is not None:
+        _recorder.record_dir(relative(path), names)
+    return names
+
+
+def is_dir(path: str) -> bool:
+    """Indica se o caminho existe e é um diretório."""
+    if _source is not None:
+        return _source.is_dir(relative(path))
+    result = os.path.isdir(path)
+    if _recorder is not None:
+        _recorder.record_is_dir(relative(path), result)
+    return result
+
+
+class ProcDir:
+    """Classe que mantém um diretório do /proc aberto e lê arquivos relativos a ele.
+
+    Uso:
+        with ProcDir(path(pid)) as proc_dir:
+            stat = proc_dir.read("stat")
+    """
+
+    __slots__ = ("path", "fd")
+
+    def __init__(self, dir_path: str) -> None:
+        """Abre o diretório (apenas registra o caminho durante uma reprodução).
+
+        Args:
+            dir_path (str): Caminho do diretório (ex.: path(pid)).
+
+        Raises:
+            OSError: Se o diretório não puder ser aberto (ex.: FileNotFoundError
+                quando o processo terminou).
+        """
+        self.path: str = dir_path
+        self.fd: Optional[int] = None
+        if _source is not None:
+            _source.open_dir(relative(dir_path))
+            return
+        try:
+            self.fd = os.open(dir_path, os.O_RDONLY | os.O_DIRECTORY)
+        except OSError as e:
+            if _recorder is not None:
+                _recorder.record_open_dir(relative(dir_path), e.errno or errno.EIO)
+            raise
+        if _recorder is not None:
+            _recorder.record_open_dir(relative(dir_path))
+
+    def read(self, name: str) -> bytes:
+        """Lê um arquivo do diretório (ex.: "stat" ou "<tid>/comm") como bytes.
+
+        Raises:
+            OSError: Se o arquivo não puder ser aberto ou lido (ex.: ProcessLookupError
+                quando o processo terminou depois de o diretório ser aberto).
+        """
+        file_path = f"{self.path}/{name}"
+        if self.fd is None:
+            return read_bytes(file_path)
+        try:
+            fd = os.open(name, os.O_RDONLY, dir_fd=self.fd)
+            try:
+                data = _read_fd(fd)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            _record_file(file_path, None, e.errno or errno.EIO)
+            raise
+        _record_file(file_path, data)
+        collection_stats.count_file(len(data))
+        return data
+
+    def list(self) -> List[str]:
+        """Lista as entradas do diretório."""
+        if self.fd is None:
+            return list_dir(self.path)
+        try:
+            names = os.listdir(self.fd)
+        except OSError as e:
+            if _recorder is not None:
+                _recorder.record_dir(relative(self.path), None, e.errno or errno.EIO)
+            raise
+        if _recorder is not None:
+            _recorder.record_dir(relative(self.path), names)
+        return names
+
+    def close(self) -> None:
+        """Fecha o descritor do diretório."""
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    def __enter__(self) -> "ProcDir":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class PersistentFiles:
+    """Classe que mantém abertos arquivos relidos a cada ciclo e os relê com os.pread.
+
+    Os descritores são abertos na primeira leitura de cada arquivo e ficam abertos
+    até close(). Cada arquivo tem seu buffer, alocado uma vez e dobrado apenas se
+    o conteúdo não couber nele.
+    """
+
+    def __init__(self, names: Tuple[str, ...] = GLOBAL_FILES, buffer_size: int = 8192) -> None:
+        """Inicializa sem abrir nenhum descritor.
+
+        Args:
+            names (Tuple[str, ...], optional): Arquivos da raiz do procfs mantidos abertos.
+            buffer_size (int, optional): Tamanho inicial do buffer de cada arquivo.
+        """
+        self.names: Tuple[str, ...] = names
+        self._fds: Dict[str, int] = {}
+        self._buffers: Dict[str, bytearray] = {name: bytearray(buffer_size) for name in names}
+        # Um lock por arquivo: o buffer é compartilhado entre as threads que o leem
+        self._locks: Dict[str, threading.Lock] = {name: threading.Lock() for name in names}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._buffers
+
+    def read(self, name: str) -> bytes:
+        """Relê o arquivo inteiro a partir do offset 0.
+
+        Args:
+            name (str): Nome do arquivo na raiz do procfs (ex.: "meminfo").
+
+        Returns:
+            bytes: Conteúdo atual do arquivo.
+
+        Raises:
+            OSError: Se o arquivo não puder ser aberto ou lido.
+        """
+        file_path = path(name)
+        with self._locks[name]:
+            try:
+                fd = self._fds.get(name)
+                if fd is None:
+                    fd = self._fds[name] = os.open(file_path, os.O_RDONLY)
+                buffer = self._buffers[name]
+                while True:
+                    n = os.preadv(fd, [buffer], 0)
+                    if n < len(buffer):
+                        break
+                    # O conteúdo pode ter sido cortado: dobra o buffer e relê do início
+                    buffer.extend(bytes(len(buffer)))
+                with memoryview(buffer) as view:
+                    data = bytes(view[:n])
+            except OSError as e:
+                _record_file(file_path, None, e.errno or errno.EIO)
+                raise
+        _record_file(file_path, data)
+        collection_stats.count_file(len(data))
+        return data
+
+    def close(self) -> None:
+        """Fecha todos os descritores abertos."""
+        for name in list(self._fds):
+            with self._locks[name]:
+                os.close(self._fds.pop(name))
@@ -0,0 +1,300 @@
+# scr/procfs_fixture.py
+"""
+Gerador de uma árvore /proc sintética para testes e benchmarks.
+
+Escreve os arquivos globais (stat, meminfo, uptime, loadavg) e, para cada PID,
+stat, status, statm, cmdline, comm e task/<tid>/{stat,comm}, no mesmo formato
+do kernel. A árvore é determinística (semente fixa) e inclui casos que o
+parser precisa tratar: nomes de comando com parênteses e espaços, threads do
+kernel (filhas do kthreadd, sem cmdline e sem campos Vm* no status) e
+processos com várias threads.
+
+A coleta é apontada para a árvore com procfs.set_proc_root(destino) ou com o
+parâmetro proc_root do SystemMonitorController.
+
+Uso:
+    python3 -m procfs_fixture DESTINO [--pids N] [--cores N] [--semente N]
+"""
+
+import argparse
+import os
+import random
+import sys
+from typing import List, Optional, Tuple, Union
+
+# Nomes de comando usados pelos processos comuns; alguns exercitam o parser do stat
+_COMMS: Tuple[str, ...] = (
+    "bash",
+    "python3",
+    "sshd",
+    "nginx",
+    "postgres",
+    "java",
+    "systemd-journal",
+    "(sd-pam)",
+    "tmux: server",
+    "my prog (1)",
+    "a) b (c",
+    "Web Content",
+    "node",
+)
+_KERNEL_COMMS: Tuple[str, ...] = ("kworker/0:1", "ksoftirqd/0", "rcu_sched", "migration/0")
+
+# Fração dos PIDs que são threads do kernel
+_KERNEL_THREAD_RATIO: float = 0.1
+_PAGE_KB: int = 4
+
+
+class FixtureProcess:
+    """Classe que descreve um processo sintético (os valores escritos nos arquivos)."""
+
+    __slots__ = (
+        "pid",
+        "ppid",
+        "comm",
+        "cmdline",
+        "state",
+        "uid",
+        "utime",
+        "stime",
+        "nice",
+        "starttime",
+        "vm_size_kb",
+        "vm_rss_kb",
+        "tids",
+        "kernel_thread",
+    )
+
+    def __init__(self, pid: int, rng: random.Random, uptime_jiffies: int) -> None:
+        """Sorteia os valores do processo.
+
+        Args:
+            pid (int): PID do processo.
+            rng (random.Random): Gerador de números (semente fixa).
+            uptime_jiffies (int): Uptime em jiffies (limite do starttime).
+        """
+        self.pid: int = pid
+        self.kernel_thread: bool = pid == 2 or (pid > 2 and rng.random() < _KERNEL_THREAD_RATIO)
+        self.state: str = rng.choice("SSSSSSRDI") if not self.kernel_thread else rng.choice("SI")
+        self.utime: int = rng.randint(0, 50000)
+        self.stime: int = rng.randint(0, 20000)
+        self.nice: int = rng.choice((0, 0, 0, 0, -20, 5, 19))
+        self.starttime: int = min(uptime_jiffies, pid * 3 + rng.randint(0, 50))
+        if self.kernel_thread:
+            self.ppid: int = 0 if pid == 2 else 2
+            self.comm: str = "kthreadd" if pid == 2 else rng.choice(_KERNEL_COMMS)
+            self.cmdline: bytes = b""  # Threads do kernel não têm linha de comando
+            self.uid: int = 0
+            self.vm_size_kb: int = 0
+            self.vm_rss_kb: int = 0
+            self.tids: List[int] = [pid]
+        else:
+            self.ppid = 0 if pid == 1 else 1
+            self.comm = rng.choice(_COMMS)
+            args = [f"/usr/bin/{self.comm}"] + [f"--opcao-{i}" for i in range(rng.randint(0, 6))]
+            self.cmdline = ("\0".join(args) + "\0").encode()
+            self.uid = rng.choice((0, 0, 1000, 1000, 1000, 33, 65534))
+            # Tamanhos múltiplos da página, para que statm e status descrevam o mesmo valor
+            self.vm_size_kb = rng.randint(2000, 4000000) // _PAGE_KB * _PAGE_KB
+            self.vm_rss_kb = rng.randint(100, max(100, self.vm_size_kb // 4)) // _PAGE_KB * _PAGE_KB
+            # A maioria dos processos tem uma thread; alguns têm muitas
+            extra = 0 if rng.random() < 0.7 else rng.randint(1, 15)
+            self.tids = [pid] + [pid * 100 + 10_000_000 + i for i in range(extra)]
+
+    def stat_line(self, comm: Optional[str] = None, pid: Optional[int] = None) -> str:
+        """Linha do /proc/<pid>/stat (ou task/<tid>/stat), com os 52 campos do kernel."""
+        rss_pages = self.vm_rss_kb // _PAGE_KB
+        fields = [
+            self.state, self.ppid, self.pid, self.pid, 0, -1, 4194560,  # estado .. flags
+            1000, 0, 10, 0,  # minflt, cminflt, majflt, cmajflt
+            self.utime, self.stime, 0, 0,  # utime, stime, cutime, cstime
+            20 + self.nice, self.nice, len(self.tids), 0,  # priority, nice, threads, itrealvalue
+            self.starttime, self.vm_size_kb * 1024, rss_pages, 18446744073709551615,
+        ] + [0] * 27  # Demais campos (sinais, wchan, exit_code, ...)
+        return f"{pid or self.pid} ({comm or self.comm}) " + " ".join(map(str, fields)) + "\n"
+
+    def status_text(self) -> str:
+        """Conteúdo do /proc/<pid>/status (sem linhas Vm* em threads do kernel)."""
+        lines = [
+            f"Name:\t{self.comm}",
+            "Umask:\t0022",
+            f"State:\t{self.state} (sleeping)",
+            f"Tgid:\t{self.pid}",
+            "Ngid:\t0",
+            f"Pid:\t{self.pid}",
+            f"PPid:\t{self.ppid}",
+            "TracerPid:\t0",
+            f"Uid:\t{self.uid}\t{self.uid}\t{self.uid}\t{self.uid}",
+            f"Gid:\t{self.uid}\t{self.uid}\t{self.uid}\t{self.uid}",
+            "FDSize:\t64",
+            "Groups:\t ",
+            f"NStgid:\t{self.pid}",
+            f"NSpid:\t{self.pid}",
+            f"NSpgid:\t{self.pid}",
+            f"NSsid:\t{self.pid}",
+            f"Kthread:\t{int(self.kernel_thread)}",
+        ]
+        if not self.kernel_thread:
+            size, rss = self.vm_size_kb, self.vm_rss_kb
+            for key, value in (
+                ("VmPeak", size + size // 10), ("VmSize", size), ("VmLck", 0), ("VmPin", 0),
+                ("VmHWM", rss + rss // 10), ("VmRSS", rss), ("RssAnon", rss * 2 // 3),
+                ("RssFile", rss // 3), ("RssShmem", rss - rss * 2 // 3 - rss // 3),
+                ("VmData", size // 3), ("VmStk", 132), ("VmExe", 1024), ("VmLib", size // 5),
+                ("VmPTE", 80), ("VmSwap", 0), ("HugetlbPages", 0),
+            ):
+                lines.append(f"{key}:\t{value:8d} kB")
+        lines += [
+            "CoreDumping:\t0",
+            "THP_enabled:\t1",
+            f"Threads:\t{len(self.tids)}",
+            "SigQ:\t0/31204",
+            "SigPnd:\t0000000000000000",
+            "ShdPnd:\t0000000000000000",
+            "SigBlk:\t0000000000000000",
+            "SigIgn:\t0000000000001000",
+            "SigCgt:\t0000000180004002",
+            "CapInh:\t0000000000000000",
+            "CapPrm:\t0000000000000000",
+            "CapEff:\t0000000000000000",
+            "CapBnd:\t000001ffffffffff",
+            "CapAmb:\t0000000000000000",
+            "NoNewPrivs:\t0",
+            "Seccomp:\t0",
+            "Seccomp_filters:\t0",
+            "Speculation_Store_Bypass:\tthread vulnerable",
+            "Cpus_allowed:\tff",
+            "Cpus_allowed_list:\t0-7",
+            "Mems_allowed:\t00000000,00000001",
+            "Mems_allowed_list:\t0",
+            "voluntary_ctxt_switches:\t150",
+            "nonvoluntary_ctxt_switches:\t7",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def statm_line(self) -> str:
+        """Linha do /proc/<pid>/statm (tamanhos em páginas)."""
+        size = self.vm_size_kb // _PAGE_KB
+        rss = self.vm_rss_kb // _PAGE_KB
+        return f"{size} {rss} {rss // 3} 256 0 {size // 3} 0\n"
+
+
+def _write(path: str, data: Union[str, bytes]) -> None:
+    with open(path, "wb") as f:
+        f.write(data.encode() if isinstance(data, str) else data)
+
+
+def write_global_files(root: str, cores: int, rng: random.Random, uptime_sec: float) -> None:
+    """Escreve stat, meminfo, uptime e loadavg na raiz da árvore."""
+    lines = []
+    per_core = [
+        [rng.randint(10000, 90000), rng.randint(0, 500), rng.randint(5000, 30000),
+         rng.randint(100000, 900000), rng.randint(0, 3000), 0, rng.randint(0, 900), 0, 0, 0]
+        for _ in range(cores)
+    ]
+    total = [sum(col) for col in zip(*per_core)]
+    lines.append("cpu  " + " ".join(map(str, total)))
+    lines += [f"cpu{i} " + " ".join(map(str, times)) for i, times in enumerate(per_core)]
+    lines.append("intr 1843960 " + " ".join(str(rng.randint(0, 5000)) for _ in range(300)))
+    lines += [
+        f"ctxt {rng.randint(10**6, 10**8)}",
+        "btime 1700000000",
+        f"processes {rng.randint(10**4, 10**6)}",
+        f"procs_running {rng.randint(1, cores)}",
+        f"procs_blocked {rng.randint(0, 3)}",
+        "softirq 931203 0 200 0 3000 0 0 100 500 0 9000",
+    ]
+    _write(os.path.join(root, "stat"), "\n".join(lines) + "\n")
+
+    total_kb = 16 * 1024 * 1024
+    free_kb = rng.randint(total_kb // 10, total_kb // 2)
+    meminfo = [
+        ("MemTotal", total_kb), ("MemFree", free_kb), ("MemAvailable", free_kb + total_kb // 10),
+        ("Buffers", 204800), ("Cached", 3145728), ("SwapCached", 0), ("Active", 4194304),
+        ("Inactive", 2097152), ("Active(anon)", 2097152), ("Inactive(anon)", 102400),
+        ("Active(file)", 2097152), ("Inactive(file)", 1994752), ("Unevictable", 0),
+        ("Mlocked", 0), ("SwapTotal", 4194304), ("SwapFree", 4000000), ("Dirty", 120),
+        ("Writeback", 0), ("AnonPages", 2199552), ("Mapped", 512000), ("Shmem", 65536),
+        ("KReclaimable", 300000), ("Slab", 500000), ("SReclaimable", 300000),
+        ("SUnreclaim", 200000), ("KernelStack", 16384), ("PageTables", 40960),
+        ("CommitLimit", 12582912), ("Committed_AS", 9000000), ("VmallocTotal", 34359738367),
+        ("VmallocUsed", 60000), ("HugePages_Total", 0), ("Hugepagesize", 2048),
+    ]
+    _write(
+        os.path.join(root, "meminfo"),
+        "".join(f"{key + ':':<16}{value:>8} kB\n" for key, value in meminfo),
+    )
+    _write(os.path.join(root, "uptime"), f"{uptime_sec:.2f} {uptime_sec * cores * 0.8:.2f}\n")
+    _write(os.path.join(root, "loadavg"), "0.52 0.58 0.59 2/1432 48211\n")
+
+
+def write_process(root: str, proc: FixtureProcess) -> None:
+    """Escreve o diretório /proc/<pid> de um processo e os de suas threads."""
+    base = os.path.join(root, str(proc.pid))
+    os.makedirs(os.path.join(base, "task"), exist_ok=True)
+    _write(os.path.join(base, "stat"), proc.stat_line())
+    _write(os.path.join(base, "status"), proc.status_text())
+    _write(os.path.join(base, "statm"), proc.statm_line())
+    _write(os.path.join(base, "cmdline"), proc.cmdline)
+    _write(os.path.join(base, "comm"), proc.comm + "\n")
+    for i, tid in enumerate(proc.tids):
+        task = os.path.join(base, "task", str(tid))
+        os.makedirs(task, exist_ok=True)
+        name = proc.comm if i == 0 else f"worker-{i}"
+        _write(os.path.join(task, "stat"), proc.stat_line(comm=name, pid=tid))
+        _write(os.path.join(task, "comm"), name + "\n")
+
+
+def generate(root: str, num_pids: int, cores: int = 8, seed: int = 1) -> List[FixtureProcess]:
+    """Gera a árvore sintética em `root` (criado se não existir).
+
+    Args:
+        root (str): Diretório de destino.
+        num_pids (int): Quantidade de processos (inclui o init e o kthreadd).
+        cores (int, optional): Núcleos descritos em /proc/stat.
+        seed (int, optional): Semente do gerador (a mesma semente gera a mesma árvore).
+
+    Returns:
+        List[FixtureProcess]: Processos escritos.
+
+    Raises:
+        ValueError: Se num_pids ou cores forem menores que 1.
+    """
+    if num_pids < 1 or cores < 1:
+        raise ValueError("num_pids e cores devem ser pelo menos 1.")
+    rng = random.Random(seed)
+    os.makedirs(root, exist_ok=True)
+    uptime_sec = 86400.0 * 3
+    write_global_files(root, cores, rng, uptime_sec)
+
+    # PIDs crescentes com lacunas, como em uma máquina em uso
+    processes: List[FixtureProcess] = []
+    pid = 0
+    for _ in range(num_pids):
+        pid += 1 if pid < 2 else rng.randint(1, 4)
+        proc = FixtureProcess(pid, rng, int(uptime_sec * 100))
+        write_process(root, proc)
+        processes.append(proc)
+    return processes
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("destino", help="Diretório onde a árvore será criada")
+    parser.add_argument("--pids", type=int, default=1000)
+    parser.add_argument(
+        "--cores",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Núcleos descritos em /proc/stat (padrão: os da máquina, para coletar com --proc-root)",
+    )
+    parser.add_argument("--semente", type=int, default=1)
+    args = parser.parse_args(argv)
+    processes = generate(args.destino, args.pids, args.cores, args.semente)
+    threads = sum(len(p.tids) for p in processes)
+    print(f"{len(processes)} processos e {threads} threads em {args.destino}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
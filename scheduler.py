@@ -0,0 +1,220 @@
+# scr/scheduler.py
+"""
+Agendador da coleta com intervalos independentes por coletor.
+
+Cada coletor (métricas globais, tabela de processos, ...) tem seu próprio
+intervalo. Os instantes de execução seguem uma grade fixa (início + k * intervalo),
+então as amostras não acumulam atraso; ticks perdidos porque a coleta demorou
+são pulados em vez de executados em sequência.
+
+O custo de cada coletor é medido em tempo de CPU da thread de coleta e suavizado
+por média móvel exponencial. Com um orçamento configurado (percentual de um núcleo),
+o agendador alonga o intervalo do coletor mais caro enquanto o custo estimado
+estiver acima do orçamento, e volta a encurtá-lo quando houver folga.
+"""
+
+import threading
+import time
+import traceback
+from typing import Callable, Dict, List, Optional, Sequence
+
+# Fator aplicado ao alongar (ou encurtar) o intervalo de um coletor
+STRETCH_STEP: float = 1.5
+# Os intervalos só voltam a encurtar quando o custo cai abaixo desta fração do orçamento
+RELAX_RATIO: float = 0.5
+
+
+class CollectionTask:
+    """Classe que representa um coletor periódico e o custo medido de suas execuções."""
+
+    __slots__ = ("name", "func", "interval_sec", "stretch", "next_due", "cost_sec", "runs")
+
+    def __init__(self, name: str, func: Callable[[], None], interval_sec: float) -> None:
+        """Inicializa o coletor.
+
+        Args:
+            name (str): Nome do coletor (ex.: "global", "processos").
+            func (Callable[[], None]): Função executada a cada tick do coletor.
+            interval_sec (float): Intervalo configurado em segundos.
+
+        Raises:
+            ValueError: Se o intervalo não for positivo.
+        """
+        if interval_sec <= 0:
+            raise ValueError(f"Intervalo inválido para o coletor '{name}': {interval_sec}")
+        self.name: str = name
+        self.func: Callable[[], None] = func
+        self.interval_sec: float = interval_sec
+        self.stretch: float = 1.0  # Multiplicador aplicado pelo orçamento de CPU
+        self.next_due: float = 0.0  # Próximo instante da grade (relógio monotônico)
+        self.cost_sec: float = 0.0  # Custo médio (tempo de CPU) por execução
+        self.runs: int = 0
+
+    @property
+    def effective_interval(self) -> float:
+        """Intervalo em uso (configurado * alongamento)."""
+        return self.interval_sec * self.stretch
+
+    def overhead(self) -> float:
+        """Fração de um núcleo consumida pelo coletor no intervalo em uso."""
+        return self.cost_sec / self.effective_interval
+
+
+class CollectionScheduler:
+    """Classe que executa os coletores em ticks de taxa fixa, respeitando um orçamento de CPU."""
+
+    def __init__(
+        self,
+        tasks: Sequence[CollectionTask],
+        on_tick: Optional[Callable[[List[str]], None]] = None,
+        cpu_budget_percent: Optional[float] = None,
+        max_stretch: float = 8.0,
+        smoothing: float = 0.3,
+        clock: Callable[[], float] = time.monotonic,
+        cost_clock: Callable[[], float] = time.thread_time,
+    ) -> None:
+        """Inicializa o agendador.
+
+        Args:
+            tasks (Sequence[CollectionTask]): Coletores, na ordem em que devem rodar
+                quando vencem no mesmo tick.
+            on_tick (Optional[Callable[[List[str]], None]], optional): Chamada uma vez por
+                tick, depois dos coletores, com os nomes dos que rodaram (ex.: publicar
+                um único snapshot por tick).
+            cpu_budget_percent (Optional[float], optional): Custo máximo da coleta em
+                percentual de um núcleo. Se omitido, os intervalos nunca são alterados.
+            max_stretch (float, optional): Maior multiplicador aplicado a um intervalo.
+            smoothing (float, optional): Peso da última medição na média do custo.
+            clock (Callable[[], float], optional): Relógio da grade de ticks.
+            cost_clock (Callable[[], float], optional): Relógio do custo. O padrão,
+                time.thread_time, não inclui o trabalho feito por workers de outras
+                threads ou processos.
+
+        Raises:
+            ValueError: Se o orçamento ou o multiplicador máximo forem inválidos.
+        """
+        if cpu_budget_percent is not None and cpu_budget_percent <= 0:
+            raise ValueError(f"Orçamento de CPU inválido: {cpu_budget_percent}")
+        if max_stretch < 1:
+            raise ValueError(f"max_stretch deve ser >= 1: {max_stretch}")
+        self.tasks: List[CollectionTask] = list(tasks)
+        self.on_tick: Optional[Callable[[List[str]], None]] = on_tick
+        self.cpu_budget_percent: Optional[float] = cpu_budget_percent
+        self.max_stretch: float = max_stretch
+        self.smoothing: float = smoothing
+        self._clock: Callable[[], float] = clock
+        self._cost_clock: Callable[[], float] = cost_clock
+        self._lock: threading.Lock = threading.Lock()  # Protege os custos lidos por stats()
+        self.reset()
+
+    def reset(self, start: Optional[float] = None) -> None:
+        """Reinicia a grade: cada coletor vence um intervalo depois de `start`."""
+        start = self._clock() if start is None else start
+        for task in self.tasks:
+            task.next_due = start + task.effective_interval
+
+    def next_wakeup(self) -> float:
+        """Instante (relógio do agendador) em que o próximo coletor vence."""
+        return min(task.next_due for task in self.tasks)
+
+    def overhead_percent(self) -> float:
+        """Custo estimado de todos os coletores, em percentual de um núcleo."""
+        return sum(task.overhead() for task in self.tasks) * 100.0
+
+    def run_pending(self, now: Optional[float] = None) -> List[str]:
+        """Executa os coletores vencidos e chama on_tick uma única vez.
+
+        Args:
+            now (Optional[float], optional): Instante atual (padrão: relógio do agendador).
+
+        Returns:
+            List[str]: Nomes dos coletores executados com sucesso.
+        """
+        now = self._clock() if now is None else now
+        ran: List[str] = []
+        for task in self.tasks:
+            if task.next_due > now:
+                continue
+            cost_start = self._cost_clock()
+            try:
+                task.func()
+            except Exception as e:
+                # Um coletor com erro não derruba a thread; os demais continuam
+                print(f"Erro no coletor '{task.name}': {e}")
+                traceback.print_exc()
+            else:
+                ran.append(task.name)
+            cost = self._cost_clock() - cost_start
+            with self._lock:
+                task.cost_sec = (
+                    cost if task.runs == 0
+                    else task.cost_sec + self.smoothing * (cost - task.cost_sec)
+                )
+                task.runs += 1
+            # Taxa fixa: avança pela grade e pula os ticks que já passaram
+            interval = task.effective_interval
+            task.next_due += interval
+            if task.next_due <= now:
+                task.next_due += (int((now - task.next_due) // interval) + 1) * interval
+
+        if ran and self.on_tick is not None:
+            try:
+                self.on_tick(ran)
+            except Exception as e:
+                # Uma falha na publicação (histórico, captura, snapshot) também não
+                # derruba a thread; o próximo tick publica normalmente
+                print(f"Erro ao publicar o tick {ran}: {e}")
+                traceback.print_exc()
+        self._apply_budget()
+        return ran
+
+    def _apply_budget(self) -> None:
+        """Alonga ou encurta um intervalo por tick conforme o orçamento de CPU."""
+        if self.cpu_budget_percent is None:
+            return
+        budget = self.cpu_budget_percent
+        total = self.overhead_percent()
+        with self._lock:
+            if total > budget:
+                # Acima do orçamento: alonga o coletor que mais consome
+                candidates = [t for t in self.tasks if t.stretch < self.max_stretch]
+                if candidates:
+                    task = max(candidates, key=CollectionTask.overhead)
+                    task.stretch = min(self.max_stretch, task.stretch * STRETCH_STEP)
+            elif total < budget * RELAX_RATIO:
+                # Folga: encurta o coletor mais alongado, se o custo previsto couber
+                candidates = [t for t in self.tasks if t.stretch > 1.0]
+                if candidates:
+                    task = max(candidates, key=lambda t: t.stretch)
+                    stretch = max(1.0, task.stretch / STRETCH_STEP)
+                    predicted = total - task.overhead() * 100.0
+                    predicted += task.cost_sec / (task.interval_sec * stretch) * 100.0
+                    if predicted <= budget:
+                        task.stretch = stretch
+
+    def run(self, stop_event: threading.Event) -> None:
+        """Executa os coletores na thread atual até que `stop_event` seja sinalizado."""
+        while not stop_event.is_set():
+            delay = self.next_wakeup() - self._clock()
+            # Espera pelo evento para que a parada interrompa a espera imediatamente
+            if delay > 0 and stop_event.wait(timeout=delay):
+                break
+            self.run_pending()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Retorna, por coletor, o intervalo configurado, o intervalo em uso e o custo médio.
+
+        Returns:
+            Dict[str, Dict[str, float]]: {nome: {"interval_sec", "effective_interval_sec",
+                "cost_ms", "overhead_percent"}}.
+        """
+        with self._lock:
+            return {
+                task.name: {
+                    "interval_sec": task.interval_sec,
+                    "effective_interval_sec": task.effective_interval,
+                    "cost_ms": task.cost_sec * 1000.0,
+                    "overhead_percent": task.overhead() * 100.0,
+                }
+                for task in self.tasks
+            }
@@ -0,0 +1,221 @@
+# scr/system_constants.py
+"""
+Módulo responsável por resolver as constantes do sistema que não mudam
+durante a execução do processo (clock ticks, número de cores e tamanho de página).
+
+Os valores são obtidos uma única vez via os.sysconf, com um fallback de sondagem
+em /proc e /sys quando o sysconf não estiver disponível, e depois reutilizados
+por todas as instâncias de SystemGlobalInfo.
+"""
+
+import os
+import struct
+import threading
+from typing import Optional
+
+# Valor do tipo AT_CLKTCK no vetor auxiliar (/proc/self/auxv) do kernel Linux
+_AT_CLKTCK: int = 17
+# Valor padrão de HZ do espaço de usuário em praticamente todas as arquiteturas
+_DEFAULT_CLOCK_TICKS: int = 100
+_DEFAULT_PAGE_SIZE: int = 4096
+
+
+class SystemConstants:
+    """Classe para armazenar constantes do sistema resolvidas uma única vez."""
+
+    def __init__(
+        self,
+        clock_ticks: int,
+        num_cores_online: int,
+        num_cores_possible: int,
+        page_size: int,
+    ) -> None:
+        """Inicializa um objeto SystemConstants com os valores já resolvidos.
+
+        Args:
+            clock_ticks (int): Clock ticks por segundo (HZ do espaço de usuário).
+            num_cores_online (int): Número de núcleos de CPU online.
+            num_cores_possible (int): Número de núcleos que o kernel pode ativar.
+            page_size (int): Tamanho da página de memória em bytes.
+        """
+        self.clock_ticks: int = clock_ticks  # Jiffies por segundo (HZ)
+        self.num_cores_online: int = num_cores_online  # Cores atualmente online
+        self.num_cores_possible: int = num_cores_possible  # Cores possíveis (hotplug)
+        self.page_size: int = page_size  # Tamanho da página em bytes
+
+    def __repr__(self) -> str:
+        """Retorna uma representação em string do objeto SystemConstants.
+
+        Returns:
+            str: Representação formatada das constantes.
+        """
+        return (
+            f"<SystemConstants HZ:{self.clock_ticks} Online:{self.num_cores_online} "
+            f"Possible:{self.num_cores_possible} PageSize:{self.page_size}>"
+        )
+
+
+# --- Funções auxiliares de sondagem (fallback) ---
+
+
+def _sysconf(name: str) -> int:
+    """Consulta os.sysconf e retorna -1 se o nome não existir ou falhar.
+
+    Args:
+        name (str): Nome da variável do sysconf (ex: "SC_CLK_TCK").
+
+    Returns:
+        int: Valor retornado pelo sysconf ou -1 em caso de erro.
+    """
+    try:
+        if name in os.sysconf_names:
+            return int(os.sysconf(name))
+    except (ValueError, OSError):
+        pass
+    return -1
+
+
+def _probe_clock_ticks_from_auxv() -> int:
+    """Lê o valor de AT_CLKTCK do vetor auxiliar em /proc/self/auxv.
+
+    O vetor auxiliar é uma sequência de pares (tipo, valor) de inteiros sem sinal
+    com o tamanho da palavra nativa, terminada pelo tipo AT_NULL (0).
+
+    Returns:
+        int: Clock ticks por segundo ou -1 se não for possível obter.
+    """
+    # 'L' (unsigned long) tem o tamanho da palavra nativa no Linux
+    pair_format = "@LL"
+    pair_size = struct.calcsize(pair_format)
+    try:
+        with open("/proc/self/auxv", "rb") as f:
+            raw = f.read()
+    except OSError:
+        return -1
+
+    for offset in range(0, len(raw) - pair_size + 1, pair_size):
+        a_type, a_val = struct.unpack_from(pair_format, raw, offset)
+        if a_type == 0:  # AT_NULL: fim do vetor
+            break
+        if a_type == _AT_CLKTCK:
+            return int(a_val)
+    return -1
+
+
+def _count_cpu_list(path: str) -> int:
+    """Conta os cores descritos em uma lista de faixas do sysfs (ex: "0-3,8-11").
+
+    Args:
+        path (str): Caminho do arquivo (ex: /sys/devices/system/cpu/online).
+
+    Returns:
+        int: Quantidade de cores descritos ou -1 em caso de erro.
+    """
+    try:
+        with open(path, "r") as f:
+            content = f.read().strip()
+    except OSError:
+        return -1
+
+    total = 0
+    try:
+        for part in content.split(","):
+            if not part:
+                continue
+            if "-" in part:
+                first, last = part.split("-", 1)
+                total += int(last) - int(first) + 1
+            else:
+                int(part)  # Valida o número do core
+                total += 1
+    except ValueError:
+        return -1
+    return total if total > 0 else -1
+
+
+def _count_cpuinfo_processors() -> int:
+    """Conta as linhas 'processor' de /proc/cpuinfo (método usado originalmente).
+
+    Returns:
+        int: Quantidade de processadores listados ou -1 em caso de erro.
+    """
+    try:
+        with open("/proc/cpuinfo", "r") as f:
+            count = sum(1 for line in f if line.startswith("processor"))
+    except OSError:
+        return -1
+    return count if count > 0 else -1
+
+
+def probe_system_constants() -> SystemConstants:
+    """Resolve as constantes do sistema sem usar cache.
+
+    Cada valor é obtido primeiro pelo os.sysconf; se não estiver disponível,
+    utiliza uma sondagem alternativa em /proc ou /sys e, por último, um valor padrão.
+
+    Returns:
+        SystemConstants: Constantes resolvidas.
+    """
+    # 1. Clock ticks por segundo (HZ)
+    clock_ticks = _sysconf("SC_CLK_TCK")
+    if clock_ticks <= 0:
+        clock_ticks = _probe_clock_ticks_from_auxv()
+    if clock_ticks <= 0:
+        print(
+            f"Aviso: Não foi possível obter HZ do sistema, usando {_DEFAULT_CLOCK_TICKS}."
+        )
+        clock_ticks = _DEFAULT_CLOCK_TICKS
+
+    # 2. Cores online (mesma contagem das linhas 'cpuN' do /proc/stat)
+    num_cores_online = _sysconf("SC_NPROCESSORS_ONLN")
+    if num_cores_online <= 0:
+        num_cores_online = _count_cpu_list("/sys/devices/system/cpu/online")
+    if num_cores_online <= 0:
+        num_cores_online = _count_cpuinfo_processors()
+    if num_cores_online <= 0:
+        num_cores_online = 1
+
+    # 3. Cores possíveis (inclui cores offline que podem ser ativados por hotplug)
+    num_cores_possible = _count_cpu_list("/sys/devices/system/cpu/possible")
+    if num_cores_possible <= 0:
+        num_cores_possible = _sysconf("SC_NPROCESSORS_CONF")
+    if num_cores_possible < num_cores_online:
+        num_cores_possible = num_cores_online
+
+    # 4. Tamanho da página de memória
+    page_size = _sysconf("SC_PAGE_SIZE")
+    if page_size <= 0:
+        try:
+            import resource
+
+            page_size = resource.getpagesize()
+        except (ImportError, OSError):
+            page_size = _DEFAULT_PAGE_SIZE
+
+    return SystemConstants(
+        clock_ticks=clock_ticks,
+        num_cores_online=num_cores_online,
+        num_cores_possible=num_cores_possible,
+        page_size=page_size,
+    )
+
+
+# --- Provedor global (resolvido uma única vez por processo) ---
+
+_constants_lock: threading.Lock = threading.Lock()
+_cached_constants: Optional[SystemConstants] = None
+
+
+def get_system_constants() -> SystemConstants:
+    """Retorna as constantes do sistema, resolvendo-as apenas na primeira chamada.
+
+    Returns:
+        SystemConstants: Instância compartilhada por todo o processo.
+    """
+    global _cached_constants
+    if _cached_constants is None:
+        with _constants_lock:
+            # Verifica novamente dentro do lock para evitar sondagens duplicadas
+            if _cached_constants is None:
+                _cached_constants = probe_system_constants()
+    return _cached_constants
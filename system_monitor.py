@@ -4,19 +4,75 @@ Módulo responsável pela coleta de dados do sistema operacional Linux.
 Atua como uma camada de abstração para ler e processar informações do sistema de arquivos /proc.
 """
 
-import os
-from typing import Dict, List, Tuple, Optional
+import time
+from typing import Dict, FrozenSet, List, Tuple, Optional
 
 # Importação dos modelos de dados utilizados pelo monitor
 from data_model import (
+    CpuCounterFrame,
     ProcessInfo,
     ThreadInfo,
     SystemGlobalInfo,
 )
+from system_constants import get_system_constants
+from user_resolver import get_default_resolver
+import collection_stats
+import procfs
 
 # --- Funções de Coleta de Dados de CPU ---
 
 
+def read_proc_stat() -> Optional[CpuCounterFrame]:
+    """Lê /proc/stat em uma única passagem e retorna todos os contadores de CPU.
+
+    Além das linhas 'cpu' (global) e 'cpuN' (por core), também são lidos os
+    contadores do escalonador: ctxt, intr, processes, procs_running, procs_blocked e btime.
+
+    Returns:
+        Optional[CpuCounterFrame]: Frame com os contadores lidos, ou None em caso de erro.
+    """
+    frame = CpuCounterFrame()
+
+    try:
+        # Uma única leitura do arquivo inteiro (pelo descritor persistente, se houver)
+        content = procfs.read_global("stat")
+        frame.timestamp = procfs.monotonic()  # Relógio da captura durante uma reprodução
+
+        for line in content.splitlines():
+            if line.startswith(b"intr "):
+                # O primeiro valor é o total; as contagens por IRQ (centenas) nem são separadas
+                frame.intr_total = int(line.split(None, 2)[1])
+                continue
+            parts = line.split()
+            if not parts:
+                continue
+            key = parts[0]
+
+            if key.startswith(b"cpu"):
+                # Coleta os 8 campos de tempo: user, nice, system, idle, iowait, irq, softirq, steal
+                times = [int(p) for p in parts[1:9]]
+                if key == b"cpu":
+                    frame.cpu_total = times
+                elif key[3:].isdigit():
+                    frame.cpu_cores[int(key[3:])] = times
+            elif key == b"ctxt":
+                frame.ctxt = int(parts[1])
+            elif key == b"processes":
+                frame.processes = int(parts[1])
+            elif key == b"procs_running":
+                frame.procs_running = int(parts[1])
+            elif key == b"procs_blocked":
+                frame.procs_blocked = int(parts[1])
+            elif key == b"btime":
+                frame.btime = int(parts[1])
+    except (FileNotFoundError, IndexError, ValueError) as e:
+        # Registra erro para ajudar na depuração de problemas
+        print(f"Aviso: Erro ao ler /proc/stat: {e}")
+        return None
+
+    return frame
+
+
 def get_cpu_times_global() -> List[int]:
     """Lê a primeira linha 'cpu' do /proc/stat e retorna os tempos em jiffies.
 
@@ -27,23 +83,8 @@ def get_cpu_times_global() -> List[int]:
                   [user, nice, system, idle, iowait, irq, softirq, steal]
                   ou lista vazia em caso de erro.
     """
-    try:
-        with open("/proc/stat", "r") as f:
-            # Lê a primeira linha que contém os dados de CPU agregados
-            line = f.readline()
-            parts = line.split()
-
-            # Verifica se a linha começa com "cpu" (formato esperado)
-            if parts[0] == "cpu":
-                # Retorna os primeiros 8 campos numéricos após "cpu"
-                # Estes representam: user, nice, system, idle, iowait, irq, softirq, steal
-                return [int(p) for p in parts[1:9]]
-    except (FileNotFoundError, IndexError, ValueError) as e:
-        # Registra erro para ajudar na depuração de problemas
-        print(f"Aviso: Erro ao ler /proc/stat para tempos de CPU global: {e}")
-        return []  # Retorna lista vazia em caso de erro
-
-    return []  # Retorna lista vazia se o formato não for o esperado
+    frame = read_proc_stat()
+    return frame.cpu_total if frame else []
 
 
 def get_cpu_times_per_core() -> List[List[int]]:
@@ -55,21 +96,8 @@ def get_cpu_times_per_core() -> List[List[int]]:
         List[List[int]]: Lista de listas, onde cada lista interna contém os tempos
                         de um núcleo de CPU no mesmo formato que get_cpu_times_global().
     """
-    core_times_list: List[List[int]] = []
-
-    try:
-        with open("/proc/stat", "r") as f:
-            for line in f:
-                parts = line.split()
-                # Identifica linhas que começam com "cpuN" onde N é um número
-                if parts and parts[0].startswith("cpu") and parts[0][3:].isdigit():
-                    # Coleta os 8 campos de tempo para este core
-                    core_times_list.append([int(p) for p in parts[1:9]])
-    except (FileNotFoundError, IndexError, ValueError) as e:
-        print(f"Aviso: Erro ao ler /proc/stat para tempos de CPU por core: {e}")
-        return []  # Retorna lista vazia em caso de erro
-
-    return core_times_list
+    frame = read_proc_stat()
+    return frame.cores_as_list() if frame else []
 
 
 # --- Funções de Coleta de Dados de Memória ---
@@ -88,16 +116,15 @@ def get_mem_info_dict() -> Dict[str, int]:
     mem_info: Dict[str, int] = {}
 
     try:
-        with open("/proc/meminfo", "r") as f:
-            for line in f:
-                # Divide cada linha em nome e valor (formato "MemTotal: 8192 kB")
-                parts = line.split(":")
-                if len(parts) == 2:
-                    key = parts[0].strip()  # Nome do campo (ex: "MemTotal")
-                    value_part = parts[1].strip().split()  # Ex: ["8192", "kB"]
-                    # Converte o primeiro valor para inteiro se for um número
-                    if value_part and value_part[0].isdigit():
-                        mem_info[key] = int(value_part[0])
+        for line in procfs.read_global("meminfo").decode("ascii", "replace").splitlines():
+            # Divide cada linha em nome e valor (formato "MemTotal: 8192 kB")
+            parts = line.split(":")
+            if len(parts) == 2:
+                key = parts[0].strip()  # Nome do campo (ex: "MemTotal")
+                value_part = parts[1].strip().split()  # Ex: ["8192", "kB"]
+                # Converte o primeiro valor para inteiro se for um número
+                if value_part and value_part[0].isdigit():
+                    mem_info[key] = int(value_part[0])
     except FileNotFoundError:
         print("Aviso: /proc/meminfo não encontrado.")
         return {}
@@ -122,11 +149,10 @@ def get_uptime() -> float:
         float: Uptime do sistema em segundos ou -1 em caso de erro.
     """
     try:
-        with open("/proc/uptime", "r") as f:
-            # O arquivo contém dois números: uptime e tempo ocioso acumulado
-            parts = f.readline().split()
-            # Retorna o primeiro número (uptime)
-            return float(parts[0])
+        # O arquivo contém dois números: uptime e tempo ocioso acumulado
+        parts = procfs.read_global("uptime").split()
+        # Retorna o primeiro número (uptime)
+        return float(parts[0])
     except FileNotFoundError:
         print("Aviso: /proc/uptime não encontrado.")
         return -1.0
@@ -147,11 +173,10 @@ def get_load_average() -> Tuple[float, float, float]:
                                     ou (-1, -1, -1) em caso de erro.
     """
     try:
-        with open("/proc/loadavg", "r") as f:
-            # O formato é "0.00 0.01 0.05 1/109 7389"
-            parts = f.readline().split()
-            # Retorna os três primeiros valores convertidos para float
-            return (float(parts[0]), float(parts[1]), float(parts[2]))
+        # O formato é "0.00 0.01 0.05 1/109 7389"
+        parts = procfs.read_global("loadavg").split()
+        # Retorna os três primeiros valores convertidos para float
+        return (float(parts[0]), float(parts[1]), float(parts[2]))
     except FileNotFoundError:
         print("Aviso: /proc/loadavg não encontrado.")
         return (-1.0, -1.0, -1.0)
@@ -163,50 +188,159 @@ def get_load_average() -> Tuple[float, float, float]:
 # --- Funções de Coleta de Dados de Processos ---
 
 
-def get_process_details(pid: int) -> Optional[ProcessInfo]:
+# Campos de memória do /proc/[pid]/status (todos em KB) e o atributo de ProcessInfo de cada um
+_STATUS_MEMORY_FIELDS: Dict[bytes, str] = {
+    b"VmPeak": "vm_peak_kb",  # Pico de memória virtual
+    b"VmSize": "vm_size_kb",
+    b"VmLck": "vm_lck_kb",
+    b"VmPin": "vm_pin_kb",
+    b"VmHWM": "vm_hwm_kb",  # Pico de memória residente
+    b"VmRSS": "vm_rss_kb",
+    b"RssAnon": "rss_anon_kb",
+    b"RssFile": "rss_file_kb",
+    b"RssShmem": "rss_shmem_kb",
+    b"VmData": "vm_data_kb",
+    b"VmStk": "vm_stk_kb",
+    b"VmExe": "vm_exe_kb",
+    b"VmLib": "vm_lib_kb",
+    b"VmPTE": "vm_pte_kb",
+    b"VmSwap": "vm_swap_kb",
+}
+
+# --- Perfis de Coleta ---
+
+# Campos de ProcessInfo lidos de /proc/[pid]/stat. O stat é lido em todos os perfis,
+# pois o starttime identifica o processo entre ciclos (ver ProcessTable)
+_STAT_FIELDS: FrozenSet[str] = frozenset(
+    (
+        "comm",
+        "state",
+        "ppid",
+        "utime",
+        "stime",
+        "priority",
+        "nice",
+        "num_threads",
+        "starttime_jiffies",
+    )
+)
+
+# Campos de memória que também estão em /proc/[pid]/statm (uma linha de números, em
+# páginas), bem mais barato de gerar no kernel e de parsear que o status
+_STATM_FIELDS: FrozenSet[str] = frozenset(("vm_size_kb", "vm_rss_kb"))
+
+# Campos que o usuário e a linha de comando exigem (lidos apenas para processos novos)
+_IDENTITY_FIELDS: FrozenSet[str] = frozenset(("uid", "user", "cmdline"))
+
+# Campos necessários em cada perfil de coleta:
+# - "minimal": %CPU, %MEM, estado e threads (apenas stat e statm);
+# - "table": colunas da lista de processos (minimal + usuário e cmdline);
+# - "full": todos os campos, incluindo a memória detalhada do status.
+COLLECTION_PROFILES: Dict[str, FrozenSet[str]] = {
+    "minimal": _STAT_FIELDS | _STATM_FIELDS,
+    "table": _STAT_FIELDS | _STATM_FIELDS | _IDENTITY_FIELDS,
+    "full": _STAT_FIELDS | _IDENTITY_FIELDS | frozenset(_STATUS_MEMORY_FIELDS.values()),
+}
+
+
+def _plan_reads(fields: FrozenSet[str]) -> Tuple[bool, bool, bool, bool]:
+    """Escolhe a fonte mais barata em /proc/[pid] para cada um dos campos pedidos.
+
+    Args:
+        fields (FrozenSet[str]): Atributos de ProcessInfo necessários.
+
+    Returns:
+        Tuple[bool, bool, bool, bool]: Se devem ser lidos o statm, a memória do status,
+            o UID (do status) e o cmdline.
+    """
+    status_memory = not fields.isdisjoint(
+        set(_STATUS_MEMORY_FIELDS.values()) - _STATM_FIELDS
+    )
+    # O status já traz VmSize e VmRSS quando é lido para os demais campos de memória
+    statm = not status_memory and not fields.isdisjoint(_STATM_FIELDS)
+    uid = "uid" in fields or "user" in fields
+    return statm, status_memory, uid, "cmdline" in fields
+
+
+# Arquivos lidos em cada perfil, calculados uma única vez
+_PROFILE_READS: Dict[str, Tuple[bool, bool, bool, bool]] = {
+    name: _plan_reads(fields) for name, fields in COLLECTION_PROFILES.items()
+}
+
+
+def get_process_details(
+    pid: int, known_starttime: Optional[int] = None, profile: str = "full"
+) -> Optional[ProcessInfo]:
     """Coleta detalhes de um processo específico a partir do sistema de arquivos /proc.
 
     Lê múltiplos arquivos em /proc/[pid]/ para obter informações completas sobre um processo:
     - /proc/[pid]/stat: Status do processo, tempos de CPU, etc.
+    - /proc/[pid]/statm: Tamanho e RSS, quando o perfil não precisa do status.
     - /proc/[pid]/status: Informações detalhadas incluindo uso de memória.
     - /proc/[pid]/cmdline: Linha de comando completa do processo.
 
+    O perfil de coleta (ver COLLECTION_PROFILES) define quais campos são necessários;
+    arquivos que não fornecem nenhum deles não são lidos e os campos fora do perfil
+    ficam com o valor padrão.
+
+    O diretório /proc/[pid] é aberto uma única vez (procfs.ProcDir) e os arquivos são
+    lidos e parseados como bytes; só os campos de texto (comm e cmdline) são decodificados.
+
+    Se known_starttime for igual ao starttime lido do stat, o processo já é conhecido
+    (mesmo PID e mesmo início, ou seja, não houve reuso do PID). Nesse caso os campos
+    imutáveis (cmdline e user) não são lidos e ficam vazios, para serem preenchidos
+    pelo cache de quem chamou (ver ProcessTable).
+
     Args:
         pid (int): ID do processo a ser analisado.
+        known_starttime (Optional[int], optional): starttime (em jiffies) já conhecido
+            para este PID, ou None para uma coleta completa.
+        profile (str, optional): "minimal", "table" ou "full". Padrão é "full".
 
     Returns:
         Optional[ProcessInfo]: Objeto ProcessInfo populado com os dados do processo,
                               ou None se o processo não existe ou ocorreu erro.
+
+    Raises:
+        ValueError: Se o perfil de coleta não existir.
     """
+    reads = _PROFILE_READS.get(profile)
+    if reads is None:
+        raise ValueError(
+            f"Perfil de coleta inválido: '{profile}'. Use um de {tuple(COLLECTION_PROFILES)}."
+        )
+    read_statm, read_status_memory, read_uid, read_cmdline = reads
+
     # Variáveis para debugging e registro de erros
-    line_content_stat: str = ""
-    line_content_status: str = ""
+    line_content_stat: bytes = b""
+    line_content_status: bytes = b""
     stat_fields_for_log: list = []
 
     try:
         # Cria a instância para armazenar os dados do processo
         process_info = ProcessInfo(pid)
 
-        # --- 1. Lendo e parseando /proc/[pid]/stat ---
-        with open(f"/proc/{pid}/stat", "r") as f_stat:
-            line_content_stat = f_stat.read()  # Lê a linha inteira do arquivo
+        with procfs.ProcDir(procfs.path(pid)) as proc_dir:
+            # --- 1. Lendo e parseando /proc/[pid]/stat ---
+            line_content_stat = proc_dir.read("stat")  # Lê a linha inteira do arquivo
 
             # O parsing é complexo pois o nome do comando (comm) pode conter parênteses
             try:
                 # Localiza os parênteses que delimitam o nome do comando
-                first_paren = line_content_stat.index("(")
-                last_paren = line_content_stat.rindex(")")
+                first_paren = line_content_stat.index(b"(")
+                last_paren = line_content_stat.rindex(b")")
             except ValueError:
                 raise ValueError(
                     "Formato de /proc/[pid]/stat inválido, 'comm' não encontrado."
                 )
 
             # Extrai o nome do comando (comm) de dentro dos parênteses
-            process_info.comm = line_content_stat[first_paren + 1 : last_paren]
+            process_info.comm = line_content_stat[first_paren + 1 : last_paren].decode(
+                "utf-8", "replace"
+            )
 
             # O restante dos campos vem após o último parêntese, separados por espaço
-            remaining_stat_str = line_content_stat[last_paren + 1 :].strip()
-            stat_fields = remaining_stat_str.split()
+            stat_fields = line_content_stat[last_paren + 1 :].split()
             stat_fields_for_log = stat_fields  # Para registro em caso de erro
 
             # Verifica se há campos suficientes conforme a estrutura do arquivo
@@ -216,9 +350,7 @@ def get_process_details(pid: int) -> Optional[ProcessInfo]:
                 )
 
             # Extrai e atribui os valores dos campos conforme documentação do /proc/[pid]/stat
-            process_info.state = stat_fields[
-                0
-            ]  # Estado do processo (R=running, S=sleeping, etc.)
+            process_info.state = stat_fields[0].decode()  # Estado (R=running, S=sleeping, etc.)
             process_info.ppid = int(stat_fields[1])  # PID do processo pai
 
             # Campos de tempo de CPU em jiffies
@@ -235,80 +367,58 @@ def get_process_details(pid: int) -> Optional[ProcessInfo]:
             # Tempo de início do processo (em jiffies desde o boot)
             process_info.starttime_jiffies = int(stat_fields[19])
 
-        # --- 2. Lendo e parseando /proc/[pid]/status ---
-        uid_val: int = -1  # UID padrão caso não seja encontrado
-        with open(f"/proc/{pid}/status", "r") as f_status_file:
-            for line_content_status in f_status_file:
-                line = line_content_status.strip()
-                if not line:  # Pula linhas vazias
-                    continue
-
-                # Divide a linha em chave e valor (formato "Chave: Valor")
-                parts = line.split(":", 1)
-                if len(parts) != 2:
-                    continue
+            # Processo já conhecido: cmdline e usuário vêm do cache de quem chamou
+            is_known_process: bool = (
+                known_starttime is not None
+                and process_info.starttime_jiffies == known_starttime
+            )
 
-                key = parts[0].strip()  # Nome do campo (ex: "Uid", "VmRSS")
-                value_str = parts[1].strip()  # Valor como string
-                val_parts = value_str.split()  # Divide em tokens (ex: ["1234", "kB"])
-
-                # Extrai o valor numérico dos campos relevantes
-                current_field_int_val: int = 0
-                if val_parts and val_parts[0].isdigit():
-                    try:
-                        current_field_int_val = int(val_parts[0])
-                    except ValueError:
-                        current_field_int_val = 0
-
-                # Processa os diferentes tipos de campos conforme suas chaves
-                if key == "Uid":
-                    # Extrai o UID real do processo (primeiro valor)
-                    if val_parts and val_parts[0].isdigit():
-                        try:
+            # --- 2. Lendo /proc/[pid]/statm (tamanho e RSS em páginas) ---
+            if read_statm:
+                statm_fields = proc_dir.read("statm").split()
+                page_kb = get_system_constants().page_size // 1024
+                process_info.vm_size_kb = int(statm_fields[0]) * page_kb
+                process_info.vm_rss_kb = int(statm_fields[1]) * page_kb
+
+            # --- 3. Lendo e parseando /proc/[pid]/status ---
+            # Sem a memória detalhada, o status só é lido para obter o UID de processos novos
+            read_uid = read_uid and (read_status_memory or not is_known_process)
+            uid_val: int = -1  # UID padrão caso não seja encontrado
+            if read_status_memory or read_uid:
+                for line_content_status in proc_dir.read("status").splitlines():
+                    # Divide a linha em chave e valor (formato "Chave:\tValor")
+                    key, sep, value = line_content_status.partition(b":")
+                    if not sep:
+                        continue
+                    if key == b"Uid":
+                        # Extrai o UID real do processo (primeiro valor)
+                        val_parts = value.split()
+                        if val_parts and val_parts[0].isdigit():
                             uid_val = int(val_parts[0])
                             process_info.uid = uid_val
-                        except ValueError:
-                            pass
-                # Campos de memória (todos em KB)
-                elif key == "VmPeak":
-                    process_info.vm_peak_kb = current_field_int_val
-                elif key == "VmSize":
-                    process_info.vm_size_kb = current_field_int_val
-                elif key == "VmLck":
-                    process_info.vm_lck_kb = current_field_int_val
-                elif key == "VmPin":
-                    process_info.vm_pin_kb = current_field_int_val
-                elif key == "VmHWM":
-                    process_info.vm_hwm_kb = current_field_int_val
-                elif key == "VmRSS":
-                    process_info.vm_rss_kb = current_field_int_val
-                elif key == "RssAnon":
-                    process_info.rss_anon_kb = current_field_int_val
-                elif key == "RssFile":
-                    process_info.rss_file_kb = current_field_int_val
-                elif key == "RssShmem":
-                    process_info.rss_shmem_kb = current_field_int_val
-                elif key == "VmData":
-                    process_info.vm_data_kb = current_field_int_val
-                elif key == "VmStk":
-                    process_info.vm_stk_kb = current_field_int_val
-                elif key == "VmExe":
-                    process_info.vm_exe_kb = current_field_int_val
-                elif key == "VmLib":
-                    process_info.vm_lib_kb = current_field_int_val
-                elif key == "VmPTE":
-                    process_info.vm_pte_kb = current_field_int_val
-                elif key == "VmSwap":
-                    process_info.vm_swap_kb = current_field_int_val
-
-        # Obtém o nome de usuário a partir do UID
-        process_info.user = get_username_from_uid(uid_val)
-
-        # --- 3. Lendo /proc/[pid]/cmdline ---
-        try:
-            # Lê como binário já que pode conter bytes nulos (\0)
-            with open(f"/proc/{pid}/cmdline", "rb") as f_cmdline:
-                cmdline_raw = f_cmdline.read()
+                        if not read_status_memory:
+                            break  # Os campos de memória vêm depois do Uid
+                        continue
+                    attr = _STATUS_MEMORY_FIELDS.get(key)
+                    if attr is not None:
+                        val_parts = value.split()  # Tokens (ex: [b"1234", b"kB"])
+                        if val_parts and val_parts[0].isdigit():
+                            setattr(process_info, attr, int(val_parts[0]))
+
+            if is_known_process:
+                # Apenas os dados voláteis (stat e memória) foram atualizados
+                return process_info
+
+            # Obtém o nome de usuário a partir do UID
+            if read_uid:
+                process_info.user = get_username_from_uid(uid_val)
+
+            # --- 4. Lendo /proc/[pid]/cmdline ---
+            if not read_cmdline:
+                return process_info
+            try:
+                # Contém argumentos separados por bytes nulos (\0)
+                cmdline_raw = proc_dir.read("cmdline")
                 # Substitui bytes nulos por espaços e converte para string
                 process_info.cmdline = (
                     cmdline_raw.replace(b"\x00", b" ")
@@ -318,14 +428,15 @@ def get_process_details(pid: int) -> Optional[ProcessInfo]:
                 # Se cmdline estiver vazio, usa o 'comm' entre colchetes
                 if not process_info.cmdline:
                     process_info.cmdline = f"[{process_info.comm}]"
-        except Exception:
-            # Fallback em caso de erro
-            process_info.cmdline = f"[{process_info.comm}]"
+            except Exception:
+                # Fallback em caso de erro
+                process_info.cmdline = f"[{process_info.comm}]"
 
         return process_info
 
-    except FileNotFoundError:
+    except (FileNotFoundError, ProcessLookupError):
         # O processo pode ter terminado entre a listagem e a leitura
+        collection_stats.count_pids(vanished=1)
         return None
     except (IndexError, ValueError) as e:
         # Erros de parsing ou acesso a índices inválidos
@@ -336,11 +447,11 @@ def get_process_details(pid: int) -> Optional[ProcessInfo]:
                 and isinstance(e, ValueError)
                 and "stat" in str(e).lower()
             ):
-                problematic_context = f"Contexto do erro em /proc/{pid}/stat, linha: '{line_content_stat.strip()}'"
+                problematic_context = f"Contexto do erro em /proc/{pid}/stat, linha: '{line_content_stat.strip().decode('utf-8', 'replace')}'"
             elif line_content_status:
-                problematic_context = f"Contexto do erro em /proc/{pid}/status, linha: '{line_content_status.strip()}'"
+                problematic_context = f"Contexto do erro em /proc/{pid}/status, linha: '{line_content_status.strip().decode('utf-8', 'replace')}'"
             elif stat_fields_for_log:
-                problematic_context = f"Contexto do erro em /proc/{pid}/stat, campos após comm: '{' '.join(stat_fields_for_log[:10])}...'"
+                problematic_context = f"Contexto do erro em /proc/{pid}/stat, campos após comm: '{b' '.join(stat_fields_for_log[:10]).decode('utf-8', 'replace')}...'"
         except Exception:
             print(
                 f"AVISO: Erro de parsing (IndexError ou ValueError) para PID {pid}: {e}. {problematic_context}"
@@ -360,7 +471,8 @@ def get_thread_details_for_process(process_pid: int) -> List[ThreadInfo]:
     """Coleta informações sobre todas as threads de um processo específico.
 
     Lê os dados de cada thread no diretório /proc/[pid]/task/[tid]/
-    para obter estado e nome de cada thread.
+    para obter estado e nome de cada thread. O diretório task/ é aberto uma
+    única vez e os arquivos de cada thread são lidos relativos a ele.
 
     Args:
         process_pid (int): ID do processo para o qual coletar informações de threads.
@@ -370,59 +482,47 @@ def get_thread_details_for_process(process_pid: int) -> List[ThreadInfo]:
                          ou lista vazia se o processo não existe ou não tem threads.
     """
     threads_list: List[ThreadInfo] = []
-    task_path = f"/proc/{process_pid}/task/"
 
     try:
-        # Verifica se o diretório de tasks existe
-        if os.path.isdir(task_path):
+        with procfs.ProcDir(procfs.path(process_pid, "task")) as task_dir:
             # Itera por cada thread (diretório dentro de task/)
-            for tid_str in os.listdir(task_path):
-                if tid_str.isdigit():
-                    try:
-                        tid = int(tid_str)
-                        # Cria objeto para armazenar informações da thread
-                        thread_info = ThreadInfo(tid=tid, process_pid=process_pid)
-
-                        # Obtém o estado da thread a partir de /proc/[pid]/task/[tid]/stat
-                        try:
-                            with open(
-                                f"{task_path}{tid_str}/stat", "r"
-                            ) as f_thread_stat:
-                                thread_stat_line = f_thread_stat.read()
-                                # Extrai o estado (similar ao processo, mas simplificado)
-                                t_last_paren = thread_stat_line.rindex(")")
-                                t_remaining_stat = thread_stat_line[
-                                    t_last_paren + 1 :
-                                ].strip()
-                                t_stat_fields = t_remaining_stat.split()
-                                if t_stat_fields:
-                                    thread_info.state = t_stat_fields[0]
-                        except FileNotFoundError:
-                            thread_info.state = (
-                                "Ended?"  # Thread terminou durante a coleta
-                            )
-                        except ValueError:
-                            thread_info.state = "?"  # Erro no formato do arquivo
-                        except Exception:
-                            thread_info.state = "ErrS"  # Outro erro
-
-                        # Obtém o nome da thread de /proc/[pid]/task/[tid]/comm
-                        try:
-                            with open(
-                                f"{task_path}{tid_str}/comm", "r"
-                            ) as f_thread_comm:
-                                thread_info.name = f_thread_comm.read().strip()
-                        except Exception:
-                            # Nome padrão baseado no TID se falhar a leitura
-                            thread_info.name = f"tid_{tid}"
-
-                        threads_list.append(thread_info)
-                    except ValueError:  # Se tid_str não for um número válido
-                        pass
+            for tid_str in task_dir.list():
+                if not tid_str.isdigit():
+                    continue
+                tid = int(tid_str)
+                # Cria objeto para armazenar informações da thread
+                thread_info = ThreadInfo(tid=tid, process_pid=process_pid)
+
+                # Obtém o estado da thread a partir de /proc/[pid]/task/[tid]/stat
+                try:
+                    thread_stat_line = task_dir.read(f"{tid_str}/stat")
+                    # Extrai o estado (similar ao processo, mas simplificado)
+                    t_last_paren = thread_stat_line.rindex(b")")
+                    t_stat_fields = thread_stat_line[t_last_paren + 1 :].split()
+                    if t_stat_fields:
+                        thread_info.state = t_stat_fields[0].decode()
+                except (FileNotFoundError, ProcessLookupError):
+                    thread_info.state = "Ended?"  # Thread terminou durante a coleta
+                except ValueError:
+                    thread_info.state = "?"  # Erro no formato do arquivo
+                except Exception:
+                    thread_info.state = "ErrS"  # Outro erro
+
+                # Obtém o nome da thread de /proc/[pid]/task/[tid]/comm
+                try:
+                    thread_info.name = (
+                        task_dir.read(f"{tid_str}/comm").decode("utf-8", "replace").strip()
+                    )
+                except Exception:
+                    # Nome padrão baseado no TID se falhar a leitura
+                    thread_info.name = f"tid_{tid}"
+
+                threads_list.append(thread_info)
 
         return threads_list
 
-    except FileNotFoundError:  # Diretório /proc/[pid]/task não existe
+    except (FileNotFoundError, ProcessLookupError, NotADirectoryError):
+        # Diretório /proc/[pid]/task não existe (processo terminou)
         return []
     except Exception:  # Outros erros durante a listagem
         import traceback
@@ -431,37 +531,42 @@ def get_thread_details_for_process(process_pid: int) -> List[ThreadInfo]:
         return []
 
 
-def get_all_processes_info_list() -> List[ProcessInfo]:
+def list_pids() -> List[int]:
+    """Lista os PIDs de todos os processos em execução no sistema.
+
+    Returns:
+        List[int]: PIDs correspondentes aos diretórios numéricos de /proc/,
+                   ou lista vazia se /proc não existir.
+    """
+    try:
+        # Lista todos os diretórios em /proc/ que são números (PIDs)
+        return [int(pid) for pid in procfs.list_dir(procfs.get_proc_root()) if pid.isdigit()]
+    except FileNotFoundError:
+        print("Aviso: Diretório /proc não encontrado.")
+        return []
+
+
+def get_all_processes_info_list(profile: str = "full") -> List[ProcessInfo]:
     """Coleta informações de todos os processos em execução no sistema.
 
     Percorre todos os diretórios numéricos em /proc/ que representam processos
     e obtém detalhes de cada um.
 
+    Args:
+        profile (str, optional): Perfil de coleta (ver COLLECTION_PROFILES). Padrão é "full".
+
     Returns:
         List[ProcessInfo]: Lista de objetos ProcessInfo com dados dos processos ativos,
                           sem o cálculo de percentual de CPU (feito posteriormente).
     """
     processes_list: List[ProcessInfo] = []
 
-    try:
-        # Lista todos os diretórios em /proc/ que são números (PIDs)
-        pids = [pid for pid in os.listdir("/proc") if pid.isdigit()]
-    except FileNotFoundError:
-        print("Aviso: Diretório /proc não encontrado.")
-        return []
-
     # Coleta informações para cada PID encontrado
-    for pid_str in pids:
-        try:
-            pid = int(pid_str)
-            # Obtém detalhes completos do processo
-            process_info = get_process_details(pid)
-            if process_info:
-                processes_list.append(process_info)
-        except (
-            ValueError
-        ):  # Se o pid_str não for um número válido (improvável com isdigit())
-            continue
+    for pid in list_pids():
+        # Obtém detalhes completos do processo
+        process_info = get_process_details(pid, profile=profile)
+        if process_info:
+            processes_list.append(process_info)
 
     return processes_list
 
@@ -479,9 +584,17 @@ def populate_system_global_data(system_info_instance: SystemGlobalInfo) -> None:
     Args:
         system_info_instance (SystemGlobalInfo): Instância a ser populada com dados.
     """
-    # 1. Coleta os tempos de CPU (global e por core) para cálculos de percentuais
-    system_info_instance.last_cpu_times_jiffies_all = get_cpu_times_global()
-    system_info_instance.last_cpu_times_jiffies_cores = get_cpu_times_per_core()
+    # 1. Coleta os tempos de CPU (global e por core) e os contadores do escalonador
+    #    com uma única leitura do /proc/stat
+    frame = read_proc_stat()
+    system_info_instance.cpu_counter_frame = frame
+    if frame:
+        system_info_instance.last_cpu_times_jiffies_all = frame.cpu_total
+        system_info_instance.last_cpu_times_jiffies_cores = frame.cores_as_list()
+        system_info_instance.procs_blocked = frame.procs_blocked
+    else:
+        system_info_instance.last_cpu_times_jiffies_all = []
+        system_info_instance.last_cpu_times_jiffies_cores = []
 
     # 2. Coleta e processa informações de memória do sistema
     mem_data = get_mem_info_dict()
@@ -543,14 +656,13 @@ def populate_system_global_data(system_info_instance: SystemGlobalInfo) -> None:
 
 
 def get_username_from_uid(uid: int) -> str:
-    """Obtém o nome do usuário a partir do UID lendo /etc/passwd diretamente."""
-    try:
-        with open("/etc/passwd", "r") as f:
-            for line in f:
-                parts = line.split(":")
-                if len(parts) >= 3 and parts[2].isdigit() and int(parts[2]) == uid:
-                    return parts[0]  # Nome do usuário
-    except Exception:
-        pass
-    return str(uid)  # Se não encontrar, retorna o UID como string
+    """Obtém o nome do usuário a partir do UID.
 
+    Usa o resolvedor global com cache do /etc/passwd (recarregado apenas quando o
+    arquivo muda) e fallback para pwd.getpwuid em usuários definidos via NSS.
+    O tempo de cada conversão entra nos contadores da coleta (etapa "usuarios").
+    """
+    start = time.monotonic()
+    username = get_default_resolver().get_username(uid)
+    collection_stats.count_user_lookup(time.monotonic() - start)
+    return username
@@ -0,0 +1,149 @@
+# scr/user_resolver.py
+"""
+Módulo responsável por converter UIDs em nomes de usuário com cache.
+
+O arquivo /etc/passwd é lido uma única vez para um dicionário e só é relido
+quando seu mtime/inode/tamanho mudar. UIDs que não estão no arquivo (usuários
+vindos de NSS, como LDAP ou SSSD) são resolvidos via pwd.getpwuid.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+try:
+    import pwd
+except ImportError:  # Plataformas sem o módulo pwd
+    pwd = None  # type: ignore[assignment]
+
+# Assinatura do arquivo usada para detectar mudanças: (mtime_ns, inode, tamanho)
+_FileSignature = Tuple[int, int, int]
+
+
+class UsernameResolver:
+    """Classe que resolve UIDs em nomes de usuário usando um cache do /etc/passwd."""
+
+    def __init__(
+        self, passwd_path: str = "/etc/passwd", check_interval_sec: float = 1.0
+    ) -> None:
+        """Inicializa o resolvedor sem ler o arquivo (a leitura é feita sob demanda).
+
+        Args:
+            passwd_path (str, optional): Caminho do arquivo passwd. Padrão é /etc/passwd.
+            check_interval_sec (float, optional): Intervalo mínimo em segundos entre
+                verificações de mudança do arquivo (evita um stat() por consulta).
+        """
+        self.passwd_path: str = passwd_path
+        self.check_interval_sec: float = check_interval_sec
+
+        self._lock: threading.Lock = threading.Lock()
+        self._names_by_uid: Dict[int, str] = {}  # {uid: nome} lido do arquivo
+        self._nss_cache: Dict[int, str] = {}  # {uid: nome} resolvido via pwd
+        self._signature: Optional[_FileSignature] = None  # Assinatura da última leitura
+        self._loaded: bool = False  # Indica se o arquivo já foi lido ao menos uma vez
+        self._last_check: float = float("-inf")  # Momento (monotônico) da última verificação
+
+    def _read_signature(self) -> Optional[_FileSignature]:
+        """Obtém a assinatura atual do arquivo passwd.
+
+        Returns:
+            Optional[_FileSignature]: (mtime_ns, inode, tamanho) ou None se não existir.
+        """
+        try:
+            st = os.stat(self.passwd_path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_ino, st.st_size)
+
+    def _load(self, signature: Optional[_FileSignature]) -> None:
+        """Lê o arquivo passwd inteiro para o dicionário de nomes.
+
+        Args:
+            signature (Optional[_FileSignature]): Assinatura correspondente ao conteúdo lido.
+        """
+        names: Dict[int, str] = {}
+        try:
+            with open(self.passwd_path, "r", errors="replace") as f:
+                for line in f:
+                    parts = line.split(":")
+                    if len(parts) >= 3 and parts[2].isdigit():
+                        # Mantém a primeira entrada para cada UID, como getpwuid
+                        names.setdefault(int(parts[2]), parts[0])
+        except OSError:
+            pass
+        self._names_by_uid = names
+        # Descarta nomes NSS antigos: o arquivo pode ter passado a conter esses UIDs
+        self._nss_cache = {}
+        self._signature = signature
+        self._loaded = True
+
+    def refresh_if_changed(self, force: bool = False) -> bool:
+        """Recarrega o arquivo passwd se ele mudou desde a última leitura.
+
+        Args:
+            force (bool, optional): Ignora o intervalo mínimo entre verificações.
+
+        Returns:
+            bool: True se o arquivo foi (re)carregado.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_check < self.check_interval_sec:
+                return False
+            self._last_check = now
+            signature = self._read_signature()
+            if self._loaded and signature == self._signature:
+                return False
+            self._load(signature)
+            return True
+
+    def get_username(self, uid: int) -> str:
+        """Retorna o nome de usuário de um UID.
+
+        Args:
+            uid (int): ID do usuário.
+
+        Returns:
+            str: Nome do usuário, ou o UID como string se não for encontrado.
+        """
+        self.refresh_if_changed()
+
+        name = self._names_by_uid.get(uid)
+        if name is not None:
+            return name
+
+        name = self._nss_cache.get(uid)
+        if name is not None:
+            return name
+
+        # Fallback para usuários definidos fora do arquivo (NSS: LDAP, SSSD, etc.)
+        name = str(uid)
+        if pwd is not None and uid >= 0:
+            try:
+                name = pwd.getpwuid(uid).pw_name
+            except (KeyError, OverflowError):
+                pass
+        # Cacheia inclusive a falha para não repetir a consulta a cada processo
+        self._nss_cache[uid] = name
+        return name
+
+
+# --- Resolvedor global compartilhado pelo system_monitor ---
+
+_default_resolver: Optional[UsernameResolver] = None
+_default_resolver_lock: threading.Lock = threading.Lock()
+
+
+def get_default_resolver() -> UsernameResolver:
+    """Retorna o resolvedor global, criando-o na primeira chamada.
+
+    Returns:
+        UsernameResolver: Instância compartilhada por todo o processo.
+    """
+    global _default_resolver
+    if _default_resolver is None:
+        with _default_resolver_lock:
+            if _default_resolver is None:
+                _default_resolver = UsernameResolver()
+    return _default_resolver
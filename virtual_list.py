@@ -0,0 +1,148 @@
+import tkinter as tk
+from tkinter import ttk
+#Lista virtualizada para a aba de processos
+#Os dados ficam em uma lista Python (fora do Tk) e so as linhas visiveis (mais uma pequena folga)
+#existem como itens da Treeview; rolar a lista apenas troca os valores desses itens
+
+
+class ListaVirtual(tk.Frame):
+    """Tabela que exibe uma lista grande de linhas criando itens Tk apenas para a parte visivel.
+
+    Cada linha e uma tupla de valores ja formatados; o primeiro valor e o PID, usado para
+    manter a selecao quando a lista muda de ordem ou de tamanho.
+    """
+
+    def __init__(self, master, colunas, larguras, folga=5, **kwargs):
+        """Cria a Treeview e a barra de rolagem propria.
+
+        Args:
+            master: Widget pai.
+            colunas (tuple): Nomes das colunas (a primeira deve ser o PID).
+            larguras (dict): Largura de cada coluna em pixels.
+            folga (int, optional): Linhas extras renderizadas abaixo da area visivel.
+        """
+        super().__init__(master, **kwargs)
+        self.linhas = []  #dataset completo, ja ordenado
+        self.indice_pid = {}  #{pid: posicao em self.linhas}
+        self.topo = 0  #posicao da primeira linha exibida
+        self.visiveis = 1  #quantas linhas cabem na area da tabela
+        self.folga = folga
+        self.pid_selecionado = None
+        self.itens = []  #iids reaproveitados da Treeview (um por linha renderizada)
+        self.valores_itens = {}  #{iid: valores exibidos} para evitar item() sem mudanca
+
+        self.tabela = ttk.Treeview(self, columns=colunas, show="headings", selectmode="browse")
+        for col in colunas:
+            self.tabela.heading(col, text=col)
+            self.tabela.column(col, width=larguras.get(col, 150), anchor="center")
+
+        #a barra de rolagem representa o dataset inteiro, nao os itens da Treeview
+        self.barra = ttk.Scrollbar(self, orient="vertical", command=self.ao_rolar_barra)
+        self.barra.pack(side="right", fill="y")
+        self.tabela.pack(side="left", expand=True, fill="both")
+
+        self.tabela.bind("<Configure>", lambda e: self.ajustar_visiveis())
+        self.tabela.bind("<ButtonRelease-1>", self.ao_clicar)
+        self.tabela.bind("<MouseWheel>", lambda e: self.rolar(-1 if e.delta > 0 else 1) or "break")
+        self.tabela.bind("<Button-4>", lambda e: self.rolar(-1) or "break")
+        self.tabela.bind("<Button-5>", lambda e: self.rolar(1) or "break")
+        self.tabela.bind("<Up>", lambda e: self.mover_selecao(-1) or "break")
+        self.tabela.bind("<Down>", lambda e: self.mover_selecao(1) or "break")
+        self.tabela.bind("<Prior>", lambda e: self.rolar(-self.visiveis) or "break")
+        self.tabela.bind("<Next>", lambda e: self.rolar(self.visiveis) or "break")
+        self.tabela.bind("<Home>", lambda e: self.ir_para(0) or "break")
+        self.tabela.bind("<End>", lambda e: self.ir_para(len(self.linhas)) or "break")
+
+    def definir_linhas(self, linhas):
+        #substitui o dataset (ja ordenado) e redesenha apenas a janela visivel
+        self.linhas = linhas
+        self.indice_pid = {linha[0]: i for i, linha in enumerate(linhas)}
+        self.ir_para(self.topo)
+
+    def get_selected_pid(self):
+        #PID da linha selecionada, ou None se nada estiver selecionado (ou o processo sumiu)
+        if self.pid_selecionado in self.indice_pid:
+            return self.pid_selecionado
+        return None
+
+    def ajustar_visiveis(self):
+        #calcula quantas linhas cabem na altura atual da tabela
+        altura_linha = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        cabecalho = 0
+        if self.itens:
+            caixa = self.tabela.bbox(self.itens[0])
+            if caixa:
+                cabecalho = caixa[1]
+        self.visiveis = max(1, (self.tabela.winfo_height() - cabecalho) // altura_linha)
+        self.ir_para(self.topo)
+
+    def ir_para(self, posicao):
+        #limita a posicao ao dataset e redesenha
+        self.topo = max(0, min(posicao, len(self.linhas) - self.visiveis))
+        self.renderizar()
+
+    def rolar(self, linhas):
+        self.ir_para(self.topo + linhas)
+
+    def ao_rolar_barra(self, acao, quantidade, unidade=None):
+        #traduz os comandos da barra de rolagem ("moveto" ou "scroll") para posicoes do dataset
+        if acao == "moveto":
+            self.ir_para(int(float(quantidade) * len(self.linhas)))
+        elif acao == "scroll":
+            passo = self.visiveis if unidade == "pages" else 1
+            self.rolar(int(quantidade) * passo)
+
+    def mover_selecao(self, passo):
+        #move a selecao pelo teclado, rolando quando ela sai da area visivel
+        if not self.linhas:
+            return
+        atual = self.indice_pid.get(self.pid_selecionado, self.topo - passo)
+        nova = max(0, min(atual + passo, len(self.linhas) - 1))
+        self.pid_selecionado = self.linhas[nova][0]
+        if nova < self.topo:
+            self.ir_para(nova)
+        elif nova >= self.topo + self.visiveis:
+            self.ir_para(nova - self.visiveis + 1)
+        else:
+            self.renderizar()
+
+    def ao_clicar(self, event):
+        #guarda o PID da linha clicada (o item do Tk e reaproveitado para outras linhas ao rolar)
+        iid = self.tabela.identify_row(event.y)
+        if iid in self.valores_itens and self.valores_itens[iid]:
+            self.pid_selecionado = self.valores_itens[iid][0]
+            self.renderizar()
+
+    def renderizar(self):
+        fatia = self.linhas[self.topo:self.topo + self.visiveis + self.folga]
+
+        #cria ou remove itens so quando o numero de linhas renderizadas muda
+        while len(self.itens) < len(fatia):
+            iid = self.tabela.insert("", "end", values=())
+            self.itens.append(iid)
+            self.valores_itens[iid] = ()
+        while len(self.itens) > len(fatia):
+            iid = self.itens.pop()
+            self.tabela.delete(iid)
+            del self.valores_itens[iid]
+
+        item_selecionado = None
+        for iid, valores in zip(self.itens, fatia):
+            if self.valores_itens[iid] != valores:
+                self.tabela.item(iid, values=valores)
+                self.valores_itens[iid] = valores
+            if valores[0] == self.pid_selecionado:
+                item_selecionado = iid
+
+        #a selecao acompanha o PID; fora da area renderizada nenhum item fica marcado
+        if item_selecionado is not None:
+            self.tabela.selection_set(item_selecionado)
+            self.tabela.focus(item_selecionado)
+        else:
+            self.tabela.selection_set(())
+
+        if self.linhas:
+            total = len(self.linhas)
+            self.barra.set(self.topo / total, min(1.0, (self.topo + self.visiveis) / total))
+        else:
+            self.barra.set(0.0, 1.0)